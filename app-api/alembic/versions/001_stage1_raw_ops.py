@@ -25,10 +25,12 @@ def upgrade():
     op.execute("CREATE SCHEMA IF NOT EXISTS ops")
 
     # Create ingest_status enum
+    # create_type=False: created once here, not again by create_table for the column
     ingest_status = postgresql.ENUM(
-        "pending", "applied", "skipped", "failed", name="ingest_status", schema="ops"
+        "pending", "applied", "skipped", "failed", name="ingest_status", schema="ops",
+        create_type=False,
     )
-    ingest_status.create(op.get_bind())
+    ingest_status.create(op.get_bind(), checkfirst=True)
 
     # Create ops.raw_file_registry table
     op.create_table(
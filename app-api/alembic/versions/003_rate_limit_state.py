@@ -0,0 +1,36 @@
+"""Add shared rate limiter state
+
+Revision ID: 003_rate_limit_state
+Revises: 002_auth_and_teams
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "003_rate_limit_state"
+down_revision = "002_auth_and_teams"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create ops.rate_limit_state for RATE_LIMIT_BACKEND=postgres."""
+
+    # One GCRA theoretical arrival time (epoch seconds) per "<route>|<client>" bucket.
+    # Unlogged: the state is disposable and written on every rate-limited request.
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE IF NOT EXISTS ops.rate_limit_state (
+            bucket TEXT PRIMARY KEY,
+            tat DOUBLE PRECISION NOT NULL
+        )
+        """
+    )
+    op.create_index("idx_rate_limit_state_tat", "rate_limit_state", ["tat"], schema="ops")
+
+
+def downgrade():
+    """Drop shared rate limiter state."""
+    op.drop_table("rate_limit_state", schema="ops")
@@ -0,0 +1,48 @@
+"""Add slow query EXPLAIN samples
+
+Revision ID: 004_slow_query_log
+Revises: 003_rate_limit_state
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "004_slow_query_log"
+down_revision = "003_rate_limit_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create ops.slow_query_log for EXPLAIN (ANALYZE, BUFFERS) samples of slow queries."""
+
+    # Parameter values are never stored, only their types
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ops.slow_query_log (
+            id BIGSERIAL PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            query TEXT NOT NULL,
+            params_shape JSONB NOT NULL DEFAULT '[]'::jsonb,
+            duration_ms DOUBLE PRECISION NOT NULL,
+            plan JSONB,
+            captured_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.create_index(
+        "idx_slow_query_log_fingerprint",
+        "slow_query_log",
+        ["fingerprint", "captured_at"],
+        schema="ops",
+    )
+    op.create_index(
+        "idx_slow_query_log_captured_at", "slow_query_log", ["captured_at"], schema="ops"
+    )
+
+
+def downgrade():
+    """Drop slow query samples."""
+    op.drop_table("slow_query_log", schema="ops")
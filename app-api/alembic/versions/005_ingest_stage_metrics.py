@@ -0,0 +1,48 @@
+"""Add per-stage ingest metrics
+
+Revision ID: 005_ingest_stage_metrics
+Revises: 004_slow_query_log
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "005_ingest_stage_metrics"
+down_revision = "004_slow_query_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create ops.ingest_stage_metrics, one row per load_partition run."""
+
+    # The ingest flows create the same table on first use, hence IF NOT EXISTS
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ops.ingest_stage_metrics (
+            id SERIAL PRIMARY KEY,
+            dataset VARCHAR(100) NOT NULL,
+            partition JSONB NOT NULL,
+            file_id INTEGER,
+            status ops.ingest_status NOT NULL,
+            stages_ms JSONB NOT NULL,
+            duration_ms INTEGER NOT NULL,
+            bytes_written BIGINT NOT NULL DEFAULT 0,
+            rows_inserted INTEGER NOT NULL DEFAULT 0,
+            rows_updated INTEGER NOT NULL DEFAULT 0,
+            rows_unchanged INTEGER NOT NULL DEFAULT 0,
+            recorded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ingest_stage_metrics_dataset "
+        "ON ops.ingest_stage_metrics (dataset, recorded_at)"
+    )
+
+
+def downgrade():
+    """Drop per-stage ingest metrics."""
+    op.drop_table("ingest_stage_metrics", schema="ops")
@@ -0,0 +1,34 @@
+"""Add dbt model build times
+
+Revision ID: 006_model_builds
+Revises: 005_ingest_stage_metrics
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "006_model_builds"
+down_revision = "005_ingest_stage_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create ops.model_builds, written by dbt hooks and read for ETag / Last-Modified."""
+
+    # dbt's on-run-start hook creates the same table, hence IF NOT EXISTS
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ops.model_builds (
+            model TEXT PRIMARY KEY,
+            built_at TIMESTAMPTZ NOT NULL
+        )
+        """
+    )
+
+
+def downgrade():
+    """Drop dbt model build times."""
+    op.drop_table("model_builds", schema="ops")
@@ -67,6 +67,13 @@ class ProjectionList(BaseModel):
     offset: int
 
 
+class ROSPerWeek(BaseModel):
+    """Per-week projections as parallel arrays: proj[i] is the projection for weeks[i]."""
+
+    weeks: List[int]
+    proj: List[float]
+
+
 class ROSItem(BaseModel):
     player_id: str
     name: str
@@ -77,6 +84,8 @@ class ROSItem(BaseModel):
     low: float
     high: float
     per_week_json: Optional[List[Dict[str, Any]]] = None
+    # Set instead of per_week_json when requested with per_week=columns
+    per_week: Optional[ROSPerWeek] = None
 
     model_config = ConfigDict(
         json_schema_extra={
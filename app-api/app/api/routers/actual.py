@@ -1,5 +1,5 @@
 from typing import Optional
-from fastapi import APIRouter, Query, Response, HTTPException, Depends
+from fastapi import APIRouter, Query, Request, HTTPException, Depends
 from app.core.rate_limit import RateLimiter
 from app.api.models import ActualPointsList, ActualPointsItem, PlayerSeasonActualPointsList
 from app.repositories.actual_points_repo import ActualPointsRepository
@@ -13,7 +13,7 @@ actual_repo = ActualPointsRepository()
 async def get_weekly_actual_points(
     season: int,
     week: int,
-    response: Response,
+    request: Request,
     scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
     search: Optional[str] = Query(None, description="Search by player name"),
     position: Optional[str] = Query(None, description="Filter by position"),
@@ -55,42 +55,40 @@ async def get_weekly_actual_points(
             "limit": limit,
             "offset": offset,
         }
-        cached_data = await cache.get(cache_key, cache_params, "actual")
-
-        if cached_data:
-            return cached_data
-
-        # Get data from repository
-        data = await actual_repo.get_actual_points(
-            season=season,
-            week=week,
-            scoring=scoring,
-            search=search,
-            position=position,
-            team=team,
-            sort_by=sort_by,
-            sort_desc=sort_desc,
-            limit=limit,
-            offset=offset,
-        )
+        cached = await cache.get_entry(cache_key, cache_params, "actual")
+
+        if cached is None:
+            # Get data from repository
+            data = await actual_repo.get_actual_points(
+                season=season,
+                week=week,
+                scoring=scoring,
+                search=search,
+                position=position,
+                team=team,
+                sort_by=sort_by,
+                sort_desc=sort_desc,
+                limit=limit,
+                offset=offset,
+            )
 
-        # Convert to Pydantic models
-        items = [ActualPointsItem(**item) for item in data["items"]]
-
-        result = ActualPointsList(
-            season=data["season"],
-            week=data["week"],
-            scoring=data["scoring"],
-            items=items,
-            total=data["total"],
-            limit=data["limit"],
-            offset=data["offset"],
-        )
+            # Convert to Pydantic models
+            items = [ActualPointsItem(**item) for item in data["items"]]
+
+            result = ActualPointsList(
+                season=data["season"],
+                week=data["week"],
+                scoring=data["scoring"],
+                items=items,
+                total=data["total"],
+                limit=data["limit"],
+                offset=data["offset"],
+            )
 
-        # Cache the result
-        await cache.set(cache_key, cache_params, "actual", result)
+            # Cache the result
+            cached = await cache.set(cache_key, cache_params, "actual", result)
 
-        return result
+        return cached.response(request, ActualPointsList)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching actual points: {str(e)}")
@@ -100,7 +98,7 @@ async def get_weekly_actual_points(
 async def get_player_season_actual_points(
     player_id: str,
     season: int,
-    response: Response,
+    request: Request,
     scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
     week_start: int = Query(1, ge=1, le=22, description="Starting week"),
     week_end: int = Query(18, ge=1, le=22, description="Ending week"),
@@ -128,41 +126,37 @@ async def get_player_season_actual_points(
         # Check cache first
         cache_key = f"/v1/actual/bulk/{season}/player/{player_id}"
         cache_params = {"scoring": scoring, "week_start": week_start, "week_end": week_end}
-        cached_data = await cache.get(cache_key, cache_params, "bulk_actual")
+        cached = await cache.get_entry(cache_key, cache_params, "bulk_actual")
+
+        if cached is None:
+            # Get data from repository
+            data = await actual_repo.get_player_season_actual_points(
+                player_id=player_id,
+                season=season,
+                scoring=scoring,
+                week_start=week_start,
+                week_end=week_end,
+            )
 
-        if cached_data:
-            response.headers["Cache-Control"] = (
-                "public, max-age=300, s-maxage=1800"  # Longer cache for bulk
+            # Convert to Pydantic models
+            items = [ActualPointsItem(**item) for item in data["items"]]
+
+            result = PlayerSeasonActualPointsList(
+                player_id=data["player_id"],
+                season=data["season"],
+                scoring=data["scoring"],
+                week_start=data["week_start"],
+                week_end=data["week_end"],
+                items=items,
+                total=data["total"],
             )
-            return cached_data
-
-        # Get data from repository
-        data = await actual_repo.get_player_season_actual_points(
-            player_id=player_id,
-            season=season,
-            scoring=scoring,
-            week_start=week_start,
-            week_end=week_end,
-        )
 
-        # Convert to Pydantic models
-        items = [ActualPointsItem(**item) for item in data["items"]]
-
-        result = PlayerSeasonActualPointsList(
-            player_id=data["player_id"],
-            season=data["season"],
-            scoring=data["scoring"],
-            week_start=data["week_start"],
-            week_end=data["week_end"],
-            items=items,
-            total=data["total"],
-        )
+            # Cache the result
+            cached = await cache.set(cache_key, cache_params, "bulk_actual", result)
 
-        # Cache the result
-        await cache.set(cache_key, cache_params, "bulk_actual", result)
+        response = cached.response(request, PlayerSeasonActualPointsList)
         response.headers["Cache-Control"] = "public, max-age=300, s-maxage=1800"
-
-        return result
+        return response
 
     except Exception as e:
         raise HTTPException(
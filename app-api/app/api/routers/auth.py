@@ -5,9 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import auth_service, AuthTokens
+from app.core.auth import auth_service, AuthTokens, UserPrincipal
 from app.db.async_session import get_session
-from app.db.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -146,7 +145,9 @@ async def logout(
 
 
 @router.get("/me", response_model=UserProfile)
-async def get_current_user_profile(current_user: User = Depends(auth_service.get_current_user)):
+async def get_current_user_profile(
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
+):
     """
     Get current authenticated user profile.
 
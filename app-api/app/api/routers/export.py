@@ -0,0 +1,338 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.core.conditional import validators_for
+from app.core.export import ExportFormat, export_response
+from app.core.rate_limit import RateLimiter, rate_limit_headers_for
+from app.core.settings import get_settings
+from app.repositories.export_repo import ExportRepository
+
+router = APIRouter(prefix="/v1/export", tags=["Export"])
+export_repo = ExportRepository()
+
+# dbt models behind each export, for ETag / Last-Modified
+PROJECTION_MODELS = ("f_weekly_projection", "stg_players")
+ROS_MODELS = ("f_ros_projection", "stg_players")
+ACTUAL_MODELS = ("f_weekly_actual_points",)
+USAGE_MODELS = ("int_player_week_usage", "stg_players")
+
+PROJECTION_COLUMNS = (
+    ("season", "int"),
+    ("week", "int"),
+    ("player_id", "text"),
+    ("name", "text"),
+    ("team", "text"),
+    ("position", "text"),
+    ("scoring", "text"),
+    ("proj", "float"),
+    ("low", "float"),
+    ("high", "float"),
+    ("components", "json"),
+)
+
+ROS_COLUMNS = (
+    ("season", "int"),
+    ("player_id", "text"),
+    ("name", "text"),
+    ("team", "text"),
+    ("position", "text"),
+    ("scoring", "text"),
+    ("proj_total", "float"),
+    ("low", "float"),
+    ("high", "float"),
+    ("per_week_json", "json"),
+)
+
+ACTUAL_COLUMNS = (
+    ("season", "int"),
+    ("week", "int"),
+    ("player_id", "text"),
+    ("name", "text"),
+    ("team", "text"),
+    ("position", "text"),
+    ("scoring", "text"),
+    ("actual_points", "float"),
+)
+
+USAGE_COLUMNS = (
+    ("season", "int"),
+    ("week", "int"),
+    ("player_id", "text"),
+    ("name", "text"),
+    ("team", "text"),
+    ("position", "text"),
+    ("snap_pct", "float"),
+    ("route_pct", "float"),
+    ("target_share", "float"),
+    ("rush_share", "float"),
+    ("routes", "float"),
+    ("targets", "float"),
+    ("rush_att", "float"),
+)
+
+CACHE_CONTROL = "public, max-age=300, s-maxage=900"
+
+# Translate API scoring values to projection mart values
+DB_SCORING = {"ppr": "ppr", "half_ppr": "half", "standard": "std"}
+
+
+def _validate(season: int, week: Optional[int], scoring: Optional[str] = None):
+    if season < 2020 or season > 2030:
+        raise HTTPException(status_code=400, detail="Season must be between 2020 and 2030")
+    if week is not None and (week < 1 or week > 22):
+        raise HTTPException(status_code=400, detail="Week must be between 1 and 22")
+    if scoring is not None and scoring not in DB_SCORING:
+        raise HTTPException(status_code=400, detail="Scoring must be ppr, half_ppr, or standard")
+
+
+def _slice_name(kind: str, season: int, week: Optional[int], scoring: Optional[str]) -> str:
+    parts = [kind, str(season)]
+    if week is not None:
+        parts.append(f"w{week:02d}")
+    if scoring:
+        parts.append(scoring)
+    return "-".join(parts)
+
+
+async def _export_projections(
+    request: Request,
+    season: int,
+    week: Optional[int],
+    scoring: str,
+    position: Optional[str],
+    team: Optional[str],
+    format: ExportFormat,
+):
+    _validate(season, week, scoring)
+
+    validators = await validators_for(
+        PROJECTION_MODELS,
+        "/v1/export/projections",
+        {"season": season, "week": week, "scoring": scoring, "position": position, "team": team},
+        format,
+    )
+    if validators.matches(request):
+        return validators.not_modified(request, CACHE_CONTROL)
+
+    batches = export_repo.stream_weekly_projections(
+        season=season,
+        week=week,
+        scoring=DB_SCORING[scoring],
+        label=scoring,
+        position=position,
+        team=team,
+        batch_rows=get_settings().export_batch_rows,
+    )
+    response = await export_response(
+        batches,
+        PROJECTION_COLUMNS,
+        format,
+        _slice_name("projections", season, week, scoring),
+        headers=rate_limit_headers_for(request),
+    )
+    validators.apply(response, CACHE_CONTROL)
+    return response
+
+
+@router.get("/projections/{season}")
+async def export_season_projections(
+    season: int,
+    request: Request,
+    scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream every weekly projection for a season, ordered by week and player"""
+    return await _export_projections(request, season, None, scoring, position, team, format)
+
+
+@router.get("/projections/{season}/{week}")
+async def export_weekly_projections(
+    season: int,
+    week: int,
+    request: Request,
+    scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream all projections for one week, without paging"""
+    return await _export_projections(request, season, week, scoring, position, team, format)
+
+
+@router.get("/ros/{season}")
+async def export_ros_projections(
+    season: int,
+    request: Request,
+    scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream rest of season projections for all players"""
+    _validate(season, None, scoring)
+
+    validators = await validators_for(
+        ROS_MODELS,
+        "/v1/export/ros",
+        {"season": season, "scoring": scoring, "position": position, "team": team},
+        format,
+    )
+    if validators.matches(request):
+        return validators.not_modified(request, CACHE_CONTROL)
+
+    batches = export_repo.stream_ros_projections(
+        season=season,
+        scoring=DB_SCORING[scoring],
+        label=scoring,
+        position=position,
+        team=team,
+        batch_rows=get_settings().export_batch_rows,
+    )
+    response = await export_response(
+        batches,
+        ROS_COLUMNS,
+        format,
+        _slice_name("ros", season, None, scoring),
+        headers=rate_limit_headers_for(request),
+    )
+    validators.apply(response, CACHE_CONTROL)
+    return response
+
+
+async def _export_actual(
+    request: Request,
+    season: int,
+    week: Optional[int],
+    scoring: str,
+    position: Optional[str],
+    team: Optional[str],
+    format: ExportFormat,
+):
+    _validate(season, week, scoring)
+
+    validators = await validators_for(
+        ACTUAL_MODELS,
+        "/v1/export/actual",
+        {"season": season, "week": week, "scoring": scoring, "position": position, "team": team},
+        format,
+    )
+    if validators.matches(request):
+        return validators.not_modified(request, CACHE_CONTROL)
+
+    # The actual points mart stores API scoring names
+    batches = export_repo.stream_actual_points(
+        season=season,
+        week=week,
+        scoring=scoring,
+        position=position,
+        team=team,
+        batch_rows=get_settings().export_batch_rows,
+    )
+    response = await export_response(
+        batches,
+        ACTUAL_COLUMNS,
+        format,
+        _slice_name("actual", season, week, scoring),
+        headers=rate_limit_headers_for(request),
+    )
+    validators.apply(response, CACHE_CONTROL)
+    return response
+
+
+@router.get("/actual/{season}")
+async def export_season_actual_points(
+    season: int,
+    request: Request,
+    scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream actual fantasy points for every week of a season"""
+    return await _export_actual(request, season, None, scoring, position, team, format)
+
+
+@router.get("/actual/{season}/{week}")
+async def export_weekly_actual_points(
+    season: int,
+    week: int,
+    request: Request,
+    scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream actual fantasy points for one week"""
+    return await _export_actual(request, season, week, scoring, position, team, format)
+
+
+async def _export_usage(
+    request: Request,
+    season: int,
+    week: Optional[int],
+    position: Optional[str],
+    team: Optional[str],
+    format: ExportFormat,
+):
+    _validate(season, week)
+
+    validators = await validators_for(
+        USAGE_MODELS,
+        "/v1/export/usage",
+        {"season": season, "week": week, "position": position, "team": team},
+        format,
+    )
+    if validators.matches(request):
+        return validators.not_modified(request, CACHE_CONTROL)
+
+    batches = export_repo.stream_usage(
+        season=season,
+        week=week,
+        position=position,
+        team=team,
+        batch_rows=get_settings().export_batch_rows,
+    )
+    response = await export_response(
+        batches,
+        USAGE_COLUMNS,
+        format,
+        _slice_name("usage", season, week, None),
+        headers=rate_limit_headers_for(request),
+    )
+    validators.apply(response, CACHE_CONTROL)
+    return response
+
+
+@router.get("/usage/{season}")
+async def export_season_usage(
+    season: int,
+    request: Request,
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream usage for every player and week of a season"""
+    return await _export_usage(request, season, None, position, team, format)
+
+
+@router.get("/usage/{season}/{week}")
+async def export_weekly_usage(
+    season: int,
+    week: int,
+    request: Request,
+    position: Optional[str] = Query(None, description="Filter by position"),
+    team: Optional[str] = Query(None, description="Filter by team"),
+    format: ExportFormat = Query("csv", description="Output format (csv, ndjson, arrow, parquet)"),
+    _: bool = Depends(RateLimiter(times=10, seconds=60)),
+):
+    """Stream usage for every player in one week"""
+    return await _export_usage(request, season, week, position, team, format)
@@ -1,22 +1,27 @@
 from typing import Optional
-from fastapi import APIRouter, Query, Response, Depends
+from fastapi import APIRouter, Query, Request, Depends
 from app.core.rate_limit import RateLimiter
 from app.api.models import PlayersList
 from app.repositories.players_repo import PlayersRepository
-from app.core.config import settings
+from app.core.settings import get_settings
 from app.core.cache import cache
+from app.core.conditional import validators_for
 
 router = APIRouter(prefix="/v1/players", tags=["Players"])
+settings = get_settings()
 players_repo = PlayersRepository()
 
+# dbt models behind these responses, for ETag / Last-Modified
+PLAYER_MODELS = ("stg_players",)
+
 
 @router.get("", response_model=PlayersList)
 async def list_players(
-    response: Response,
+    request: Request,
     search: Optional[str] = Query(None, description="Search by player name"),
     position: Optional[str] = Query(None, description="Filter by position"),
     team: Optional[str] = Query(None, description="Filter by team"),
-    limit: int = Query(settings.DEFAULT_PAGE_SIZE, le=settings.MAX_PAGE_SIZE),
+    limit: int = Query(settings.default_page_size, le=settings.max_page_size),
     offset: int = Query(0, ge=0),
     _: bool = Depends(RateLimiter(times=60, seconds=60)),
 ):
@@ -29,23 +34,20 @@ async def list_players(
         "offset": offset,
     }
 
-    # Check cache
-    cached = await cache.get("/v1/players", params, "baseline")
-    if cached:
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = "public, max-age=60, s-maxage=900"
-        response.headers["X-Total-Count"] = str(cached["total"])
-        return cached
-
-    # Fetch data
-    result = await players_repo.list_players(
-        search=search, position=position, team=team, limit=limit, offset=offset
-    )
+    cache_control = "public, max-age=60, s-maxage=900"
+    validators = await validators_for(PLAYER_MODELS, "/v1/players", params)
+    if validators.matches(request):
+        return validators.not_modified(request, cache_control)
 
-    # Cache and return
-    await cache.set("/v1/players", params, "baseline", result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=60, s-maxage=900"
-    response.headers["X-Total-Count"] = str(result["total"])
+    # Check cache
+    cached = await cache.get_entry("/v1/players", params, "baseline", version=validators.etag)
+    if cached is None:
+        result = await players_repo.list_players(
+            search=search, position=position, team=team, limit=limit, offset=offset
+        )
+        cached = await cache.set("/v1/players", params, "baseline", result, version=validators.etag)
 
-    return result
+    response = cached.response(request, PlayersList)
+    validators.apply(response, cache_control)
+    response.headers["X-Total-Count"] = str(cached.data["total"])
+    return response
@@ -1,28 +1,33 @@
 from typing import Optional
-from fastapi import APIRouter, Query, Response, HTTPException, Depends
+from fastapi import APIRouter, Query, Request, HTTPException, Depends
 from app.core.rate_limit import RateLimiter
 from app.api.models import ProjectionList, PlayerSeasonProjectionsList
 from app.core.projections_provider import get_provider
 from app.repositories.projections_repo import ProjectionsRepository
-from app.core.config import settings
+from app.core.settings import get_settings
 from app.core.cache import cache
+from app.core.conditional import validators_for
 
 router = APIRouter(prefix="/v1/projections", tags=["Projections"])
+settings = get_settings()
 projections_repo = ProjectionsRepository()
 
+# dbt models behind these responses, for ETag / Last-Modified
+PROJECTION_MODELS = ("f_weekly_projection", "stg_players")
+
 
 @router.get("/{season}/{week}", response_model=ProjectionList)
 async def get_weekly_projections(
     season: int,
     week: int,
-    response: Response,
+    request: Request,
     scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
     search: Optional[str] = Query(None, description="Search by player name"),
     position: Optional[str] = Query(None, description="Filter by position"),
     team: Optional[str] = Query(None, description="Filter by team"),
     sort_by: str = Query("proj", description="Sort field (proj, low, high, name)"),
     sort_desc: bool = Query(True, description="Sort descending"),
-    limit: int = Query(settings.DEFAULT_PAGE_SIZE, le=settings.MAX_PAGE_SIZE),
+    limit: int = Query(settings.default_page_size, le=settings.max_page_size),
     offset: int = Query(0, ge=0),
     _: bool = Depends(RateLimiter(times=60, seconds=60)),
 ):
@@ -54,49 +59,52 @@ async def get_weekly_projections(
     }
 
     cache_key = f"/v1/projections/{season}/{week}"
-    cached = await cache.get(cache_key, params, settings.PROJECTION_PROVIDER)
-    if cached:
-        # Convert back to API scoring value for cached response
-        cached["scoring"] = scoring
-        for item in cached.get("items", []):
-            item["scoring"] = scoring
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = "public, max-age=60, s-maxage=900"
-        response.headers["X-Total-Count"] = str(cached["total"])
-        return cached
-
-    provider = get_provider(settings.PROJECTION_PROVIDER)
-    result = await provider.weekly(
-        season=season,
-        week=week,
-        scoring=db_scoring,
-        search=search,
-        position=position,
-        team=team,
-        sort_by=sort_by,
-        sort_desc=sort_desc,
-        limit=limit,
-        offset=offset,
+    cache_control = "public, max-age=60, s-maxage=900"
+    validators = await validators_for(
+        PROJECTION_MODELS, cache_key, params, settings.projection_provider
     )
+    if validators.matches(request):
+        return validators.not_modified(request, cache_control)
 
-    # Convert back to API scoring value for response
-    result["scoring"] = scoring
-    for item in result.get("items", []):
-        item["scoring"] = scoring
+    cached = await cache.get_entry(
+        cache_key, params, settings.projection_provider, version=validators.etag
+    )
+    if cached is None:
+        provider = get_provider(settings.projection_provider)
+        result = await provider.weekly(
+            season=season,
+            week=week,
+            scoring=db_scoring,
+            search=search,
+            position=position,
+            team=team,
+            sort_by=sort_by,
+            sort_desc=sort_desc,
+            limit=limit,
+            offset=offset,
+        )
 
-    await cache.set(cache_key, params, settings.PROJECTION_PROVIDER, result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=60, s-maxage=900"
-    response.headers["X-Total-Count"] = str(result["total"])
+        # Convert back to API scoring value for response
+        result["scoring"] = scoring
+        for item in result.get("items", []):
+            item["scoring"] = scoring
+
+        cached = await cache.set(
+            cache_key, params, settings.projection_provider, result, version=validators.etag
+        )
 
-    return result
+    # Serialized and compressed once per cache entry, not per request
+    response = cached.response(request, ProjectionList)
+    validators.apply(response, cache_control)
+    response.headers["X-Total-Count"] = str(cached.data["total"])
+    return response
 
 
 @router.get("/bulk/{season}/player/{player_id}", response_model=PlayerSeasonProjectionsList)
 async def get_player_season_projections(
     player_id: str,
     season: int,
-    response: Response,
+    request: Request,
     scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
     week_start: int = Query(1, ge=1, le=18, description="Starting week"),
     week_end: int = Query(18, ge=1, le=18, description="Ending week"),
@@ -118,33 +126,32 @@ async def get_player_season_projections(
     cache_key = f"/v1/projections/bulk/{season}/player/{player_id}"
     cache_params = {"scoring": db_scoring, "week_start": week_start, "week_end": week_end}
 
-    cached = await cache.get(cache_key, cache_params, "bulk_projections")
-    if cached:
-        # Convert back to API scoring value for cached response
-        cached["scoring"] = scoring
-        for item in cached.get("items", []):
-            item["scoring"] = scoring
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = (
-            "public, max-age=300, s-maxage=1800"  # Longer cache for bulk
-        )
-        return cached
-
-    result = await projections_repo.get_player_season_projections(
-        player_id=player_id,
-        season=season,
-        scoring=db_scoring,
-        week_start=week_start,
-        week_end=week_end,
+    cache_control = "public, max-age=300, s-maxage=1800"  # Longer cache for bulk
+    validators = await validators_for(PROJECTION_MODELS, cache_key, cache_params)
+    if validators.matches(request):
+        return validators.not_modified(request, cache_control)
+
+    cached = await cache.get_entry(
+        cache_key, cache_params, "bulk_projections", version=validators.etag
     )
+    if cached is None:
+        result = await projections_repo.get_player_season_projections(
+            player_id=player_id,
+            season=season,
+            scoring=db_scoring,
+            week_start=week_start,
+            week_end=week_end,
+        )
 
-    # Convert back to API scoring value for response
-    result["scoring"] = scoring
-    for item in result.get("items", []):
-        item["scoring"] = scoring
+        # Convert back to API scoring value for response
+        result["scoring"] = scoring
+        for item in result.get("items", []):
+            item["scoring"] = scoring
 
-    await cache.set(cache_key, cache_params, "bulk_projections", result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=300, s-maxage=1800"
+        cached = await cache.set(
+            cache_key, cache_params, "bulk_projections", result, version=validators.etag
+        )
 
-    return result
+    response = cached.response(request, PlayerSeasonProjectionsList)
+    validators.apply(response, cache_control)
+    return response
@@ -1,26 +1,36 @@
 from typing import Optional
-from fastapi import APIRouter, Query, Response, HTTPException, Depends
+from fastapi import APIRouter, Query, Request, HTTPException, Depends
 from app.core.rate_limit import RateLimiter
 from app.api.models import ROSList
 from app.core.projections_provider import get_provider
-from app.core.config import settings
+from app.core.settings import get_settings
 from app.core.cache import cache
+from app.core.conditional import validators_for
+from app.repositories.projections_repo import ROS_PER_WEEK_FORMATS
 
 router = APIRouter(prefix="/v1/ros", tags=["Rest of Season"])
+settings = get_settings()
+
+# dbt models behind these responses, for ETag / Last-Modified
+ROS_MODELS = ("f_ros_projection", "stg_players")
 
 
 @router.get("/{season}", response_model=ROSList)
 async def get_ros_projections(
     season: int,
-    response: Response,
+    request: Request,
     scoring: str = Query("ppr", description="Scoring system (ppr, half_ppr, standard)"),
     search: Optional[str] = Query(None, description="Search by player name"),
     position: Optional[str] = Query(None, description="Filter by position"),
     team: Optional[str] = Query(None, description="Filter by team"),
     sort_by: str = Query("proj_total", description="Sort field (proj_total, low, high, name)"),
     sort_desc: bool = Query(True, description="Sort descending"),
-    limit: int = Query(settings.DEFAULT_PAGE_SIZE, le=settings.MAX_PAGE_SIZE),
+    limit: int = Query(settings.default_page_size, le=settings.max_page_size),
     offset: int = Query(0, ge=0),
+    per_week: str = Query(
+        "objects",
+        description="Per-week breakdown: objects ([{week, proj}]), columns ({weeks, proj}) or none",
+    ),
     _: bool = Depends(RateLimiter(times=60, seconds=60)),
 ):
     """Get rest of season projections for all players"""
@@ -36,6 +46,9 @@ async def get_ros_projections(
     if sort_by not in ["proj_total", "low", "high", "name"]:
         raise HTTPException(status_code=400, detail="Invalid sort_by field")
 
+    if per_week not in ROS_PER_WEEK_FORMATS:
+        raise HTTPException(status_code=400, detail="per_week must be objects, columns, or none")
+
     params = {
         "scoring": db_scoring,
         "search": search,
@@ -45,41 +58,43 @@ async def get_ros_projections(
         "sort_desc": sort_desc,
         "limit": limit,
         "offset": offset,
+        "per_week": per_week,
     }
 
     cache_key = f"/v1/ros/{season}"
-    cached = await cache.get(cache_key, params, settings.PROJECTION_PROVIDER)
-    if cached:
-        # Convert back to API scoring value for cached response
-        cached["scoring"] = scoring
-        for item in cached.get("items", []):
-            item["scoring"] = scoring
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = "public, max-age=300, s-maxage=1800"
-        response.headers["X-Total-Count"] = str(cached["total"])
-        return cached
+    cache_control = "public, max-age=300, s-maxage=1800"
+    validators = await validators_for(ROS_MODELS, cache_key, params, settings.projection_provider)
+    if validators.matches(request):
+        return validators.not_modified(request, cache_control)
 
-    provider = get_provider(settings.PROJECTION_PROVIDER)
-    result = await provider.ros(
-        season=season,
-        scoring=db_scoring,
-        search=search,
-        position=position,
-        team=team,
-        sort_by=sort_by,
-        sort_desc=sort_desc,
-        limit=limit,
-        offset=offset,
+    cached = await cache.get_entry(
+        cache_key, params, settings.projection_provider, version=validators.etag
     )
+    if cached is None:
+        provider = get_provider(settings.projection_provider)
+        result = await provider.ros(
+            season=season,
+            scoring=db_scoring,
+            search=search,
+            position=position,
+            team=team,
+            sort_by=sort_by,
+            sort_desc=sort_desc,
+            limit=limit,
+            offset=offset,
+            per_week=per_week,
+        )
 
-    # Convert back to API scoring value for response
-    result["scoring"] = scoring
-    for item in result.get("items", []):
-        item["scoring"] = scoring
+        # Convert back to API scoring value for response
+        result["scoring"] = scoring
+        for item in result.get("items", []):
+            item["scoring"] = scoring
 
-    await cache.set(cache_key, params, settings.PROJECTION_PROVIDER, result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=300, s-maxage=1800"
-    response.headers["X-Total-Count"] = str(result["total"])
+        cached = await cache.set(
+            cache_key, params, settings.projection_provider, result, version=validators.etag
+        )
 
-    return result
+    response = cached.response(request, ROSList)
+    validators.apply(response, cache_control)
+    response.headers["X-Total-Count"] = str(cached.data["total"])
+    return response
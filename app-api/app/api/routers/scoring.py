@@ -1,19 +1,24 @@
+import hashlib
+import json
 from typing import Dict
-from fastapi import APIRouter, Response, Depends
+from fastapi import APIRouter, Request, Response, Depends
 from app.core.rate_limit import RateLimiter
 from app.api.models import ScoringPreviewRequest, ProjectionList
 from app.repositories.scoring_repo import ScoringRepository
-from app.core.config import settings
 from app.core.cache import cache
+from app.core.conditional import validators_for
 
 router = APIRouter(prefix="/v1/scoring", tags=["Custom Scoring"])
 scoring_repo = ScoringRepository()
 
+# dbt models behind these responses, for ETag / Last-Modified
+SCORING_MODELS = ("int_weekly_projections_components",)
+
 
 @router.post("/preview", response_model=ProjectionList)
 async def preview_custom_scoring(
     request: ScoringPreviewRequest,
-    response: Response,
+    http_request: Request,
     _: bool = Depends(RateLimiter(times=30, seconds=60)),
 ):
     """Preview projections with custom scoring"""
@@ -27,31 +32,29 @@ async def preview_custom_scoring(
     }
 
     cache_key = f"/v1/scoring/preview"
-    scoring_hash = hash(str(sorted(request.scoring.items())))
+    scoring_hash = hashlib.md5(json.dumps(request.scoring, sort_keys=True).encode()).hexdigest()
     params["scoring_hash"] = scoring_hash
 
-    cached = await cache.get(cache_key, params, "custom")
-    if cached:
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = "public, max-age=30, s-maxage=300"
-        response.headers["X-Total-Count"] = str(cached["total"])
-        return cached
-
-    result = await scoring_repo.preview_scoring(
-        season=request.season,
-        week=request.week,
-        scoring=request.scoring,
-        filters=request.filters,
-        limit=request.limit,
-        offset=request.offset,
-    )
+    # POST responses get validators but never 304s
+    cache_control = "public, max-age=30, s-maxage=300"
+    validators = await validators_for(SCORING_MODELS, cache_key, params)
 
-    await cache.set(cache_key, params, "custom", result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=30, s-maxage=300"
-    response.headers["X-Total-Count"] = str(result["total"])
+    cached = await cache.get_entry(cache_key, params, "custom", version=validators.etag)
+    if cached is None:
+        result = await scoring_repo.preview_scoring(
+            season=request.season,
+            week=request.week,
+            scoring=request.scoring,
+            filters=request.filters,
+            limit=request.limit,
+            offset=request.offset,
+        )
+        cached = await cache.set(cache_key, params, "custom", result, version=validators.etag)
 
-    return result
+    response = cached.response(http_request, ProjectionList)
+    validators.apply(response, cache_control)
+    response.headers["X-Total-Count"] = str(cached.data["total"])
+    return response
 
 
 @router.get("/presets")
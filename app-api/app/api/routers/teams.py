@@ -1,6 +1,6 @@
 """Team management API routes."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence, Set, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -9,9 +9,10 @@ from sqlalchemy import select, delete, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.auth import auth_service
+from app.core.auth import UserPrincipal, auth_service
+from app.core.metrics import DB_QUERY_LATENCY, DB_ROWS, timed
 from app.db.async_session import get_session
-from app.db.models import User, Team, TeamRoster
+from app.db.models import Team, TeamRoster
 from app.services.roster_service import RosterService, RosterSlot
 
 
@@ -101,7 +102,7 @@ class UpdateRosterRequest(BaseModel):
 
 @router.get("", response_model=List[TeamResponse])
 async def get_user_teams(
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Get all teams for the authenticated user."""
@@ -129,10 +130,35 @@ async def get_user_teams(
     ]
 
 
+@router.get("/rosters", response_model=List[TeamRosterResponse])
+async def get_user_team_rosters(
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the hydrated roster of every team of the authenticated user."""
+    result = await session.execute(
+        select(Team)
+        .options(selectinload(Team.roster_players))
+        .where(Team.user_id == current_user.id)
+        .order_by(Team.created_at.desc())
+    )
+    teams = result.scalars().all()
+
+    with timed(DB_QUERY_LATENCY, "teams", "hydrate_rosters"):
+        infos, projections = await _hydrate_players(
+            session,
+            {rp.player_id for team in teams for rp in team.roster_players},
+            {team.scoring_system for team in teams},
+        )
+    DB_ROWS.observe(len(infos), "teams", "hydrate_rosters")
+
+    return [_roster_response(team, team.roster_players, infos, projections) for team in teams]
+
+
 @router.post("", response_model=TeamResponse)
 async def create_team(
     request: CreateTeamRequest,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new team for the authenticated user."""
@@ -168,7 +194,7 @@ async def create_team(
 @router.get("/{team_id}", response_model=TeamResponse)
 async def get_team(
     team_id: UUID,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Get a specific team."""
@@ -195,7 +221,7 @@ async def get_team(
 async def update_team(
     team_id: UUID,
     request: UpdateTeamRequest,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Update a team."""
@@ -237,7 +263,7 @@ async def update_team(
 @router.delete("/{team_id}")
 async def delete_team(
     team_id: UUID,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Delete a team."""
@@ -293,113 +319,116 @@ def _validate_roster_positions(roster_positions: RosterPositions) -> None:
         )
 
 
-async def _get_player_info(session: AsyncSession, player_id: str) -> Dict[str, Any] | None:
-    """Get player information from stg_players (includes both regular players and DST)."""
+_HYDRATE_PLAYERS_SQL = text("""
+    WITH players AS (
+        SELECT DISTINCT ON (player_id)
+            player_id,
+            display_name as name,
+            CASE
+                WHEN position = 'DST' THEN SPLIT_PART(player_id, '_DST', 1)
+                ELSE NULL
+            END as team,
+            position
+        FROM dwh_staging.stg_players
+        WHERE player_id = ANY(CAST(:player_ids AS text[]))
+        ORDER BY player_id
+    ),
+    next_week AS (
+        -- Next week's projection: the earliest current or future week, falling back to
+        -- the earliest projection available
+        SELECT DISTINCT ON (fp.player_id, fp.scoring)
+            fp.player_id,
+            fp.scoring,
+            fp.proj_pts,
+            fp.low,
+            fp.high,
+            fp.season,
+            fp.week
+        FROM dwh_marts.f_weekly_projection fp
+        LEFT JOIN dwh_marts.f_calendar_weeks cw
+            ON fp.season = cw.season AND fp.week = cw.week
+        WHERE fp.player_id = ANY(CAST(:player_ids AS text[]))
+        AND fp.scoring = ANY(CAST(:scorings AS text[]))
+        ORDER BY
+            fp.player_id,
+            fp.scoring,
+            CASE WHEN cw.week_status IN ('current', 'future') THEN 1 ELSE 2 END,
+            fp.season,
+            fp.week
+    )
+    SELECT p.*, nw.scoring, nw.proj_pts, nw.low, nw.high, nw.season, nw.week
+    FROM players p
+    LEFT JOIN next_week nw ON nw.player_id = p.player_id
+""")
+
+
+async def _hydrate_players(
+    session: AsyncSession, player_ids: Set[str], scorings: Set[str]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, str], Dict[str, Any]]]:
+    """
+    Player info and next-week projections for many players in one query.
+
+    Returns player info by player_id and projections by (player_id, scoring); each player
+    is read once however many of the user's teams roster them.
+    """
+    if not player_ids:
+        return {}, {}
     try:
         result = await session.execute(
-            text("""
-                SELECT 
-                    display_name as name,
-                    CASE 
-                        WHEN position = 'DST' THEN SPLIT_PART(player_id, '_DST', 1)
-                        ELSE NULL 
-                    END as team,
-                    position,
-                    NULL as jersey_number,
-                    NULL as headshot
-                FROM dwh_staging.stg_players 
-                WHERE player_id = :player_id
-                LIMIT 1
-            """),
-            {"player_id": player_id},
+            _HYDRATE_PLAYERS_SQL,
+            {"player_ids": sorted(player_ids), "scorings": sorted(scorings)},
         )
-        row = result.fetchone()
-        if row:
-            return {
-                "name": row[0],
-                "team": row[1],
-                "position": row[2],
-                "jersey_number": row[3],
-                "headshot": row[4],
-            }
-        return None
     except Exception:
-        return None
+        return {}, {}
+
+    infos: Dict[str, Dict[str, Any]] = {}
+    projections: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in result.mappings():
+        infos[row["player_id"]] = {
+            "name": row["name"],
+            "team": row["team"],
+            "position": row["position"],
+            "jersey_number": None,
+            "headshot": None,
+        }
+        if row["scoring"] is not None:
+            projections[(row["player_id"], row["scoring"])] = {
+                "proj_pts": float(row["proj_pts"]) if row["proj_pts"] else 0,
+                "low": float(row["low"]) if row["low"] else 0,
+                "high": float(row["high"]) if row["high"] else 0,
+                "season": row["season"],
+                "week": row["week"],
+            }
+    return infos, projections
 
 
-async def _get_weekly_projection(
-    session: AsyncSession, player_id: str, scoring: str = "ppr"
-) -> Dict[str, Any] | None:
-    """Get next week's projection for a player."""
-    try:
-        # Get the next upcoming week's projection
-        # Priority: current week > earliest future week > latest available projection
-        result = await session.execute(
-            text("""
-                WITH next_week AS (
-                    -- First try to get current or next upcoming week
-                    SELECT 
-                        fp.proj_pts,
-                        fp.low,
-                        fp.high,
-                        fp.season,
-                        fp.week,
-                        cw.week_status,
-                        1 as priority
-                    FROM dwh_marts.f_weekly_projection fp
-                    JOIN dwh_marts.f_calendar_weeks cw 
-                        ON fp.season = cw.season AND fp.week = cw.week
-                    WHERE fp.player_id = :player_id 
-                    AND fp.scoring = :scoring
-                    AND cw.week_status IN ('current', 'future')
-                    
-                    UNION ALL
-                    
-                    -- Fallback to most recent projection if no future weeks available
-                    SELECT 
-                        fp.proj_pts,
-                        fp.low,
-                        fp.high,
-                        fp.season,
-                        fp.week,
-                        'fallback' as week_status,
-                        2 as priority
-                    FROM dwh_marts.f_weekly_projection fp
-                    WHERE fp.player_id = :player_id 
-                    AND fp.scoring = :scoring
-                    AND NOT EXISTS (
-                        SELECT 1 FROM dwh_marts.f_weekly_projection fp2
-                        JOIN dwh_marts.f_calendar_weeks cw2 
-                            ON fp2.season = cw2.season AND fp2.week = cw2.week
-                        WHERE fp2.player_id = :player_id 
-                        AND fp2.scoring = :scoring
-                        AND cw2.week_status IN ('current', 'future')
-                    )
-                )
-                SELECT 
-                    proj_pts,
-                    low,
-                    high,
-                    season,
-                    week
-                FROM next_week
-                ORDER BY priority ASC, season ASC, week ASC
-                LIMIT 1
-            """),
-            {"player_id": player_id, "scoring": scoring},
+def _roster_response(
+    team: Team,
+    roster_players: Sequence[TeamRoster],
+    infos: Dict[str, Dict[str, Any]],
+    projections: Dict[Tuple[str, str], Dict[str, Any]],
+) -> TeamRosterResponse:
+    players = []
+    for roster_player in roster_players:
+        player_info = infos.get(roster_player.player_id)
+        if player_info:
+            # Copied: a player on several teams gets each team's scoring projection
+            player_info = dict(
+                player_info,
+                projection=projections.get((roster_player.player_id, team.scoring_system)),
+            )
+        players.append(
+            RosterPlayerResponse(
+                player_id=roster_player.player_id,
+                roster_slot=RosterSlotModel(**roster_player.roster_slot),
+                added_at=roster_player.added_at.isoformat(),
+                player_info=player_info,
+            )
         )
-        row = result.fetchone()
-        if row:
-            return {
-                "proj_pts": float(row[0]) if row[0] else 0,
-                "low": float(row[1]) if row[1] else 0,
-                "high": float(row[2]) if row[2] else 0,
-                "season": row[3],
-                "week": row[4],
-            }
-        return None
-    except Exception:
-        return None
+
+    # Get available slots (we'll calculate for a generic player position for now)
+    # In a real implementation, you'd want to specify which player you're adding
+    return TeamRosterResponse(team_id=str(team.id), players=players, available_slots=[])
 
 
 # Roster Management Endpoints
@@ -408,7 +437,7 @@ async def _get_weekly_projection(
 @router.get("/{team_id}/roster", response_model=TeamRosterResponse)
 async def get_team_roster(
     team_id: UUID,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Get team roster with all players and available slots."""
@@ -419,46 +448,20 @@ async def get_team_roster(
     result = await session.execute(select(TeamRoster).where(TeamRoster.team_id == team_id))
     roster_players = result.scalars().all()
 
-    # Convert to response format with player info
-    players = []
-    for roster_player in roster_players:
-        slot_data = roster_player.roster_slot
-
-        # Get player information
-        player_info = await _get_player_info(session, roster_player.player_id)
-
-        # Get weekly projection
-        projection = await _get_weekly_projection(
-            session, roster_player.player_id, team.scoring_system
+    with timed(DB_QUERY_LATENCY, "teams", "hydrate_roster"):
+        infos, projections = await _hydrate_players(
+            session, {rp.player_id for rp in roster_players}, {team.scoring_system}
         )
+    DB_ROWS.observe(len(roster_players), "teams", "hydrate_roster")
 
-        # Combine player info and projection
-        if player_info:
-            player_info["projection"] = projection
-
-        players.append(
-            RosterPlayerResponse(
-                player_id=roster_player.player_id,
-                roster_slot=RosterSlotModel(**slot_data),
-                added_at=roster_player.added_at.isoformat(),
-                player_info=player_info,
-            )
-        )
-
-    # Get available slots (we'll calculate for a generic player position for now)
-    # In a real implementation, you'd want to specify which player you're adding
-    available_slots_data = []
-
-    return TeamRosterResponse(
-        team_id=str(team_id), players=players, available_slots=available_slots_data
-    )
+    return _roster_response(team, roster_players, infos, projections)
 
 
 @router.post("/{team_id}/roster", response_model=RosterPlayerResponse)
 async def add_player_to_roster(
     team_id: UUID,
     request: AddPlayerRequest,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Add a player to team roster."""
@@ -482,18 +485,10 @@ async def add_player_to_roster(
     )
 
     # Get player information for response
-    player_info = await _get_player_info(session, roster_entry.player_id)
-    projection = await _get_weekly_projection(session, roster_entry.player_id, team.scoring_system)
-
-    if player_info:
-        player_info["projection"] = projection
-
-    return RosterPlayerResponse(
-        player_id=roster_entry.player_id,
-        roster_slot=RosterSlotModel(**roster_entry.roster_slot),
-        added_at=roster_entry.added_at.isoformat(),
-        player_info=player_info,
+    infos, projections = await _hydrate_players(
+        session, {roster_entry.player_id}, {team.scoring_system}
     )
+    return _roster_response(team, [roster_entry], infos, projections).players[0]
 
 
 @router.put("/{team_id}/roster/{player_id}", response_model=RosterPlayerResponse)
@@ -501,7 +496,7 @@ async def update_player_roster_slot(
     team_id: UUID,
     player_id: str,
     request: UpdateRosterRequest,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Move a player to a different roster slot."""
@@ -540,7 +535,7 @@ async def update_player_roster_slot(
 async def remove_player_from_roster(
     team_id: UUID,
     player_id: str,
-    current_user: User = Depends(auth_service.get_current_user),
+    current_user: UserPrincipal = Depends(auth_service.get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """Remove a player from team roster."""
@@ -1,15 +1,18 @@
 from typing import Optional, List
-from fastapi import APIRouter, Query, Response, HTTPException, Depends
+from fastapi import APIRouter, Query, Request, HTTPException, Depends
 from app.core.rate_limit import RateLimiter
 from pydantic import BaseModel
 from app.api.models import UsageWeeklyItem
 from app.repositories.usage_repo import UsageRepository
-from app.core.config import settings
 from app.core.cache import cache
+from app.core.conditional import validators_for
 
 router = APIRouter(prefix="/v1/usage", tags=["Player Usage"])
 usage_repo = UsageRepository()
 
+# dbt models behind these responses, for ETag / Last-Modified
+USAGE_MODELS = ("int_player_week_usage", "f_weekly_projection", "stg_players")
+
 
 class UsageList(BaseModel):
     season: int
@@ -23,7 +26,7 @@ class UsageList(BaseModel):
 async def get_player_usage(
     season: int,
     player_id: str,
-    response: Response,
+    request: Request,
     weeks: Optional[str] = Query(
         None, description="Comma-separated weeks (e.g., '1,2,3' or '1-4')"
     ),
@@ -50,21 +53,23 @@ async def get_player_usage(
     params = {"weeks": weeks}
 
     cache_key = f"/v1/usage/{season}/{player_id}"
-    cached = await cache.get(cache_key, params, "baseline")
-    if cached:
-        response.headers["ETag"] = f'"{hash(str(cached))}"'
-        response.headers["Cache-Control"] = "public, max-age=300, s-maxage=900"
-        response.headers["X-Total-Count"] = str(cached["total"])
-        return cached
+    cache_control = "public, max-age=300, s-maxage=900"
+    validators = await validators_for(USAGE_MODELS, cache_key, params)
+    if validators.matches(request):
+        return validators.not_modified(request, cache_control)
 
-    result = await usage_repo.get_player_usage(season=season, player_id=player_id, weeks=week_list)
+    cached = await cache.get_entry(cache_key, params, "baseline", version=validators.etag)
+    if cached is None:
+        result = await usage_repo.get_player_usage(
+            season=season, player_id=player_id, weeks=week_list
+        )
 
-    if not result["items"]:
-        raise HTTPException(status_code=404, detail="Player usage data not found")
+        if not result["items"]:
+            raise HTTPException(status_code=404, detail="Player usage data not found")
 
-    await cache.set(cache_key, params, "baseline", result)
-    response.headers["ETag"] = f'"{hash(str(result))}"'
-    response.headers["Cache-Control"] = "public, max-age=300, s-maxage=900"
-    response.headers["X-Total-Count"] = str(result["total"])
+        cached = await cache.set(cache_key, params, "baseline", result, version=validators.etag)
 
-    return result
+    response = cached.response(request, UsageList)
+    validators.apply(response, cache_control)
+    response.headers["X-Total-Count"] = str(cached.data["total"])
+    return response
@@ -1,11 +1,23 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import create_engine, text
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import auth_service
+from app.core.metrics import render_prometheus
+from app.core.profiling import profile_event_loop, profile_in_progress
 from app.core.settings import get_settings
-from app.api.routers import players, projections, ros, usage, scoring, actual, auth, teams
+from app.core.warmup import readiness
+from app.db.async_session import get_session
+from app.db.query_log import list_slow_queries, query_recorder
+from app.api.routers import players, projections, ros, usage, scoring, actual, auth, teams, export
 
 router = APIRouter()
 
+# SQLSTATE for a missing table, e.g. before migrations have run
+_UNDEFINED_TABLE = "42P01"
+
 # Include all sub-routers
 router.include_router(auth.router)
 router.include_router(teams.router)
@@ -15,6 +27,7 @@ router.include_router(ros.router)
 router.include_router(usage.router)
 router.include_router(scoring.router)
 router.include_router(actual.router)
+router.include_router(export.router)
 
 
 @router.get("/health")
@@ -23,6 +36,21 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get("/ready")
+async def readiness_check(response: Response) -> dict[str, Any]:
+    """Readiness probe: 503 until this worker has finished its startup cache warmup."""
+    if not readiness.ready:
+        response.status_code = 503
+        return {"status": "warming"}
+    return {"status": "ready", "warmed": len(readiness.warmed)}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint for this worker's request, DB and cache metrics."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/v1/meta")
 async def meta() -> dict[str, str]:
     """Meta information endpoint."""
@@ -35,28 +63,186 @@ async def meta() -> dict[str, str]:
 
 
 @router.get("/v1/ops/ingest/manifest/latest")
-async def get_latest_manifest() -> Dict[str, Any]:
-    """Get latest ingest manifest records per dataset."""
+async def get_latest_manifest(session: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
+    """
+    Get latest ingest manifest records per dataset.
+
+    Each record carries the stage timings, bytes written and row outcomes of the load that
+    applied it (null for loads from before stage metrics were recorded).
+    """
     try:
-        settings = get_settings()
-        engine = create_engine(settings.database_url)
-
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("""
-                SELECT DISTINCT ON (dataset) 
-                    dataset,
-                    partition,
-                    row_count,
-                    applied_at
-                FROM ops.raw_ingest_manifest
-                ORDER BY dataset, applied_at DESC
-            """)
+        # ops.ingest_stage_metrics is created on the first load that records metrics
+        has_metrics = (
+            await session.execute(
+                text("SELECT to_regclass('ops.ingest_stage_metrics') IS NOT NULL")
             )
-
-            records = [dict(row._mapping) for row in result]
+        ).scalar()
+        metrics_join = (
+            """
+            LEFT JOIN LATERAL (
+                SELECT stages_ms, duration_ms, bytes_written,
+                       rows_inserted, rows_updated, rows_unchanged
+                FROM ops.ingest_stage_metrics s
+                WHERE s.dataset = m.dataset AND s.partition = m.partition
+                ORDER BY s.recorded_at DESC
+                LIMIT 1
+            ) sm ON true
+            """
+            if has_metrics
+            else """
+            LEFT JOIN (
+                SELECT NULL::jsonb AS stages_ms, NULL::int AS duration_ms,
+                       NULL::bigint AS bytes_written, NULL::int AS rows_inserted,
+                       NULL::int AS rows_updated, NULL::int AS rows_unchanged
+            ) sm ON true
+            """
+        )
+        result = await session.execute(
+            text(f"""
+            SELECT DISTINCT ON (m.dataset)
+                m.dataset,
+                m.partition,
+                m.row_count,
+                m.applied_at,
+                sm.stages_ms,
+                sm.duration_ms,
+                sm.bytes_written,
+                sm.rows_inserted,
+                sm.rows_updated,
+                sm.rows_unchanged
+            FROM ops.raw_ingest_manifest m
+            {metrics_join}
+            ORDER BY m.dataset, m.applied_at DESC
+        """)
+        )
+        records = [dict(row) for row in result.mappings()]
 
         return {"datasets": records, "total": len(records)}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch manifest: {str(e)}")
+
+
+# Everything dbt builds that the API reads, see dwh/dbt_project.yml
+_MART_SCHEMAS = ("dwh_marts", "mart")
+
+_OPS_STATUS_SQL = f"""
+WITH datasets AS (
+    SELECT
+        dataset,
+        max(applied_at) AS last_applied_at,
+        extract(epoch FROM now() - max(applied_at))::int AS age_seconds,
+        (array_agg(partition ORDER BY applied_at DESC))[1] AS latest_partition,
+        count(*) AS partitions,
+        sum(row_count) AS row_count
+    FROM ops.raw_ingest_manifest
+    GROUP BY dataset
+),
+marts AS (
+    SELECT
+        s.schemaname || '.' || s.relname AS mart,
+        greatest(c.reltuples, 0)::bigint AS row_estimate,
+        b.built_at
+    FROM pg_stat_user_tables s
+    JOIN pg_class c ON c.oid = s.relid
+    LEFT JOIN ops.model_builds b ON b.model = s.relname
+    WHERE s.schemaname IN ({", ".join(f"'{schema}'" for schema in _MART_SCHEMAS)})
+)
+SELECT
+    now() AS checked_at,
+    (SELECT max(last_applied_at) FROM datasets) AS last_ingest_at,
+    coalesce((SELECT json_agg(d ORDER BY d.dataset) FROM datasets d), '[]') AS datasets,
+    coalesce(
+        (
+            SELECT json_agg(
+                json_build_object(
+                    'mart', m.mart,
+                    'row_estimate', m.row_estimate,
+                    'built_at', m.built_at,
+                    'stale', m.built_at IS NULL
+                        OR m.built_at < coalesce(
+                            (SELECT max(last_applied_at) FROM datasets), '-infinity'
+                        )
+                )
+                ORDER BY m.mart
+            )
+            FROM marts m
+        ),
+        '[]'
+    ) AS marts
+"""
+
+
+@router.get("/v1/ops/status")
+async def get_ops_status(session: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
+    """
+    Data freshness per raw dataset and per mart, in one query cheap enough to poll.
+
+    Datasets come from the ingest manifest. Marts come from the catalog, with build times
+    from the dbt build log (ops.model_builds); a mart is flagged stale when it has no
+    recorded build or was last built before the most recent ingest.
+    """
+    try:
+        row = (await session.execute(text(_OPS_STATUS_SQL))).mappings().one()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Failed to fetch ops status: {str(e)}") from e
+
+    return {
+        "status": "ok",
+        "checked_at": row["checked_at"],
+        "last_ingest_at": row["last_ingest_at"],
+        "datasets": row["datasets"],
+        "marts": row["marts"],
+    }
+
+
+@router.get("/v1/ops/queries/slow")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    fingerprint: Optional[str] = Query(None, description="Only samples for this fingerprint"),
+    session: AsyncSession = Depends(get_session),
+    _admin=Depends(auth_service.get_admin_user),
+) -> Dict[str, Any]:
+    """
+    Per-fingerprint query timings for this worker plus stored EXPLAIN samples.
+
+    Admin only: query text and EXPLAIN (ANALYZE, BUFFERS) plans expose the schema, index
+    names and plan literals.
+    """
+    try:
+        samples = await list_slow_queries(session, limit=limit, fingerprint=fingerprint)
+    except ProgrammingError as e:
+        # Migrations not applied yet; timings are still useful on their own
+        if getattr(e.orig, "sqlstate", None) != _UNDEFINED_TABLE:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to fetch slow queries: {str(e)}"
+            ) from e
+        samples = []
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to fetch slow queries: {str(e)}"
+        ) from e
+
+    return {"fingerprints": query_recorder.top(limit), "samples": samples}
+
+
+@router.get("/v1/ops/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="How long to sample the event loop"),
+    interval_ms: float = Query(5.0, ge=1, le=100, description="Sampling interval"),
+    _admin=Depends(auth_service.get_admin_user),
+) -> PlainTextResponse:
+    """
+    Sample this worker's event loop and return flamegraph collapsed stacks.
+
+    Admin only. Feed the output to flamegraph.pl or speedscope; with several workers each
+    request profiles whichever worker serves it.
+    """
+    max_seconds = get_settings().profile_max_seconds
+    if seconds > max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {max_seconds}")
+    if profile_in_progress():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    collapsed = await profile_event_loop(seconds, interval_ms / 1000)
+    return PlainTextResponse(collapsed)
@@ -1,23 +1,28 @@
 """Authentication service with JWT and OAuth support."""
 
 import hashlib
+import logging
 import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import httpx
-from jose import JWTError, jwt
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.oauth import google_oauth
 from app.core.settings import get_settings
 from app.db.async_session import get_session
 from app.db.models import RefreshToken, User
 
+logger = logging.getLogger(__name__)
+
 
 class UserInfo(BaseModel):
     """User information from OAuth provider."""
@@ -47,12 +52,62 @@ class AuthTokens(BaseModel):
     user: Dict[str, Any]
 
 
+@dataclass(frozen=True)
+class UserPrincipal:
+    """The authenticated user as routes see it; not bound to any session."""
+
+    id: UUID
+    email: str
+    name: str
+    avatar_url: Optional[str] = None
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of UserPrincipal by user id, so authenticated requests skip the
+    users lookup.
+
+    Entries live for USER_CACHE_TTL_SECONDS and are dropped on this worker when the
+    profile changes or the user logs out; other workers see the change once their
+    entry expires.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[UserPrincipal, float]]" = OrderedDict()
+
+    def get(self, user_id: UUID) -> Optional[UserPrincipal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        principal, expires = entry
+        if expires <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        return principal
+
+    def set(self, principal: UserPrincipal, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[principal.id] = (principal, time.monotonic() + ttl)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class AuthService:
     """Authentication service for handling JWT tokens and OAuth."""
 
     def __init__(self):
         self.settings = get_settings()
         self.security = HTTPBearer()
+        self.principals = PrincipalCache()
 
     def create_access_token(self, user_id: str) -> str:
         """Create JWT access token."""
@@ -65,6 +120,8 @@ class AuthService:
             "iat": datetime.now(timezone.utc),
             "token_type": "access",
         }
+        from jose import jwt
+
         return jwt.encode(payload, self.settings.jwt_secret_key, algorithm="HS256")
 
     def create_refresh_token(self) -> str:
@@ -85,8 +142,6 @@ class AuthService:
         )
 
         # Clean up old refresh tokens for this user
-        from sqlalchemy import delete
-
         await session.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
 
         # Create new refresh token
@@ -101,36 +156,35 @@ class AuthService:
         token_hash = self.hash_token(refresh_token)
 
         result = await session.execute(
-            select(RefreshToken)
-            .join(User)
+            select(User)
+            .join(RefreshToken, RefreshToken.user_id == User.id)
             .where(
                 RefreshToken.token_hash == token_hash,
                 RefreshToken.expires_at > datetime.now(timezone.utc),
             )
         )
-        db_token = result.scalar_one_or_none()
-
-        if not db_token:
-            return None
-
-        # Get the associated user
-        user_result = await session.execute(select(User).where(User.id == db_token.user_id))
-        return user_result.scalar_one_or_none()
+        return result.scalar_one_or_none()
 
     async def delete_refresh_token(self, session: AsyncSession, refresh_token: str) -> bool:
         """Delete a specific refresh token from database."""
-        from sqlalchemy import delete
-
         token_hash = self.hash_token(refresh_token)
 
         result = await session.execute(
-            delete(RefreshToken).where(RefreshToken.token_hash == token_hash)
+            delete(RefreshToken)
+            .where(RefreshToken.token_hash == token_hash)
+            .returning(RefreshToken.user_id)
         )
+        user_ids = result.scalars().all()
         await session.commit()
-        return result.rowcount > 0
+        for user_id in user_ids:
+            self.principals.invalidate(user_id)
+        return len(user_ids) > 0
 
     def verify_access_token(self, token: str) -> Optional[TokenData]:
         """Verify JWT access token."""
+        # jose (and cryptography behind it) loads on first use; warmup imports it early
+        from jose import JWTError, jwt
+
         try:
             payload = jwt.decode(token, self.settings.jwt_secret_key, algorithms=["HS256"])
 
@@ -144,48 +198,25 @@ class AuthService:
 
     async def exchange_google_code(self, code: str, redirect_uri: str) -> Optional[UserInfo]:
         """Exchange Google authorization code for user info."""
+        import httpx
+
         try:
-            # Exchange authorization code for access token
-            token_url = "https://oauth2.googleapis.com/token"
-            token_data = {
-                "client_id": self.settings.google_client_id,
-                "client_secret": self.settings.google_client_secret,
-                "code": code,
-                "grant_type": "authorization_code",
-                "redirect_uri": redirect_uri,
-            }
-            
-            async with httpx.AsyncClient() as client:
-                token_response = await client.post(token_url, data=token_data)
-                
-            if token_response.status_code != 200:
-                return None
-                
-            token_json = token_response.json()
-            access_token = token_json.get("access_token")
-            
-            if not access_token:
-                return None
-            
-            # Get user info from Google
-            user_info_url = f"https://www.googleapis.com/oauth2/v2/userinfo?access_token={access_token}"
-            async with httpx.AsyncClient() as client:
-                user_response = await client.get(user_info_url)
-                
-            if user_response.status_code != 200:
-                return None
-                
-            user_data = user_response.json()
-            
-            return UserInfo(
-                id=user_data.get("id"),
-                email=user_data.get("email"),
-                name=user_data.get("name"),
-                picture=user_data.get("picture"),
-            )
-        except Exception:
+            claims = await google_oauth.exchange_code(code, redirect_uri)
+        except (httpx.HTTPError, ValueError, KeyError):
+            logger.warning("Google code exchange failed", exc_info=True)
+            return None
+
+        if not claims:
             return None
 
+        return UserInfo(
+            # OpenID "sub" is the same identifier the v2 userinfo API called "id"
+            id=claims.get("sub") or claims.get("id"),
+            email=claims.get("email"),
+            name=claims.get("name"),
+            picture=claims.get("picture"),
+        )
+
     async def get_or_create_user(
         self, session: AsyncSession, user_info: UserInfo, provider: str = "google"
     ) -> User:
@@ -202,6 +233,7 @@ class AuthService:
             user.name = user_info.name
             user.avatar_url = user_info.picture
             await session.commit()
+            self.principals.invalidate(user.id)
             return user
 
         # Create new user
@@ -238,12 +270,11 @@ class AuthService:
             },
         )
 
-
     async def get_current_user(
         self,
         credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
         session: AsyncSession = Depends(get_session),
-    ) -> User:
+    ) -> UserPrincipal:
         """Get current authenticated user from JWT token."""
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -255,20 +286,47 @@ class AuthService:
         if not token_data:
             raise credentials_exception
 
-        # Get user from database
-        result = await session.execute(select(User).where(User.id == UUID(token_data.sub)))
-        user = result.scalar_one_or_none()
+        try:
+            user_id = UUID(token_data.sub)
+        except ValueError:
+            raise credentials_exception
+
+        principal = self.principals.get(user_id)
+        if principal is not None:
+            return principal
+
+        # Get user from database; the session only checks out a connection on a miss
+        result = await session.execute(
+            select(User.id, User.email, User.name, User.avatar_url).where(User.id == user_id)
+        )
+        row = result.one_or_none()
 
-        if not user:
+        if not row:
             raise credentials_exception
 
+        principal = UserPrincipal(*row)
+        self.principals.set(principal, self.settings.user_cache_ttl_seconds)
+        return principal
+
+    async def get_admin_user(
+        self,
+        credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+        session: AsyncSession = Depends(get_session),
+    ) -> UserPrincipal:
+        """Get current user and require their email to be listed in ADMIN_EMAILS."""
+        user = await self.get_current_user(credentials, session)
+        if user.email.lower() not in self.settings.admin_emails:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin access required",
+            )
         return user
 
     async def get_current_user_optional(
         self,
         credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
         session: AsyncSession = Depends(get_session),
-    ) -> Optional[User]:
+    ) -> Optional[UserPrincipal]:
         """Get current user optionally (for endpoints that work with or without auth)."""
         if not credentials:
             return None
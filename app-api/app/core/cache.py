@@ -1,13 +1,84 @@
 import json
 import hashlib
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Type
 from datetime import datetime, timedelta
 
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.compression import IDENTITY, compress, negotiate
+from app.core.conditional import Validators
+from app.core.metrics import CACHE_REQUESTS
+from app.core.rate_limit import rate_limit_headers_for
+from app.core.settings import get_settings
+
+
+class CacheEntry:
+    """
+    A cached response: the data plus its JSON body, serialized once and compressed at
+    most once per content encoding, so hits skip validation, encoding and compression.
+    """
+
+    def __init__(self, data: Any, expires: datetime, version: Optional[str] = None):
+        self.data = data
+        self.expires = expires
+        self.version = version
+        self._bodies: Dict[str, bytes] = {}
+        self._etag: Optional[str] = None
+
+    def body(
+        self, encoding: str = IDENTITY, response_model: Optional[Type[BaseModel]] = None
+    ) -> bytes:
+        """Serialized body in `encoding`; response_model validates and shapes it like FastAPI."""
+        body = self._bodies.get(encoding)
+        if body is None:
+            if encoding == IDENTITY:
+                if response_model is not None:
+                    body = response_model.model_validate(self.data).model_dump_json().encode()
+                else:
+                    body = orjson.dumps(jsonable_encoder(self.data))
+            else:
+                body = compress(self.body(IDENTITY, response_model), encoding)
+            self._bodies[encoding] = body
+        return body
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Weak ETag from the serialized body; None until the body has been built."""
+        if self._etag is None and IDENTITY in self._bodies:
+            self._etag = f'W/"{hashlib.md5(self._bodies[IDENTITY]).hexdigest()}"'
+        return self._etag
+
+    def response(
+        self, request: Request, response_model: Optional[Type[BaseModel]] = None
+    ) -> Response:
+        """
+        JSON response in the best encoding the client accepts, or a 304 when the client
+        revalidates with this body's ETag (the tag routes advertise when no data version is
+        known, so it must be honoured here).
+        """
+        encoding = negotiate(request.headers.get("accept-encoding"))
+        identity = self.body(IDENTITY, response_model)
+        if len(identity) < get_settings().compression_min_bytes:
+            encoding = IDENTITY
+
+        headers = {"Vary": "Accept-Encoding", "ETag": self.etag, **rate_limit_headers_for(request)}
+        if Validators(etag=self.etag).matches(request):
+            return Response(status_code=304, headers=headers)
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=self.body(encoding, response_model),
+            media_type="application/json",
+            headers=headers,
+        )
+
 
 class Cache:
     def __init__(self):
-        self.memory_cache: Dict[str, Dict] = {}
-        self.default_ttl_seconds = 900  # 15 minutes
+        self.memory_cache: Dict[str, CacheEntry] = {}
 
     def _make_key(self, path: str, params: dict, provider: str) -> str:
         """Generate cache key from path, sorted params, and provider"""
@@ -15,37 +86,69 @@ class Cache:
         key_data = f"{path}:{sorted_params}:{provider}"
         return hashlib.md5(key_data.encode()).hexdigest()
 
-    async def get(self, path: str, params: dict, provider: str) -> Optional[Any]:
-        """Get cached value from memory"""
+    @staticmethod
+    def _namespace(path: str) -> str:
+        """Resource segment of the cached path, e.g. /v1/projections/2024/5 -> projections"""
+        parts = [p for p in path.split("/") if p]
+        if len(parts) > 2 and parts[2] == "bulk":
+            return f"{parts[1]}_bulk"
+        return parts[1] if len(parts) > 1 else path
+
+    async def get_entry(
+        self, path: str, params: dict, provider: str, version: Optional[str] = None
+    ) -> Optional[CacheEntry]:
+        """
+        Get cached entry from memory, with its serialized and compressed bodies.
+
+        `version` is the data version the caller will advertise (its ETag): an entry cached
+        under another version predates a dbt rebuild and is treated as a miss.
+        """
         key = self._make_key(path, params, provider)
+        namespace = self._namespace(path)
 
         if key in self.memory_cache:
             entry = self.memory_cache[key]
-            if datetime.now() < entry["expires"]:
-                return entry["data"]
+            if datetime.now() < entry.expires and entry.version == version:
+                CACHE_REQUESTS.inc(namespace, "hit")
+                return entry
             else:
-                # Expired, remove from cache
+                # Expired or built from an older data version, remove from cache
                 del self.memory_cache[key]
 
+        CACHE_REQUESTS.inc(namespace, "miss")
         return None
 
+    async def get(self, path: str, params: dict, provider: str) -> Optional[Any]:
+        """Get cached value from memory"""
+        entry = await self.get_entry(path, params, provider)
+        return entry.data if entry is not None else None
+
     async def set(
-        self, path: str, params: dict, provider: str, data: Any, ttl_seconds: Optional[int] = None
-    ):
-        """Set value in memory cache"""
+        self,
+        path: str,
+        params: dict,
+        provider: str,
+        data: Any,
+        ttl_seconds: Optional[int] = None,
+        version: Optional[str] = None,
+    ) -> CacheEntry:
+        """Set value in memory cache, tagged with the data version it was built from"""
         key = self._make_key(path, params, provider)
-        ttl = ttl_seconds or self.default_ttl_seconds
+        ttl = ttl_seconds or get_settings().cache_ttl_for(self._namespace(path))
 
-        self.memory_cache[key] = {"data": data, "expires": datetime.now() + timedelta(seconds=ttl)}
+        entry = CacheEntry(data, datetime.now() + timedelta(seconds=ttl), version)
+        self.memory_cache[key] = entry
 
         # Simple memory cache cleanup - remove expired entries when cache gets large
         if len(self.memory_cache) > 1000:
             self._cleanup_expired()
 
+        return entry
+
     def _cleanup_expired(self):
         """Remove expired entries from memory cache"""
         now = datetime.now()
-        expired_keys = [k for k, v in self.memory_cache.items() if now >= v["expires"]]
+        expired_keys = [k for k, v in self.memory_cache.items() if now >= v.expires]
         for k in expired_keys:
             del self.memory_cache[k]
 
@@ -0,0 +1,160 @@
+"""
+Conditional GET support: ETag and Last-Modified derived from data versions.
+
+dbt records each model's build time in ops.model_builds (dwh/macros/build_log.sql). A
+response's ETag digests the build times of the models it reads together with the request
+parameters, so it is known before the response cache or the database is touched: a
+matching If-None-Match is answered with 304 straight away, and every worker computes the
+same tag. When build times are unavailable the ETag falls back to a digest of the body.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.rate_limit import rate_limit_headers_for
+from app.core.settings import get_settings
+from app.db.async_session import engine
+
+logger = logging.getLogger(__name__)
+
+_MODEL_BUILDS_SQL = text("SELECT model, built_at FROM ops.model_builds")
+
+
+class DataVersions:
+    """Per-worker copy of ops.model_builds, reloaded at most every DATA_VERSION_TTL_SECONDS."""
+
+    def __init__(self):
+        self._builds: Dict[str, datetime] = {}
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return time.monotonic() - self._loaded_at < get_settings().data_version_ttl_seconds
+
+    async def _refresh(self):
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            try:
+                async with engine.connect() as conn:
+                    result = await conn.execute(_MODEL_BUILDS_SQL)
+                    self._builds = {row.model: row.built_at for row in result}
+            except SQLAlchemyError as e:
+                # Missing table (dbt not run yet) or database down: fall back to body digests
+                logger.debug("model build times unavailable", extra={"error": str(e)})
+                self._builds = {}
+            self._loaded_at = time.monotonic()
+
+    async def built_at(self, *models: str) -> Optional[datetime]:
+        """Latest build time across `models`, or None if any of them has no recorded build."""
+        await self._refresh()
+        times = [self._builds.get(model) for model in models]
+        if not times or None in times:
+            return None
+        return max(times)
+
+    def invalidate(self):
+        self._loaded_at = float("-inf")
+
+
+# Global instance, shared by all routers in this worker
+data_versions = DataVersions()
+
+
+def _opaque(tag: str) -> str:
+    """Tag without the weak prefix, for If-None-Match's weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def content_etag(body: Any) -> str:
+    """Weak ETag from the serialized body; stable across workers, unlike hash()."""
+    payload = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"))
+    return f'W/"{hashlib.md5(payload.encode()).hexdigest()}"'
+
+
+@dataclass
+class Validators:
+    """ETag and Last-Modified for one response; both None when no data version is known."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+    def matches(self, request: Request) -> bool:
+        """True if the client's cached copy is current (If-None-Match, else If-Modified-Since)."""
+        if self.etag is None:
+            return False
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [_opaque(tag) for tag in if_none_match.split(",")]
+            return "*" in tags or _opaque(self.etag) in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=UTC)
+            # HTTP dates have one-second resolution
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def _headers(self, etag: Optional[str], cache_control: str) -> Dict[str, str]:
+        headers = {"Cache-Control": cache_control}
+        if etag is not None:
+            headers["ETag"] = etag
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(UTC), usegmt=True
+            )
+        return headers
+
+    def not_modified(self, request: Request, cache_control: str) -> Response:
+        headers = self._headers(self.etag, cache_control)
+        # Bodies are negotiated by Accept-Encoding, so 304s vary on it like the 200s do
+        headers["Vary"] = "Accept-Encoding"
+        headers.update(rate_limit_headers_for(request))
+        return Response(status_code=304, headers=headers)
+
+    def apply(self, response: Response, cache_control: str, body: Any = None):
+        """Set validator and Cache-Control headers, digesting `body` if there is no version."""
+        etag = self.etag
+        if etag is None and body is not None:
+            etag = content_etag(body)
+        response.headers.update(self._headers(etag, cache_control))
+
+
+async def validators_for(models: Sequence[str], *key_parts: Any) -> Validators:
+    """
+    Validators for a response built from dbt `models` and identified by `key_parts`.
+
+    key_parts must include everything that changes the body for a given data version:
+    path, query parameters and provider. The API version is added so a deploy that
+    changes response shapes invalidates client copies.
+    """
+    built_at = await data_versions.built_at(*models)
+    if built_at is None:
+        return Validators()
+    key = json.dumps(
+        [get_settings().env_version, built_at.isoformat(), *key_parts],
+        sort_keys=True,
+        default=str,
+    )
+    return Validators(etag=f'W/"{hashlib.md5(key.encode()).hexdigest()}"', last_modified=built_at)
@@ -0,0 +1,262 @@
+"""
+Streaming encoders for the /v1/export endpoints.
+
+Rows arrive from ExportRepository in batches; each batch is encoded into one chunk of the
+response body in the threadpool, so a full-season export never holds more than one batch
+in memory and never blocks the event loop on CSV formatting or Parquet compression.
+pyarrow is imported only when an Arrow or Parquet export is requested.
+"""
+
+import csv
+import io
+import logging
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Tuple
+
+import anyio
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["csv", "ndjson", "arrow", "parquet"]
+
+# (name, type) per output column; type is one of "int", "float", "text", "json".
+# json columns hold JSON text: embedded as-is in NDJSON, as strings elsewhere.
+Columns = Sequence[Tuple[str, str]]
+
+MEDIA_TYPES: Dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXTENSIONS: Dict[str, str] = {
+    "csv": "csv",
+    "ndjson": "ndjson",
+    "arrow": "arrows",
+    "parquet": "parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain.
+
+    tell() keeps counting across drains, which the Parquet writer relies on for the
+    row group offsets in its footer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class CsvEncoder:
+    def __init__(self, columns: Columns):
+        self.names = [name for name, _ in columns]
+
+    def header(self) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(self.names)
+        return buffer.getvalue().encode()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class NdjsonEncoder:
+    def __init__(self, columns: Columns):
+        self.names = [name for name, _ in columns]
+        self.json_columns = [i for i, (_, kind) in enumerate(columns) if kind == "json"]
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        lines = []
+        for row in rows:
+            values = list(row)
+            for i in self.json_columns:
+                if values[i] is not None:
+                    values[i] = orjson.Fragment(values[i])
+            lines.append(orjson.dumps(dict(zip(self.names, values, strict=True))))
+        lines.append(b"")
+        return b"\n".join(lines)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ArrowEncoderBase:
+    def __init__(self, columns: Columns):
+        import pyarrow as pa
+
+        types = {"int": pa.int64(), "float": pa.float64(), "text": pa.string(), "json": pa.string()}
+        self.pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.sink = _ChunkSink()
+
+    def _batch(self, rows: Sequence[Sequence[Any]]):
+        arrays = [
+            self.pa.array([row[i] for row in rows], type=field.type)
+            for i, field in enumerate(self.schema)
+        ]
+        return self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+class ArrowEncoder(_ArrowEncoderBase):
+    """Arrow IPC streaming format: schema message, one record batch per chunk, EOS."""
+
+    def header(self) -> bytes:
+        self.writer = self.pa.ipc.new_stream(self.sink, self.schema)
+        return self.sink.drain()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self.writer.write_batch(self._batch(rows))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+class ParquetEncoder(_ArrowEncoderBase):
+    """Parquet with one row group per chunk; the footer goes out with the last chunk."""
+
+    def header(self) -> bytes:
+        import pyarrow.parquet as pq
+
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="zstd")
+        return self.sink.drain()
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self.writer.write_batch(self._batch(rows))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+class ExportResponse(StreamingResponse):
+    """StreamingResponse that stops between chunks when the client goes away.
+
+    Starlette cancels the body iterator mid-await on disconnect, which leaves asyncpg to
+    abort a connection in the middle of a cursor fetch (and, under uvloop, can leave it
+    idle in transaction). Here the disconnect only sets a flag: the current batch
+    finishes, the iterator is closed normally, and the transaction rolls back cleanly.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        disconnected = anyio.Event()
+
+        async def watch_disconnect() -> None:
+            await self.listen_for_disconnect(receive)
+            disconnected.set()
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(watch_disconnect)
+            try:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": self.status_code,
+                        "headers": self.raw_headers,
+                    }
+                )
+                async for chunk in self.body_iterator:
+                    if disconnected.is_set():
+                        break
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                else:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+            except OSError as e:
+                raise ClientDisconnect() from e
+            finally:
+                await self.body_iterator.aclose()
+                task_group.cancel_scope.cancel()
+
+
+ENCODERS = {
+    "csv": CsvEncoder,
+    "ndjson": NdjsonEncoder,
+    "arrow": ArrowEncoder,
+    "parquet": ParquetEncoder,
+}
+
+
+async def _encode(
+    encoder: Any, first: Optional[List[Any]], batches: AsyncIterator[List[Any]], name: str
+) -> AsyncIterator[bytes]:
+    try:
+        yield await run_in_threadpool(encoder.header)
+        if first:
+            yield await run_in_threadpool(encoder.encode, first)
+            async for rows in batches:
+                yield await run_in_threadpool(encoder.encode, rows)
+        yield await run_in_threadpool(encoder.finish)
+    except Exception:
+        # Headers are already sent, so the client only sees a truncated body
+        logger.exception("export stream failed", extra={"export": name})
+        raise
+    finally:
+        await batches.aclose()
+
+
+async def export_response(
+    batches: AsyncIterator[List[Any]],
+    columns: Columns,
+    fmt: ExportFormat,
+    filename: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> ExportResponse:
+    """
+    Stream `batches` encoded as `fmt`.
+
+    The first batch is read before the response starts, so a failing query still gets a
+    proper error status rather than a truncated 200.
+    """
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        await batches.aclose()
+        raise HTTPException(status_code=500, detail=f"Error exporting {filename}: {str(e)}") from e
+
+    encoder = ENCODERS[fmt](columns)
+    response_headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{EXTENSIONS[fmt]}"',
+        **(headers or {}),
+    }
+    return ExportResponse(
+        _encode(encoder, first, batches, filename),
+        media_type=MEDIA_TYPES[fmt],
+        headers=response_headers,
+    )
@@ -1,13 +1,30 @@
+import atexit
 import logging
 import logging.config
+import queue
 import sys
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Standard format line followed by `key=value` pairs for fields passed via `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [f"{k}={v}" for k, v in record.__dict__.items() if k not in _RECORD_ATTRS]
+        return f"{line} {' '.join(fields)}" if fields else line
+
 
 LOGGING_CONFIG: Dict[str, Any] = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
         "default": {
+            "()": StructuredFormatter,
             "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         },
         "access": {
@@ -55,6 +72,38 @@ LOGGING_CONFIG: Dict[str, Any] = {
 }
 
 
+_listeners: List[QueueListener] = []
+
+
 def configure_logging() -> None:
-    """Configure logging for the application."""
+    """
+    Configure logging for the application.
+
+    Each stream handler is moved behind a QueueHandler drained by a listener thread, so
+    logging from the event loop only enqueues the record and never blocks on stdout.
+    """
+    stop_logging()
     logging.config.dictConfig(LOGGING_CONFIG)
+
+    loggers = [logging.getLogger()]
+    loggers += [logging.getLogger(name) for name in LOGGING_CONFIG["loggers"]]
+    queued: Dict[int, QueueHandler] = {}
+    for configured in loggers:
+        for index, handler in enumerate(configured.handlers):
+            if id(handler) not in queued:
+                log_queue: queue.SimpleQueue = queue.SimpleQueue()
+                queued[id(handler)] = QueueHandler(log_queue)
+                listener = QueueListener(log_queue, handler, respect_handler_level=True)
+                listener.start()
+                _listeners.append(listener)
+            configured.handlers[index] = queued[id(handler)]
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+# Drain anything still queued when the worker exits
+atexit.register(stop_logging)
@@ -0,0 +1,234 @@
+"""
+In-process metrics for API hot paths, rendered in the Prometheus text format at /metrics.
+
+Metrics are per worker process; scrape each worker (or aggregate) when running several.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Request latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0
+)
+
+# Rows returned by a repository call
+ROW_BUCKETS: Tuple[float, ...] = (0, 1, 10, 50, 100, 250, 500, 1000, 5000, 10000)
+
+# Response body sizes in bytes
+BYTE_BUCKETS: Tuple[float, ...] = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216
+)
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        return dict(self._values)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values, Prometheus-style."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Store: {label values: ([count per bucket, +Inf last], sum)}
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation. Runs on the event loop, so no locking is needed."""
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0])
+            self._series[labelvalues] = series
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, object]]:
+        """Cumulative bucket counts, count and sum per label set."""
+        result: Dict[Tuple[str, ...], Dict[str, object]] = {}
+        for labelvalues, (counts, total) in self._series.items():
+            cumulative = []
+            running = 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            result[labelvalues] = {
+                "buckets": list(zip(self.buckets + (float("inf"),), cumulative, strict=True)),
+                "count": running,
+                "sum": total[0],
+            }
+        return result
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the end of the response body, per route template.",
+    ("method", "route", "status"),
+)
+
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Response body size per route template.",
+    ("method", "route"),
+    buckets=BYTE_BUCKETS,
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Time spent in a repository method, including connection acquire.",
+    ("repository", "method"),
+)
+
+DB_ROWS = Histogram(
+    "db_rows_returned",
+    "Rows (items) returned by a repository method.",
+    ("repository", "method"),
+    buckets=ROW_BUCKETS,
+)
+
+DB_ACQUIRE_LATENCY = Histogram(
+    "db_connection_acquire_seconds",
+    "Time to obtain a database connection.",
+    ("pool",),
+)
+
+DB_PREPARED_STATEMENTS = Counter(
+    "db_prepared_statements_total",
+    "Registry statement executions: hit when the pooled connection had already prepared "
+    "the statement, miss when it was prepared for this call, uncached when caching is off.",
+    ("statement", "result"),
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Response cache lookups by namespace and result (hit or miss).",
+    ("namespace", "result"),
+)
+
+LOOP_BLOCKED = Histogram(
+    "event_loop_blocked_seconds",
+    "How long a single callback held the event loop, for stalls over the threshold.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+REGISTRY: Tuple[Any, ...] = (
+    REQUEST_LATENCY,
+    RESPONSE_BYTES,
+    DB_QUERY_LATENCY,
+    DB_ROWS,
+    DB_ACQUIRE_LATENCY,
+    DB_PREPARED_STATEMENTS,
+    CACHE_REQUESTS,
+    LOOP_BLOCKED,
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, *labelvalues: str) -> Iterator[None]:
+    """Observe the duration of the block, including when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, *labelvalues)
+
+
+def _row_count(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        items = result.get("items")
+        return len(items) if isinstance(items, list) else 1
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def track_query(repository: str) -> Callable:
+    """Decorator for async repository methods: duration and rows returned per method."""
+
+    def decorator(func: Callable) -> Callable:
+        method = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(DB_QUERY_LATENCY, repository, method):
+                result = await func(*args, **kwargs)
+            DB_ROWS.observe(_row_count(result), repository, method)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if metric.type == "counter":
+            for labelvalues, value in sorted(metric.snapshot().items()):
+                labels = _labels(metric.labelnames, labelvalues)
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+            continue
+        for labelvalues, series in sorted(metric.snapshot().items()):
+            for bound, count in series["buckets"]:
+                labels = _labels(metric.labelnames, labelvalues, f'le="{_format_value(bound)}"')
+                lines.append(f"{metric.name}_bucket{labels} {count}")
+            labels = _labels(metric.labelnames, labelvalues)
+            lines.append(f"{metric.name}_sum{labels} {repr(float(series['sum']))}")
+            lines.append(f"{metric.name}_count{labels} {series['count']}")
+    return "\n".join(lines) + "\n"
@@ -2,31 +2,72 @@ import time
 import uuid
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
+from app.core.metrics import REQUEST_LATENCY, RESPONSE_BYTES
+
 logger = logging.getLogger(__name__)
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
+class RequestIdMiddleware:
+    """
+    Tag each HTTP request with an id, time it, and log one structured access record.
+
+    Pure ASGI: it wraps `send` to add X-Request-ID/X-Process-Time when the response starts,
+    instead of running the endpoint in a separate task and copying the body stream like
+    BaseHTTPMiddleware does.
+    """
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())[:8]
+        # Read by Request.state in handlers and exception handlers
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = str(round(process_time, 4))
+        start_time = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
 
-        logger.info(
-            f"Request {request_id}: {request.method} {request.url.path} "
-            f"- {response.status_code} - {process_time:.4f}s"
-        )
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = str(round(time.perf_counter() - start_time, 4))
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = time.perf_counter() - start_time
+            # Route template keeps label cardinality bounded; set once routing has matched
+            route = scope.get("route")
+            route_path = getattr(route, "path", "<unmatched>")
+            REQUEST_LATENCY.observe(process_time, scope["method"], route_path, str(status_code))
+            RESPONSE_BYTES.observe(response_bytes, scope["method"], route_path)
+            logger.info(
+                "request completed",
+                extra={
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route_path,
+                    "status": status_code,
+                    "duration_ms": round(process_time * 1000, 2),
+                    "bytes": response_bytes,
+                },
+            )
 
 
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -34,6 +75,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": {"type": "http_exception", "message": exc.detail, "req_id": request_id}},
+        headers=getattr(exc, "headers", None),
     )
 
 
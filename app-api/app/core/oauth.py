@@ -0,0 +1,215 @@
+"""
+Outbound calls to the Google OAuth/OpenID provider over one pooled HTTP client.
+
+The client is opened in the app lifespan and shared by every login, so a burst of
+sign-ins reuses keep-alive connections (HTTP/2 when h2 is installed) instead of paying
+a TLS handshake per request. The discovery document and signing keys (JWKS) are cached
+per worker, which lets the ID token from the code exchange be verified locally: a login
+costs one outbound request, and the userinfo endpoint is only called as a fallback.
+
+httpx and jose are imported on first use, so importing the app for tests or tooling does
+not load them; the server loads them in the lifespan (init_oauth_client, warmup).
+"""
+
+import asyncio
+import importlib.util
+import logging
+import re
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from app.core.settings import get_settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# An unknown key id triggers a JWKS refetch (keys rotate), but at most this often
+JWKS_MIN_REFRESH_SECONDS = 60.0
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def _build_client(transport: Optional["httpx.AsyncBaseTransport"] = None) -> "httpx.AsyncClient":
+    import httpx
+
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=HTTP2,
+        transport=transport,
+        timeout=httpx.Timeout(settings.oauth_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.oauth_max_connections,
+            max_keepalive_connections=settings.oauth_max_connections,
+        ),
+    )
+
+
+async def init_oauth_client(transport: Optional["httpx.AsyncBaseTransport"] = None) -> None:
+    """Open the shared client; `transport` lets tests route it to a mock provider."""
+    global _client
+    await close_oauth_client()
+    _client = _build_client(transport)
+
+
+async def close_oauth_client() -> None:
+    """Close the shared client and forget cached provider metadata."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    google_oauth.reset()
+
+
+def get_oauth_client() -> "httpx.AsyncClient":
+    """The shared client, opened on first use outside the app lifespan (scripts, tests)."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def _expires_at(response: "httpx.Response") -> float:
+    """Expiry from Cache-Control max-age, else OAUTH_METADATA_TTL_SECONDS."""
+    match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+    ttl = int(match.group(1)) if match else get_settings().oauth_metadata_ttl_seconds
+    return time.monotonic() + ttl
+
+
+class GoogleOAuth:
+    """Code exchange and ID token verification with cached discovery and JWKS."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._discovery: Optional[Dict[str, Any]] = None
+        self._discovery_expires = 0.0
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_expires = 0.0
+        self._keys_fetched = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Created lazily so it belongs to the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _fetch_json(self, url: str) -> Tuple[Dict[str, Any], float]:
+        response = await get_oauth_client().get(url)
+        response.raise_for_status()
+        return response.json(), _expires_at(response)
+
+    async def discovery(self) -> Dict[str, Any]:
+        """The provider's OpenID configuration (endpoints, issuer, jwks_uri)."""
+        if self._discovery is not None and time.monotonic() < self._discovery_expires:
+            return self._discovery
+        # One fetch per worker however many logins arrive at once
+        async with self._get_lock():
+            return await self._load_discovery()
+
+    async def _load_discovery(self) -> Dict[str, Any]:
+        """Fetch the discovery document if it has expired; caller holds the lock."""
+        if self._discovery is None or time.monotonic() >= self._discovery_expires:
+            url = get_settings().google_discovery_url
+            self._discovery, self._discovery_expires = await self._fetch_json(url)
+        return self._discovery
+
+    async def signing_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The JWK for `kid`, refetching the key set when it has expired or rotated."""
+        now = time.monotonic()
+        key = self._keys.get(kid) if now < self._keys_expires else None
+        if key is not None:
+            return key
+        async with self._get_lock():
+            now = time.monotonic()
+            stale = now >= self._keys_expires
+            rotated = kid not in self._keys and now - self._keys_fetched >= JWKS_MIN_REFRESH_SECONDS
+            if stale or rotated:
+                jwks_uri = (await self._load_discovery())["jwks_uri"]
+                jwks, self._keys_expires = await self._fetch_json(jwks_uri)
+                self._keys = {k.get("kid"): k for k in jwks.get("keys", [])}
+                self._keys_fetched = now
+        return self._keys.get(kid)
+
+    async def verify_id_token(
+        self, id_token: str, access_token: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Claims of a valid ID token issued to GOOGLE_CLIENT_ID, or None."""
+        from jose import JWTError, jwt
+
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except JWTError:
+            return None
+
+        key = await self.signing_key(header.get("kid"))
+        if key is None:
+            return None
+
+        issuer = (await self.discovery())["issuer"]
+        try:
+            return jwt.decode(
+                id_token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=get_settings().google_client_id,
+                # Google issues both forms
+                issuer=[issuer, issuer.removeprefix("https://")],
+                access_token=access_token,
+            )
+        except JWTError as e:
+            logger.warning("Rejected ID token from code exchange: %s", e)
+            return None
+
+    async def exchange_code(self, code: str, redirect_uri: str) -> Optional[Dict[str, Any]]:
+        """
+        Exchange an authorization code for the user's claims (sub, email, name, picture).
+
+        Returns None when the provider rejects the code.
+        """
+        settings = get_settings()
+        client = get_oauth_client()
+        metadata = await self.discovery()
+
+        token_response = await client.post(
+            metadata["token_endpoint"],
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
+            },
+        )
+        if token_response.status_code != 200:
+            return None
+
+        tokens = token_response.json()
+        access_token = tokens.get("access_token")
+        if tokens.get("id_token"):
+            claims = await self.verify_id_token(tokens["id_token"], access_token)
+            # name/picture are only present when the profile scope was granted
+            if claims and claims.get("email") and claims.get("name"):
+                return claims
+
+        if not access_token:
+            return None
+
+        # Bearer header rather than a query parameter keeps the token out of access logs
+        user_response = await client.get(
+            metadata["userinfo_endpoint"],
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        if user_response.status_code != 200:
+            return None
+        return user_response.json()
+
+
+google_oauth = GoogleOAuth()
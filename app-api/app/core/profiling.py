@@ -0,0 +1,199 @@
+"""
+Event loop diagnostics for a running worker.
+
+SamplingProfiler samples the event loop thread's stack from a helper thread and renders
+the counts as collapsed stacks ("frame;frame;frame count"), the input format of
+flamegraph.pl and speedscope. LoopBlockDetector logs any loop step that blocks longer
+than LOOP_BLOCK_THRESHOLD_MS, with the stack that was running while the loop was stuck.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as Tally
+from types import FrameType
+from typing import List, Optional
+
+from app.core.metrics import LOOP_BLOCKED
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SITE_MARKERS = ("site-packages" + os.sep, "dist-packages" + os.sep)
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_STDLIB_ROOT = os.path.dirname(os.__file__)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Short file path plus qualified function name, e.g. app/api/routes.py:meta."""
+    code = frame.f_code
+    filename = code.co_filename
+    for marker in _SITE_MARKERS:
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        for root in (_APP_ROOT, _STDLIB_ROOT):
+            if filename.startswith(root + os.sep):
+                filename = os.path.relpath(filename, root)
+                break
+    name = getattr(code, "co_qualname", code.co_name)
+    # ';' separates frames and the trailing space-separated token is the count
+    return f"{filename}:{name}".replace(";", ":").replace(" ", "_")
+
+
+def capture_stack(thread_id: int) -> Optional[str]:
+    """Current stack of a thread as one collapsed line, outermost frame first."""
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return None
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack every `interval` seconds from a background thread.
+
+    The sampler needs the GIL, so samples land where the loop thread releases it (I/O
+    waits, or every sys.getswitchinterval() of pure Python). Callbacks much shorter than
+    the switch interval are under-represented; anything worth finding on a slow request is not.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Tally = Tally()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            stack = capture_stack(self.thread_id)
+            if stack:
+                self.samples[stack] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Stacks in flamegraph collapsed format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+_profile_lock = asyncio.Lock()
+
+
+def profile_in_progress() -> bool:
+    return _profile_lock.locked()
+
+
+async def profile_event_loop(seconds: float, interval: float = 0.005) -> str:
+    """
+    Profile the event loop thread for `seconds` and return collapsed stacks.
+
+    Must be awaited on the loop being profiled; the caller itself shows up idling in
+    asyncio.sleep, alongside whatever else the loop runs meanwhile.
+    """
+    async with _profile_lock:
+        profiler = SamplingProfiler(threading.get_ident(), interval)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+        return profiler.collapsed()
+
+
+class LoopBlockDetector:
+    """
+    Watchdog for callbacks that hold the event loop.
+
+    A heartbeat task wakes every `interval`; a helper thread notices when it is overdue and
+    captures the loop thread's stack while it is still blocked. When the heartbeat finally
+    runs it logs how long the loop was held, along with that stack.
+    """
+
+    def __init__(self, threshold: float, interval: Optional[float] = None):
+        self.threshold = threshold
+        self.interval = interval or max(threshold / 2, 0.01)
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._stall_stack: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start on the running loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-block-detector", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = now - expected
+            stack, self._stall_stack = self._stall_stack, None
+            if lag >= self.threshold:
+                LOOP_BLOCKED.observe(lag)
+                logger.warning(
+                    "event loop blocked",
+                    extra={"blocked_ms": round(lag * 1000, 1), "stack": stack or "<not captured>"},
+                )
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue >= self.threshold and self._stall_stack is None:
+                self._stall_stack = capture_stack(self._loop_thread_id)
+
+
+# Global detector, started in the application lifespan when enabled
+loop_block_detector: Optional[LoopBlockDetector] = None
+
+
+def start_loop_block_detector() -> Optional[LoopBlockDetector]:
+    """Start the detector if LOOP_BLOCK_THRESHOLD_MS is positive."""
+    global loop_block_detector
+    threshold_ms = get_settings().loop_block_threshold_ms
+    if threshold_ms <= 0:
+        return None
+    loop_block_detector = LoopBlockDetector(threshold_ms / 1000)
+    loop_block_detector.start()
+    return loop_block_detector
+
+
+async def stop_loop_block_detector():
+    global loop_block_detector
+    if loop_block_detector is not None:
+        await loop_block_detector.stop()
+        loop_block_detector = None
@@ -2,6 +2,7 @@ from typing import Protocol, Literal, Dict
 from app.repositories.projections_repo import ProjectionsRepository
 
 Scoring = Literal["ppr", "half", "std"]
+PerWeekFormat = Literal["objects", "columns", "none"]
 
 
 class ProjectionProvider(Protocol):
@@ -32,6 +33,7 @@ class ProjectionProvider(Protocol):
         sort_desc: bool = True,
         limit: int = 50,
         offset: int = 0,
+        per_week: PerWeekFormat = "objects",
     ) -> Dict: ...
 
 
@@ -85,6 +87,7 @@ class BaselineProvider:
         sort_desc: bool = True,
         limit: int = 50,
         offset: int = 0,
+        per_week: PerWeekFormat = "objects",
     ) -> Dict:
         # Convert sort_by and sort_desc to single sort parameter
         sort = sort_by if sort_by else "proj_total"
@@ -103,6 +106,7 @@ class BaselineProvider:
             sort=sort,
             limit=limit,
             offset=offset,
+            per_week=per_week,
         )
 
 
@@ -135,6 +139,7 @@ class MLProvider:
         sort_desc: bool = True,
         limit: int = 50,
         offset: int = 0,
+        per_week: PerWeekFormat = "objects",
     ) -> Dict:
         raise NotImplementedError("ML projections not yet implemented")
 
@@ -1,86 +1,243 @@
+import heapq
+import logging
+import math
 import time
-from typing import Dict, Tuple
-from fastapi import Request, HTTPException
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
+import asyncpg
+from fastapi import HTTPException, Request, Response
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Allow `times` requests per `seconds`, with bursts of up to `times` requests."""
+
+    times: int
+    seconds: int
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds one request adds to the client's theoretical arrival time."""
+        return self.seconds / self.times
+
+    @property
+    def header(self) -> str:
+        return f"{self.times};w={self.seconds}"
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the full quota is available again
+    retry_after: float  # seconds until the next request is allowed (0 when allowed)
+
+
+def gcra_decide(
+    tat: Optional[float], now: float, policy: RateLimitPolicy
+) -> Tuple[RateLimitDecision, float]:
+    """
+    Apply GCRA (generic cell rate algorithm) for one request.
+
+    State is a single theoretical arrival time (TAT) per key; a request is allowed when
+    pushing the TAT forward by one emission interval keeps it within `seconds` of now.
+
+    Returns the decision and the TAT to store (unchanged when the request is rejected).
+    """
+    interval = policy.emission_interval
+    new_tat = (now if tat is None else max(tat, now)) + interval
+    if new_tat - now > policy.seconds:
+        retry_after = new_tat - policy.seconds - now
+        return (
+            RateLimitDecision(False, policy.times, 0, new_tat - interval - now, retry_after),
+            tat if tat is not None else now,
+        )
+    return RateLimitDecision(
+        True, policy.times, _remaining(new_tat - now, policy), new_tat - now, 0.0
+    ), new_tat
+
+
+def _remaining(ahead: float, policy: RateLimitPolicy) -> int:
+    """Requests still allowed right now when the TAT is `ahead` seconds in the future."""
+    # Epsilon absorbs float error from non-integral intervals and epoch-second timestamps
+    return max(0, math.floor((policy.seconds - ahead) / policy.emission_interval + 1e-3))
+
+
+class MemoryRateLimitBackend:
+    """Per-process GCRA state with heap-based expiry of idle keys."""
 
-class SimpleRateLimiter:
     def __init__(self):
-        # Store: {client_ip: (request_count, window_start_time)}
-        self.clients: Dict[str, Tuple[int, float]] = {}
-        self.window_size = 60  # 60 seconds
-        self.max_requests = 600  # 10 requests per second
-
-    def _get_client_ip(self, request: Request) -> str:
-        """Get client IP address"""
-        # Check for forwarded headers first (when behind proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-
-        # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
-
-    def is_allowed(self, request: Request) -> bool:
-        """Check if request is allowed based on rate limit"""
-        client_ip = self._get_client_ip(request)
-        current_time = time.time()
-
-        # Clean up old entries periodically
-        if len(self.clients) > 10000:  # Arbitrary cleanup threshold
-            self._cleanup_old_entries(current_time)
-
-        # Get or initialize client data
-        if client_ip not in self.clients:
-            self.clients[client_ip] = (1, current_time)
-            return True
-
-        request_count, window_start = self.clients[client_ip]
-
-        # Check if we're still in the same time window
-        if current_time - window_start < self.window_size:
-            if request_count >= self.max_requests:
-                return False
-            # Increment request count
-            self.clients[client_ip] = (request_count + 1, window_start)
-        else:
-            # New time window, reset counter
-            self.clients[client_ip] = (1, current_time)
+        # Store: {(route, client): theoretical arrival time}
+        self.buckets: Dict[Tuple[str, str], float] = {}
+        # Min-heap of (tat, key); entries superseded by a later TAT are skipped on pop
+        self._expiry: List[Tuple[float, Tuple[str, str]]] = []
 
-        return True
+    async def hit(
+        self, key: Tuple[str, str], policy: RateLimitPolicy, now: Optional[float] = None
+    ) -> RateLimitDecision:
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+
+        decision, tat = gcra_decide(self.buckets.get(key), now, policy)
+        if decision.allowed:
+            self.buckets[key] = tat
+            heapq.heappush(self._expiry, (tat, key))
+            # Keep stale heap entries bounded when the same keys are hit repeatedly
+            if len(self._expiry) > 2 * len(self.buckets) + 1024:
+                self._expiry = [(t, k) for k, t in self.buckets.items()]
+                heapq.heapify(self._expiry)
+        return decision
+
+    def _expire(self, now: float):
+        """Drop keys whose TAT has passed; their bucket is full again, same as a missing key."""
+        while self._expiry and self._expiry[0][0] <= now:
+            tat, key = heapq.heappop(self._expiry)
+            if self.buckets.get(key) == tat:
+                del self.buckets[key]
+
+    async def close(self):
+        self.buckets.clear()
+        self._expiry.clear()
+
+
+class PostgresRateLimitBackend:
+    """
+    GCRA state shared by every worker through ops.rate_limit_state.
 
-    def _cleanup_old_entries(self, current_time: float):
-        """Remove entries older than the window size"""
-        expired_keys = [
-            ip
-            for ip, (_, window_start) in self.clients.items()
-            if current_time - window_start > self.window_size
-        ]
-        for key in expired_keys:
-            del self.clients[key]
+    Each request is one upsert that only advances the TAT when the request is allowed,
+    using the database clock so workers agree on "now".
+    """
 
+    HIT_SQL = """
+        WITH now_ts AS (SELECT EXTRACT(EPOCH FROM clock_timestamp())::float8 AS now),
+        upsert AS (
+            INSERT INTO ops.rate_limit_state AS s (bucket, tat)
+            SELECT $1, now + $2 FROM now_ts
+            ON CONFLICT (bucket) DO UPDATE
+                SET tat = GREATEST(s.tat + $2, EXCLUDED.tat)
+                WHERE GREATEST(s.tat + $2, EXCLUDED.tat) <= EXCLUDED.tat - $2 + $3
+            RETURNING s.tat
+        )
+        SELECT
+            (SELECT tat FROM upsert) AS new_tat,
+            (SELECT tat FROM ops.rate_limit_state WHERE bucket = $1) AS stored_tat,
+            (SELECT now FROM now_ts) AS now
+    """
 
-# Global rate limiter instance
-rate_limiter = SimpleRateLimiter()
+    PURGE_SQL = """
+        DELETE FROM ops.rate_limit_state WHERE tat < EXTRACT(EPOCH FROM clock_timestamp())
+    """
+
+    def __init__(self, pool: asyncpg.Pool, purge_every: int = 1000):
+        self.pool = pool
+        self.purge_every = purge_every
+        self._hits = 0
+
+    async def hit(self, key: Tuple[str, str], policy: RateLimitPolicy) -> RateLimitDecision:
+        bucket = f"{key[0]}|{key[1]}"
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                self.HIT_SQL, bucket, policy.emission_interval, float(policy.seconds)
+            )
+            self._hits += 1
+            if self._hits % self.purge_every == 0:
+                await conn.execute(self.PURGE_SQL)
+
+        now = row["now"]
+        if row["new_tat"] is not None:
+            ahead = row["new_tat"] - now
+            return RateLimitDecision(True, policy.times, _remaining(ahead, policy), ahead, 0.0)
+        # Rejected: the upsert left the stored TAT untouched
+        decision, _ = gcra_decide(row["stored_tat"], now, policy)
+        return decision
+
+    async def close(self):
+        await self.pool.close()
+
+
+# Global rate limiter backend, replaced in init_limiter() when a shared backend is configured
+rate_limiter = MemoryRateLimitBackend()
 
 
 async def init_limiter():
-    """Initialize rate limiter (no-op for memory-based limiter)"""
-    pass
+    """Initialize the rate limiter backend selected by RATE_LIMIT_BACKEND."""
+    global rate_limiter
+    settings = get_settings()
+    if settings.rate_limit_backend == "postgres":
+        pool = await asyncpg.create_pool(
+            settings.database_url.replace("postgresql+psycopg://", "postgresql://"),
+            min_size=1,
+            max_size=settings.rate_limit_pool_size,
+        )
+        rate_limiter = PostgresRateLimitBackend(pool)
+        logger.info("Rate limiter using shared postgres backend")
+    else:
+        rate_limiter = MemoryRateLimitBackend()
 
 
 async def close_limiter():
-    """Close rate limiter (no-op for memory-based limiter)"""
-    pass
+    """Close the rate limiter backend."""
+    await rate_limiter.close()
+
+
+def _get_client_ip(request: Request) -> str:
+    """Get client IP address"""
+    # Check for forwarded headers first (when behind proxy)
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+
+    # Fallback to direct client IP
+    return request.client.host if request.client else "unknown"
+
+
+def _route_key(request: Request) -> str:
+    """Route template (not the concrete path) so /players/{id} shares one bucket per client."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    return f"{request.method} {path}"
+
+
+def rate_limit_headers(decision: RateLimitDecision, policy: RateLimitPolicy) -> Dict[str, str]:
+    """RateLimit-* response headers (IETF httpapi ratelimit-headers draft)."""
+    headers = {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(math.ceil(decision.reset_after)),
+        "RateLimit-Policy": policy.header,
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(math.ceil(decision.retry_after))
+    return headers
+
+
+def rate_limit_headers_for(request: Request) -> Dict[str, str]:
+    """
+    RateLimit-* headers the route's RateLimiter recorded for this request, if any.
+
+    FastAPI only copies dependency headers onto endpoints that return plain data, so code
+    that builds its own Response (cache entries, 304s, exports) adds these itself.
+    """
+    return getattr(request.state, "rate_limit_headers", {})
 
 
 def RateLimiter(times: int = 60, seconds: int = 60):
     """
     Rate limiter dependency for FastAPI routes
 
+    Each route keeps its own policy and buckets are keyed by (route, client), so limits on
+    different routes never interfere.
+
     Args:
         times: Number of allowed requests
         seconds: Time window in seconds
@@ -88,21 +245,24 @@ def RateLimiter(times: int = 60, seconds: int = 60):
     Returns:
         Dependency function for FastAPI routes
     """
+    policy = RateLimitPolicy(times=times, seconds=seconds)
 
-    def dependency(request: Request):
-        # Update rate limiter settings for this request
-        rate_limiter.max_requests = times
-        rate_limiter.window_size = seconds
+    async def dependency(request: Request, response: Response):
+        decision = await rate_limiter.hit((_route_key(request), _get_client_ip(request)), policy)
+        headers = rate_limit_headers(decision, policy)
 
-        if not rate_limiter.is_allowed(request):
+        if not decision.allowed:
             raise HTTPException(
                 status_code=429,
                 detail={
                     "error": "Rate limit exceeded",
                     "message": f"Too many requests. Limit: {times} per {seconds} seconds",
-                    "retry_after": seconds,
+                    "retry_after": math.ceil(decision.retry_after),
                 },
+                headers=headers,
             )
+        request.state.rate_limit_headers = headers
+        response.headers.update(headers)
         return True
 
     return dependency
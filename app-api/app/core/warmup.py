@@ -0,0 +1,172 @@
+"""
+Startup warmup, run from the app lifespan.
+
+warm_up() runs before the worker accepts traffic: it loads the imports that app modules
+defer, fills the database pool and primes the model build versions. warm_caches() then
+runs in the background and fills the response cache with the slices every client asks
+for first (current week projections and ROS, default sort, first page, all three
+scorings), and /ready only passes once it has finished, so a load balancer keeps
+traffic on warm replicas while /health already reports the process alive.
+
+Every step is best effort: a failure or timeout is logged and startup continues, because
+a worker that cannot reach Postgres yet should still come up and recover on its own.
+"""
+
+import asyncio
+import gc
+import importlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.conditional import data_versions
+from app.core.settings import get_settings
+from app.db.async_session import engine, get_raw_pool
+
+logger = logging.getLogger(__name__)
+
+# Deferred so that importing the app (tests, tooling) stays cheap; see app.core.auth
+DEFERRED_IMPORTS = ("jose.jwt",)
+
+WARM_SCORINGS = ("ppr", "half_ppr", "standard")
+
+_CURRENT_WEEK_SQL = text(
+    """
+    SELECT season, week FROM dwh_marts.f_calendar_weeks
+    WHERE week_status = 'current'
+    ORDER BY season DESC, week
+    LIMIT 1
+    """
+)
+
+
+class Readiness:
+    """Whether this worker has finished warming up, as reported by /ready."""
+
+    def __init__(self):
+        self.ready = False
+        self.warmed: List[str] = []
+
+    def mark_ready(self, warmed: Optional[List[str]] = None) -> None:
+        self.warmed = warmed or []
+        self.ready = True
+
+    def reset(self) -> None:
+        self.ready = False
+        self.warmed = []
+
+
+readiness = Readiness()
+
+
+async def _load_deferred_imports() -> None:
+    for name in DEFERRED_IMPORTS:
+        importlib.import_module(name)
+
+
+async def _fill_pool() -> None:
+    """Open pool_size connections at once so none is opened on the request path."""
+
+    async def checkout() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # The repositories' asyncpg pool opens its minimum size when created
+    await asyncio.gather(get_raw_pool(), *(checkout() for _ in range(engine.pool.size())))
+
+
+async def _prime_data_versions() -> None:
+    data_versions.invalidate()
+    await data_versions.built_at()
+
+
+STEPS: Tuple[Tuple[str, Callable[[], Awaitable[None]]], ...] = (
+    ("imports", _load_deferred_imports),
+    ("db_pool", _fill_pool),
+    ("data_versions", _prime_data_versions),
+)
+
+
+async def warm_up() -> Dict[str, float]:
+    """Run each warmup step in order; returns milliseconds spent per step."""
+    timeout = get_settings().warmup_timeout_seconds
+    timings: Dict[str, float] = {}
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(step(), timeout)
+        except Exception as e:
+            logger.warning(
+                "warmup step failed", extra={"step": name, "error": str(e) or type(e).__name__}
+            )
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    # Modules, routes and pools built so far live as long as the process: freezing them
+    # keeps later garbage collections from rescanning them on the request path
+    gc.freeze()
+    logger.info("warmup complete", extra={f"{name}_ms": ms for name, ms in timings.items()})
+    return timings
+
+
+async def _current_week() -> Optional[Tuple[int, int]]:
+    async with engine.connect() as conn:
+        row = (await conn.execute(_CURRENT_WEEK_SQL)).first()
+    return (row.season, row.week) if row else None
+
+
+def hot_paths(season: int, week: int) -> List[str]:
+    """
+    URLs of the slices to pre-cache: routers' default sort and page, every scoring, with
+    the query parameters the web app sends (the ROS page leaves out per-week breakdowns).
+    """
+    paths = []
+    for scoring in WARM_SCORINGS:
+        paths.append(f"/v1/projections/{season}/{week}?scoring={scoring}")
+        paths.append(f"/v1/ros/{season}?scoring={scoring}&per_week=none")
+    return paths
+
+
+async def _request_hot_paths(app: Any) -> List[str]:
+    # Through the app itself, so cache keys and bodies are exactly what clients get
+    import httpx
+
+    current = await _current_week()
+    if current is None:
+        logger.info("no current week in f_calendar_weeks; skipping cache warmup")
+        return []
+
+    warmed = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"User-Agent": "fantasy-api-warmup"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        # One at a time: every replica of a deploy runs this against the same database
+        for path in hot_paths(*current):
+            response = await client.get(path, headers=headers)
+            if response.status_code == 200:
+                warmed.append(path)
+            else:
+                logger.warning(
+                    "cache warmup request failed",
+                    extra={"path": path, "status": response.status_code},
+                )
+    return warmed
+
+
+async def warm_caches(app: Any) -> None:
+    """Pre-cache the current week's hot slices, then mark the worker ready."""
+    start = time.perf_counter()
+    warmed: List[str] = []
+    try:
+        warmed = await asyncio.wait_for(
+            _request_hot_paths(app), get_settings().warmup_timeout_seconds
+        )
+    except Exception as e:
+        logger.warning("cache warmup failed", extra={"error": str(e) or type(e).__name__})
+    finally:
+        readiness.mark_ready(warmed)
+    logger.info(
+        "cache warmup complete",
+        extra={"slices": len(warmed), "ms": round((time.perf_counter() - start) * 1000, 1)},
+    )
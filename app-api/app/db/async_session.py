@@ -1,17 +1,25 @@
-from typing import AsyncGenerator
+import asyncio
+from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 import asyncpg
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from app.core.config import Settings
+from app.core.metrics import DB_ACQUIRE_LATENCY, timed
+from app.core.settings import get_settings
+from app.db.query_log import query_recorder
+from app.db.statements import StatementConnection
 
-settings = Settings()
+settings = get_settings()
 
 engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql+psycopg://", "postgresql+asyncpg://"),
-    echo=settings.ENV_NAME == "local",
+    settings.database_url.replace("postgresql+psycopg://", "postgresql+asyncpg://"),
+    echo=settings.env_name == "local",
+    pool_size=settings.db_pool_min_size,
+    max_overflow=max(settings.db_pool_max_size - settings.db_pool_min_size, 0),
+    pool_timeout=settings.db_pool_timeout_seconds,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
 )
 
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -25,13 +33,62 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Opened on first use in the running loop; a task so concurrent first callers share it
+_raw_pool: Optional["asyncio.Task[asyncpg.Pool]"] = None
+
+
+async def _init_raw_connection(conn: asyncpg.Connection) -> None:
+    conn.add_query_logger(query_recorder.record)
+
+
+async def _open_raw_pool() -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        settings.database_url.replace("postgresql+psycopg://", "postgresql://"),
+        min_size=settings.db_raw_pool_min_size,
+        max_size=settings.db_raw_pool_max_size,
+        max_inactive_connection_lifetime=settings.db_pool_recycle_seconds,
+        statement_cache_size=settings.db_statement_cache_size,
+        # Registry statements stay prepared for the life of the connection; a rebuilt mart
+        # surfaces as InvalidCachedStatementError, which asyncpg retries after re-preparing
+        max_cached_statement_lifetime=0,
+        connection_class=StatementConnection,
+        init=_init_raw_connection,
+    )
+
+
+async def get_raw_pool() -> asyncpg.Pool:
+    """The worker's asyncpg pool, reopened when called from a different event loop."""
+    global _raw_pool
+    task = _raw_pool
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = _raw_pool = asyncio.get_running_loop().create_task(_open_raw_pool())
+    try:
+        # Shielded: a cancelled request must not cancel the pool other requests wait on
+        return await asyncio.shield(task)
+    except Exception:
+        if _raw_pool is task:
+            _raw_pool = None
+        raise
+
+
+async def close_raw_pool() -> None:
+    global _raw_pool
+    task, _raw_pool = _raw_pool, None
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        return
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        await task.result().close()
+
+
 @asynccontextmanager
 async def get_raw_connection() -> AsyncGenerator[asyncpg.Connection, None]:
-    """Get raw asyncpg connection for complex queries"""
-    conn = await asyncpg.connect(
-        settings.DATABASE_URL.replace("postgresql+psycopg://", "postgresql://")
-    )
+    """Get a pooled raw asyncpg connection for complex queries"""
+    with timed(DB_ACQUIRE_LATENCY, "raw"):
+        pool = await get_raw_pool()
+        conn = await pool.acquire(timeout=settings.db_pool_timeout_seconds)
     try:
         yield conn
     finally:
-        await conn.close()
+        await pool.release(conn)
@@ -0,0 +1,212 @@
+"""
+Query instrumentation for raw asyncpg connections.
+
+Every statement run on a connection from get_raw_connection() is reported here through
+asyncpg's query logger. Statements are grouped by a normalized fingerprint; those slower
+than SLOW_QUERY_MS get an EXPLAIN (ANALYZE, BUFFERS) sample, captured in the background on
+a separate connection and stored in ops.slow_query_log.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and replace inline literals, keeping $n placeholders."""
+    normalized = _STRING_LITERAL.sub("?", query)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.md5(normalized.lower().encode()).hexdigest()[:16]
+
+
+def params_shape(args: Tuple[Any, ...]) -> List[str]:
+    """Type of each bound parameter; values are never recorded."""
+    return [type(arg).__name__ for arg in args]
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    query: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_calls: int = 0
+    errors: int = 0
+    params_shapes: Set[Tuple[str, ...]] = field(default_factory=set)
+    last_explained: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "query": self.query,
+            "calls": self.calls,
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+            "slow_calls": self.slow_calls,
+            "errors": self.errors,
+            "params_shapes": [list(shape) for shape in sorted(self.params_shapes)],
+        }
+
+
+class QueryRecorder:
+    """In-memory statistics per query fingerprint plus background EXPLAIN sampling."""
+
+    MAX_PARAMS_SHAPES = 20
+
+    def __init__(self):
+        self.stats: Dict[str, QueryStats] = {}
+        self._fingerprints: Dict[str, Tuple[str, str]] = {}  # raw query -> (fp, normalized)
+        self._pending: Set[asyncio.Task] = set()
+
+    def record(self, logged: "asyncpg.connection.LoggedQuery") -> None:
+        """asyncpg query logger callback; runs synchronously after each statement."""
+        settings = get_settings()
+        cached = self._fingerprints.get(logged.query)
+        if cached is None:
+            normalized = normalize_query(logged.query)
+            cached = (fingerprint(normalized), normalized)
+            # Dynamic SQL is built from a bounded set of filter combinations
+            if len(self._fingerprints) < settings.query_stats_max_fingerprints * 4:
+                self._fingerprints[logged.query] = cached
+        fp, normalized = cached
+
+        stats = self.stats.get(fp)
+        if stats is None:
+            if len(self.stats) >= settings.query_stats_max_fingerprints:
+                return
+            stats = self.stats[fp] = QueryStats(fingerprint=fp, query=normalized)
+
+        elapsed_ms = logged.elapsed * 1000
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        if logged.exception is not None:
+            stats.errors += 1
+        shape = tuple(params_shape(logged.args or ()))
+        if len(stats.params_shapes) < self.MAX_PARAMS_SHAPES:
+            stats.params_shapes.add(shape)
+
+        if elapsed_ms < settings.slow_query_ms or logged.exception is not None:
+            return
+        stats.slow_calls += 1
+        logger.warning(
+            "slow query",
+            extra={"fingerprint": fp, "duration_ms": round(elapsed_ms, 1), "params": len(shape)},
+        )
+
+        now = time.monotonic()
+        if not settings.slow_query_explain or not self._explainable(logged.query):
+            return
+        if now - stats.last_explained < settings.slow_query_explain_interval_seconds:
+            return
+        stats.last_explained = now
+        try:
+            task = asyncio.get_running_loop().create_task(
+                self._capture(fp, normalized, logged.query, tuple(logged.args or ()), elapsed_ms)
+            )
+        except RuntimeError:
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    @staticmethod
+    def _explainable(query: str) -> bool:
+        """EXPLAIN ANALYZE executes the statement, so only read-only queries are sampled."""
+        head = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        return head in ("SELECT", "WITH") and not re.search(
+            r"\b(INSERT|UPDATE|DELETE|MERGE)\b", query, re.IGNORECASE
+        )
+
+    async def _capture(
+        self, fp: str, normalized: str, query: str, args: Tuple[Any, ...], elapsed_ms: float
+    ) -> None:
+        """Run EXPLAIN (ANALYZE, BUFFERS) on its own connection and store the plan."""
+        settings = get_settings()
+        try:
+            conn = await asyncpg.connect(
+                settings.database_url.replace("postgresql+psycopg://", "postgresql://")
+            )
+            try:
+                plan = await conn.fetchval(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}",
+                    *args,
+                    timeout=settings.slow_query_explain_timeout_seconds,
+                )
+                await conn.execute(
+                    """
+                    INSERT INTO ops.slow_query_log
+                        (fingerprint, query, params_shape, duration_ms, plan)
+                    VALUES ($1, $2, $3::jsonb, $4, $5::jsonb)
+                    """,
+                    fp,
+                    normalized,
+                    json.dumps(params_shape(args)),
+                    elapsed_ms,
+                    plan if isinstance(plan, str) else json.dumps(plan),
+                )
+            finally:
+                await conn.close()
+        except Exception:
+            logger.exception("Failed to capture EXPLAIN sample", extra={"fingerprint": fp})
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Fingerprints ordered by total time spent."""
+        ranked = sorted(self.stats.values(), key=lambda s: s.total_ms, reverse=True)
+        return [s.to_dict() for s in ranked[:limit]]
+
+    def clear(self) -> None:
+        self.stats.clear()
+        self._fingerprints.clear()
+
+
+# Global query recorder instance
+query_recorder = QueryRecorder()
+
+
+async def list_slow_queries(
+    session: AsyncSession, limit: int = 50, fingerprint: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Most recent EXPLAIN samples from ops.slow_query_log."""
+    result = await session.execute(
+        text(
+            """
+            SELECT id, fingerprint, query, params_shape, duration_ms, plan, captured_at
+            FROM ops.slow_query_log
+            WHERE CAST(:fingerprint AS text) IS NULL OR fingerprint = :fingerprint
+            ORDER BY captured_at DESC
+            LIMIT :limit
+            """
+        ),
+        {"fingerprint": fingerprint, "limit": limit},
+    )
+    samples = []
+    for row in result.mappings():
+        sample = dict(row)
+        sample["captured_at"] = sample["captured_at"].isoformat()
+        samples.append(sample)
+    return samples
@@ -0,0 +1,71 @@
+"""
+Fixed-shape SQL statements for the repositories, prepared once per pooled connection.
+
+Repositories declare each query once, at import time, instead of assembling it per call:
+optional filters are switched off by passing NULL (`($4::text IS NULL OR fp.team = $4)`)
+and the few ORDER BY choices are separate variants of one statement. Every request then
+runs one of a small, bounded set of statement texts, which asyncpg's per-connection
+statement cache prepares on first use and reuses for as long as the pooled connection
+lives, so repeated calls skip parsing and planning.
+
+DB_PREPARED_STATEMENTS counts, per statement, whether the connection had already
+prepared it (hit) or prepared it for this call (miss).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set
+
+import asyncpg
+
+from app.core.metrics import DB_PREPARED_STATEMENTS
+from app.core.settings import get_settings
+
+
+@dataclass(frozen=True)
+class Statement:
+    """A named SQL text with $n placeholders; the text never varies per call."""
+
+    name: str
+    sql: str
+
+
+def variants(name: str, template: str, order_by: Dict[str, str]) -> Dict[str, Statement]:
+    """One Statement per sort option, filling `{order_by}` in the template."""
+    return {
+        key: Statement(f"{name}:{key}", template.replace("{order_by}", clause))
+        for key, clause in order_by.items()
+    }
+
+
+class StatementConnection(asyncpg.Connection):
+    """Pooled connection that remembers which registry statements it has prepared."""
+
+    __slots__ = ("prepared_statements",)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Set[str] = set()
+
+
+def _record_use(conn: Any, statement: Statement) -> None:
+    if not get_settings().db_statement_cache_size:
+        DB_PREPARED_STATEMENTS.inc(statement.name, "uncached")
+        return
+    prepared = getattr(conn, "prepared_statements", None)
+    if prepared is None:
+        return
+    if statement.name in prepared:
+        DB_PREPARED_STATEMENTS.inc(statement.name, "hit")
+    else:
+        prepared.add(statement.name)
+        DB_PREPARED_STATEMENTS.inc(statement.name, "miss")
+
+
+async def fetch(conn: Any, statement: Statement, *args: Any) -> List[asyncpg.Record]:
+    _record_use(conn, statement)
+    return await conn.fetch(statement.sql, *args)
+
+
+async def fetchval(conn: Any, statement: Statement, *args: Any) -> Any:
+    _record_use(conn, statement)
+    return await conn.fetchval(statement.sql, *args)
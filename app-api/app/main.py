@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, HTTPException
@@ -11,6 +12,11 @@ from app.core.settings import get_settings
 
 settings = get_settings()
 from app.core.rate_limit import init_limiter, close_limiter
+from app.core.oauth import init_oauth_client, close_oauth_client
+from app.core.warmup import readiness, warm_caches, warm_up
+from app.core.profiling import start_loop_block_detector, stop_loop_block_detector
+from app.core.compression import CompressionMiddleware
+from app.db.async_session import close_raw_pool, engine
 from app.core.middleware import (
     RequestIdMiddleware,
     http_exception_handler,
@@ -23,10 +29,35 @@ logger = logging.getLogger("app")
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler."""
-    logger.info("Starting up Fantasy Insights API")
+    logger.info(
+        "Starting up Fantasy Insights API",
+        extra={
+            "workers": settings.web_concurrency,
+            "db_pool": f"{settings.db_pool_min_size}-{settings.db_pool_max_size}",
+            "db_connection_budget": settings.db_connection_budget,
+        },
+    )
     await init_limiter()
+    await init_oauth_client()
+    readiness.reset()
+    cache_warmup = None
+    if settings.warmup_enabled:
+        await warm_up()
+    if settings.warmup_enabled and settings.warmup_cache_enabled:
+        cache_warmup = asyncio.create_task(warm_caches(app))
+    else:
+        readiness.mark_ready()
+    start_loop_block_detector()
     yield
+    if cache_warmup is not None:
+        cache_warmup.cancel()
+        with suppress(asyncio.CancelledError):
+            await cache_warmup
+    await stop_loop_block_detector()
+    await close_oauth_client()
     await close_limiter()
+    await engine.dispose()
+    await close_raw_pool()
     logger.info("Shutting down Fantasy Insights API")
 
 
@@ -43,7 +74,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Add middleware
+    # Add middleware (last added is outermost; compression sits inside the access log
+    # so logged and measured bytes are the bytes sent)
+    app.add_middleware(CompressionMiddleware)
     app.add_middleware(RequestIdMiddleware)
     app.add_middleware(
         CORSMiddleware,
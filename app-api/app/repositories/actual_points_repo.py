@@ -1,9 +1,80 @@
 from typing import Dict, List, Optional, Any
-import asyncpg
+from app.core.metrics import track_query
+from app.db import statements
 from app.db.async_session import get_raw_connection
+from app.db.statements import Statement, variants
+
+# $4 lower-cased name LIKE pattern, $5 position and $6 team, each NULL when not filtered on
+_WEEK_WHERE = """
+    WHERE season = $1 AND week = $2 AND scoring = $3
+        AND ($4::text IS NULL OR LOWER(name) LIKE $4)
+        AND ($5::text IS NULL OR position = $5)
+        AND ($6::text IS NULL OR team = $6)
+"""
+
+WEEK_COUNT = Statement(
+    "actual_points.week_count",
+    "SELECT COUNT(*) FROM dwh_marts.f_weekly_actual_points" + _WEEK_WHERE,
+)
+
+_WEEK_PAGE = (
+    """
+    SELECT
+        player_id,
+        name,
+        team,
+        position,
+        scoring,
+        actual_points,
+        season,
+        week
+    FROM dwh_marts.f_weekly_actual_points
+"""
+    + _WEEK_WHERE
+    + """
+    ORDER BY {order_by}
+    LIMIT $7 OFFSET $8
+"""
+)
+
+_SORT_COLUMNS = ("name", "team", "position", "actual_points")
+
+# Keyed by (sort column, descending)
+WEEK_PAGE = {
+    (column, desc): page
+    for desc, direction in ((True, "DESC"), (False, "ASC"))
+    for column, page in variants(
+        f"actual_points.week_{direction.lower()}",
+        _WEEK_PAGE,
+        order_by={column: f"{column} {direction}" for column in _SORT_COLUMNS},
+    ).items()
+}
+
+PLAYER_SEASON = Statement(
+    "actual_points.player_season",
+    """
+    SELECT
+        player_id,
+        name,
+        team,
+        position,
+        scoring,
+        actual_points,
+        season,
+        week
+    FROM dwh_marts.f_weekly_actual_points
+    WHERE player_id = $1
+        AND season = $2
+        AND scoring = $3
+        AND week >= $4
+        AND week <= $5
+    ORDER BY week ASC
+    """,
+)
 
 
 class ActualPointsRepository:
+    @track_query("actual_points")
     async def get_actual_points(
         self,
         season: int,
@@ -19,67 +90,19 @@ class ActualPointsRepository:
     ) -> Dict[str, Any]:
         """Get actual points for players in a given week"""
         async with get_raw_connection() as conn:
-            # Build base conditions
-            where_conditions = ["season = $1", "week = $2", "scoring = $3"]
-            params = [season, week, scoring]
-            param_idx = 4
-
-            # Add search filter
-            if search:
-                where_conditions.append(f"LOWER(name) LIKE ${param_idx}")
-                params.append(f"%{search.lower()}%")
-                param_idx += 1
-
-            # Add position filter
-            if position:
-                where_conditions.append(f"position = ${param_idx}")
-                params.append(position)
-                param_idx += 1
-
-            # Add team filter
-            if team:
-                where_conditions.append(f"team = ${param_idx}")
-                params.append(team)
-                param_idx += 1
-
-            where_clause = " AND ".join(where_conditions)
-
-            # Validate sort column
-            valid_sort_columns = {"name", "team", "position", "actual_points"}
-            if sort_by not in valid_sort_columns:
-                sort_by = "actual_points"
-
-            sort_direction = "DESC" if sort_desc else "ASC"
-
-            # Get total count
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM dwh_marts.f_weekly_actual_points
-                WHERE {where_clause}
-            """
-
-            count_result = await conn.fetchrow(count_query, *params)
-            total = count_result["total"] if count_result else 0
-
-            # Get actual data
-            data_query = f"""
-                SELECT 
-                    player_id,
-                    name,
-                    team,
-                    position,
-                    scoring,
-                    actual_points,
-                    season,
-                    week
-                FROM dwh_marts.f_weekly_actual_points
-                WHERE {where_clause}
-                ORDER BY {sort_by} {sort_direction}
-                LIMIT ${param_idx} OFFSET ${param_idx + 1}
-            """
-
-            params.extend([limit, offset])
-            rows = await conn.fetch(data_query, *params)
+            params = (
+                season,
+                week,
+                scoring,
+                f"%{search.lower()}%" if search else None,
+                position or None,
+                team or None,
+            )
+            total = await statements.fetchval(conn, WEEK_COUNT, *params) or 0
+
+            # Unknown sort columns fall back to actual_points
+            page = WEEK_PAGE.get((sort_by, sort_desc), WEEK_PAGE[("actual_points", sort_desc)])
+            rows = await statements.fetch(conn, page, *params, limit, offset)
 
             items = [
                 {
@@ -105,6 +128,7 @@ class ActualPointsRepository:
                 "scoring": scoring,
             }
 
+    @track_query("actual_points")
     async def get_player_season_actual_points(
         self,
         player_id: str,
@@ -115,26 +139,9 @@ class ActualPointsRepository:
     ) -> Dict[str, Any]:
         """Get actual points for a specific player across a season range"""
         async with get_raw_connection() as conn:
-            query = """
-                SELECT 
-                    player_id,
-                    name,
-                    team,
-                    position,
-                    scoring,
-                    actual_points,
-                    season,
-                    week
-                FROM dwh_marts.f_weekly_actual_points
-                WHERE player_id = $1 
-                    AND season = $2 
-                    AND scoring = $3
-                    AND week >= $4
-                    AND week <= $5
-                ORDER BY week ASC
-            """
-
-            rows = await conn.fetch(query, player_id, season, scoring, week_start, week_end)
+            rows = await statements.fetch(
+                conn, PLAYER_SEASON, player_id, season, scoring, week_start, week_end
+            )
 
             items = [
                 {
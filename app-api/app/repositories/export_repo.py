@@ -0,0 +1,214 @@
+import time
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+import asyncpg
+
+from app.core.metrics import DB_QUERY_LATENCY, DB_ROWS
+from app.db.async_session import get_raw_connection
+
+# Display name with the same fallbacks as the paged endpoints
+_PLAYER_NAME_SQL = (
+    "COALESCE(CASE WHEN p.display_name != '' THEN p.display_name "
+    "ELSE concat(p.first_name, ' ', p.last_name) END, {alias}.player_id)"
+)
+
+_DEDUPE_PLAYERS_CTE = """
+WITH dedupe_players AS (
+    SELECT DISTINCT ON (player_id)
+        player_id, display_name, first_name, last_name
+    FROM dwh_staging.stg_players
+)
+"""
+
+
+class ExportRepository:
+    """
+    Full-slice reads for the export endpoints.
+
+    Each method yields lists of asyncpg Records read through a server-side cursor in a
+    read-only repeatable-read transaction, so memory is bounded by batch_rows and the
+    whole export sees one snapshot. Numerics are cast to float8 and jsonb to text in
+    SQL, so encoders get plain values. The connection is held until the iterator is
+    exhausted or closed.
+    """
+
+    async def _stream(
+        self, method: str, query: str, params: Sequence[Any], batch_rows: int
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        start = time.perf_counter()
+        total = 0
+        try:
+            async with get_raw_connection() as conn:
+                async with conn.transaction(isolation="repeatable_read", readonly=True):
+                    cursor = await conn.cursor(query, *params)
+                    while True:
+                        rows = await cursor.fetch(batch_rows)
+                        if not rows:
+                            break
+                        total += len(rows)
+                        yield rows
+        finally:
+            DB_QUERY_LATENCY.observe(time.perf_counter() - start, "export", method)
+            DB_ROWS.observe(total, "export", method)
+
+    @staticmethod
+    def _filters(
+        alias: str,
+        where_clauses: List[str],
+        params: List[Any],
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> str:
+        if position:
+            params.append(position.upper())
+            where_clauses.append(f"{alias}.position = ${len(params)}")
+        if team:
+            params.append(team.upper())
+            where_clauses.append(f"{alias}.team = ${len(params)}")
+        return "WHERE " + " AND ".join(where_clauses)
+
+    def stream_weekly_projections(
+        self,
+        season: int,
+        scoring: str,
+        label: str,
+        week: Optional[int] = None,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+        batch_rows: int = 2000,
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """Weekly projections for a season (or one week); `label` is the API scoring name."""
+        params: List[Any] = [season, scoring, label]
+        where_clauses = ["fp.season = $1", "fp.scoring = $2"]
+        if week is not None:
+            params.append(week)
+            where_clauses.append(f"fp.week = ${len(params)}")
+        where_sql = self._filters("fp", where_clauses, params, position, team)
+
+        query = f"""
+        {_DEDUPE_PLAYERS_CTE}
+        SELECT
+            fp.season,
+            fp.week,
+            fp.player_id,
+            {_PLAYER_NAME_SQL.format(alias="fp")} AS name,
+            fp.team,
+            fp.position,
+            $3::text AS scoring,
+            fp.proj_pts::float8 AS proj,
+            fp.low::float8 AS low,
+            fp.high::float8 AS high,
+            fp.components_json::text AS components
+        FROM dwh_marts.f_weekly_projection fp
+        LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+        {where_sql}
+        ORDER BY fp.week, fp.player_id
+        """
+        return self._stream("weekly_projections", query, params, batch_rows)
+
+    def stream_ros_projections(
+        self,
+        season: int,
+        scoring: str,
+        label: str,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+        batch_rows: int = 2000,
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """Rest-of-season projections for a season; `label` is the API scoring name."""
+        params: List[Any] = [season, scoring, label]
+        where_sql = self._filters(
+            "fp", ["fp.season = $1", "fp.scoring = $2"], params, position, team
+        )
+
+        query = f"""
+        {_DEDUPE_PLAYERS_CTE}
+        SELECT
+            fp.season,
+            fp.player_id,
+            {_PLAYER_NAME_SQL.format(alias="fp")} AS name,
+            fp.team,
+            fp.position,
+            $3::text AS scoring,
+            fp.proj_pts_total::float8 AS proj_total,
+            fp.low::float8 AS low,
+            fp.high::float8 AS high,
+            fp.per_week_json::text AS per_week_json
+        FROM dwh_marts.f_ros_projection fp
+        LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+        {where_sql}
+        ORDER BY fp.player_id
+        """
+        return self._stream("ros_projections", query, params, batch_rows)
+
+    def stream_actual_points(
+        self,
+        season: int,
+        scoring: str,
+        week: Optional[int] = None,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+        batch_rows: int = 2000,
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """Actual fantasy points for a season (or one week)."""
+        params: List[Any] = [season, scoring]
+        where_clauses = ["ap.season = $1", "ap.scoring = $2"]
+        if week is not None:
+            params.append(week)
+            where_clauses.append(f"ap.week = ${len(params)}")
+        where_sql = self._filters("ap", where_clauses, params, position, team)
+
+        query = f"""
+        SELECT
+            ap.season,
+            ap.week,
+            ap.player_id,
+            ap.name,
+            ap.team,
+            ap.position,
+            ap.scoring,
+            ap.actual_points::float8 AS actual_points
+        FROM dwh_marts.f_weekly_actual_points ap
+        {where_sql}
+        ORDER BY ap.week, ap.player_id
+        """
+        return self._stream("actual_points", query, params, batch_rows)
+
+    def stream_usage(
+        self,
+        season: int,
+        week: Optional[int] = None,
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+        batch_rows: int = 2000,
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """Per-week usage shares and volumes for a season (or one week)."""
+        params: List[Any] = [season]
+        where_clauses = ["u.season = $1"]
+        if week is not None:
+            params.append(week)
+            where_clauses.append(f"u.week = ${len(params)}")
+        where_sql = self._filters("u", where_clauses, params, position, team)
+
+        query = f"""
+        {_DEDUPE_PLAYERS_CTE}
+        SELECT
+            u.season,
+            u.week,
+            u.player_id,
+            {_PLAYER_NAME_SQL.format(alias="u")} AS name,
+            u.team,
+            u.position,
+            u.snap_pct::float8 AS snap_pct,
+            u.route_pct::float8 AS route_pct,
+            u.target_share::float8 AS target_share,
+            u.rush_share::float8 AS rush_share,
+            u.routes_run::float8 AS routes,
+            u.targets::float8 AS targets,
+            u.rush_att::float8 AS rush_att
+        FROM dwh_intermediate.int_player_week_usage u
+        LEFT JOIN dedupe_players p ON u.player_id = p.player_id
+        {where_sql}
+        ORDER BY u.week, u.player_id
+        """
+        return self._stream("usage", query, params, batch_rows)
@@ -1,10 +1,198 @@
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 import json
-import asyncpg
+from app.core.metrics import track_query
+from app.db import statements
 from app.db.async_session import get_raw_connection
+from app.db.statements import Statement, variants
+
+_PLAYERS_CTE = """
+WITH dedupe_players AS (
+    SELECT DISTINCT ON (player_id)
+        player_id, display_name, first_name, last_name
+    FROM dwh_staging.stg_players
+)
+"""
+
+_NAME = (
+    "CASE WHEN p.display_name != '' THEN p.display_name "
+    "ELSE concat(p.first_name, ' ', p.last_name) END"
+)
+
+
+def _filters(first: int) -> str:
+    """
+    Optional filters from placeholder $first on: position, team, player_id and a lower-cased
+    name LIKE pattern. NULL switches a filter off, so one text covers every combination.
+    """
+    position, team, player_id, name = (f"${first + i}" for i in range(4))
+    return f"""
+    AND ({position}::text IS NULL OR fp.position = {position})
+    AND ({team}::text IS NULL OR fp.team = {team})
+    AND ({player_id}::text IS NULL OR fp.player_id = {player_id})
+    AND ({name}::text IS NULL OR LOWER({_NAME}) LIKE {name})
+"""
+
+
+WEEKLY_COUNT = Statement(
+    "projections.weekly_count",
+    _PLAYERS_CTE
+    + """
+SELECT COUNT(*)
+FROM dwh_marts.f_weekly_projection fp
+LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+WHERE fp.season = $1 AND fp.week = $2 AND fp.scoring = $3
+"""
+    + _filters(4),
+)
+
+WEEKLY_PAGE = variants(
+    "projections.weekly",
+    _PLAYERS_CTE
+    + f"""
+SELECT
+    fp.player_id,
+    COALESCE({_NAME}, fp.player_id) as name,
+    fp.team,
+    fp.position,
+    fp.scoring,
+    fp.proj_pts as proj,
+    fp.low,
+    fp.high,
+    fp.components_json as components,
+    fp.season,
+    fp.week
+FROM dwh_marts.f_weekly_projection fp
+LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+WHERE fp.season = $1 AND fp.week = $2 AND fp.scoring = $3
+"""
+    + _filters(4)
+    + """
+ORDER BY {order_by}
+LIMIT $8 OFFSET $9
+""",
+    order_by={
+        "proj": "fp.proj_pts DESC",
+        "low": "fp.low DESC",
+        "high": "fp.high DESC",
+        "name": "p.display_name ASC",
+    },
+)
+
+ROS_COUNT = Statement(
+    "projections.ros_count",
+    _PLAYERS_CTE
+    + """
+SELECT COUNT(*)
+FROM dwh_marts.f_ros_projection fp
+LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+WHERE fp.season = $1 AND fp.scoring = $2
+"""
+    + _filters(3),
+)
+
+# Per-week breakdown formats for ROS rows. "objects" is the mart's jsonb list of
+# {week, proj}; "columns" unpacks it in Postgres into parallel arrays, which asyncpg
+# decodes natively and which serialize to a fraction of the bytes; "none" leaves it out.
+ROS_PER_WEEK_FORMATS = ("objects", "columns", "none")
+
+_ROS_PER_WEEK_SELECT = {
+    "objects": """,
+    fp.per_week_json""",
+    "columns": """,
+    ARRAY(
+        SELECT (w->>'week')::int FROM jsonb_array_elements(fp.per_week_json) w
+        ORDER BY (w->>'week')::int
+    ) AS per_week_weeks,
+    ARRAY(
+        SELECT (w->>'proj')::float8 FROM jsonb_array_elements(fp.per_week_json) w
+        ORDER BY (w->>'week')::int
+    ) AS per_week_proj""",
+    "none": "",
+}
+
+# Keyed by (per-week format, sort)
+ROS_PAGE = {
+    (per_week, sort): page
+    for per_week, per_week_select in _ROS_PER_WEEK_SELECT.items()
+    for sort, page in variants(
+        f"projections.ros_{per_week}",
+        _PLAYERS_CTE
+        + f"""
+SELECT
+    fp.player_id,
+    COALESCE({_NAME}, fp.player_id) as name,
+    fp.team,
+    fp.position,
+    fp.scoring,
+    fp.proj_pts_total as proj_total,
+    fp.low,
+    fp.high{per_week_select}
+FROM dwh_marts.f_ros_projection fp
+LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+WHERE fp.season = $1 AND fp.scoring = $2
+"""
+        + _filters(3)
+        + """
+ORDER BY {order_by}
+LIMIT $7 OFFSET $8
+""",
+        order_by={
+            "proj_total": "fp.proj_pts_total DESC",
+            "low": "fp.low DESC",
+            "high": "fp.high DESC",
+            "name": "p.display_name ASC",
+        },
+    ).items()
+}
+
+PLAYER_SEASON = Statement(
+    "projections.player_season",
+    _PLAYERS_CTE
+    + f"""
+SELECT
+    fp.player_id,
+    COALESCE({_NAME}, fp.player_id) as name,
+    fp.team,
+    fp.position,
+    fp.scoring,
+    fp.proj_pts as proj,
+    fp.low,
+    fp.high,
+    fp.components_json as components,
+    fp.season,
+    fp.week
+FROM dwh_marts.f_weekly_projection fp
+LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
+WHERE fp.player_id = $1
+    AND fp.season = $2
+    AND fp.scoring = $3
+    AND fp.week >= $4
+    AND fp.week <= $5
+ORDER BY fp.week ASC
+""",
+)
+
+
+def _filter_args(
+    position: Optional[str], team: Optional[str], search: Optional[str]
+) -> Tuple[Optional[str], ...]:
+    """Values for _filters(); a search that looks like a player_id (hyphen, digits) matches it."""
+    player_id = name_pattern = None
+    if search:
+        if "-" in search and any(c.isdigit() for c in search):
+            player_id = search
+        else:
+            name_pattern = f"%{search.lower()}%"
+    return (
+        position.upper() if position else None,
+        team.upper() if team else None,
+        player_id,
+        name_pattern,
+    )
 
 
 class ProjectionsRepository:
+    @track_query("projections")
     async def list_weekly_projections(
         self,
         season: int,
@@ -18,87 +206,12 @@ class ProjectionsRepository:
         offset: int = 0,
     ) -> Dict:
         async with get_raw_connection() as conn:
-            where_clauses = ["fp.season = $1", "fp.week = $2", "fp.scoring = $3"]
-            params = [season, week, scoring]
-            param_idx = 4
-
-            if position:
-                where_clauses.append(f"fp.position = ${param_idx}")
-                params.append(position.upper())
-                param_idx += 1
-
-            if team:
-                where_clauses.append(f"fp.team = ${param_idx}")
-                params.append(team.upper())
-                param_idx += 1
+            params = (season, week, scoring) + _filter_args(position, team, search)
 
-            if search:
-                # Check if search looks like a player_id (contains hyphens and numbers)
-                if "-" in search and any(c.isdigit() for c in search):
-                    where_clauses.append(f"fp.player_id = ${param_idx}")
-                    params.append(search)
-                else:
-                    where_clauses.append(
-                        f"LOWER(CASE WHEN p.display_name != '' THEN p.display_name ELSE concat(p.first_name, ' ', p.last_name) END) LIKE ${param_idx}"
-                    )
-                    params.append(f"%{search.lower()}%")
-                param_idx += 1
+            total = await statements.fetchval(conn, WEEKLY_COUNT, *params)
 
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-
-            # Sort options
-            sort_sql = "ORDER BY fp.proj_pts DESC"  # default
-            if sort == "low":
-                sort_sql = "ORDER BY fp.low DESC"
-            elif sort == "high":
-                sort_sql = "ORDER BY fp.high DESC"
-            elif sort == "name":
-                sort_sql = "ORDER BY p.display_name ASC"
-            elif sort == "proj":
-                sort_sql = "ORDER BY fp.proj_pts DESC"
-
-            # Count total
-            count_query = f"""
-            WITH dedupe_players AS (
-                SELECT DISTINCT ON (player_id) 
-                    player_id, display_name, first_name, last_name
-                FROM dwh_staging.stg_players
-            )
-            SELECT COUNT(*)
-            FROM dwh_marts.f_weekly_projection fp
-            LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
-            {where_sql}
-            """
-            total = await conn.fetchval(count_query, *params)
-
-            # Get results
-            query = f"""
-            WITH dedupe_players AS (
-                SELECT DISTINCT ON (player_id) 
-                    player_id, display_name, first_name, last_name
-                FROM dwh_staging.stg_players
-            )
-            SELECT 
-                fp.player_id,
-                COALESCE(CASE WHEN p.display_name != '' THEN p.display_name ELSE concat(p.first_name, ' ', p.last_name) END, fp.player_id) as name,
-                fp.team,
-                fp.position,
-                fp.scoring,
-                fp.proj_pts as proj,
-                fp.low,
-                fp.high,
-                fp.components_json as components,
-                fp.season,
-                fp.week
-            FROM dwh_marts.f_weekly_projection fp
-            LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
-            {where_sql}
-            {sort_sql}
-            LIMIT ${param_idx} OFFSET ${param_idx + 1}
-            """
-            params.extend([limit, offset])
-
-            rows = await conn.fetch(query, *params)
+            page = WEEKLY_PAGE.get(sort or "proj", WEEKLY_PAGE["proj"])
+            rows = await statements.fetch(conn, page, *params, limit, offset)
 
             # Parse JSON components
             items = []
@@ -121,6 +234,7 @@ class ProjectionsRepository:
                 "offset": offset,
             }
 
+    @track_query("projections")
     async def list_ros_projections(
         self,
         season: int,
@@ -131,93 +245,27 @@ class ProjectionsRepository:
         sort: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
+        per_week: str = "objects",
     ) -> Dict:
         async with get_raw_connection() as conn:
-            where_clauses = ["fp.season = $1", "fp.scoring = $2"]
-            params = [season, scoring]
-            param_idx = 3
-
-            if position:
-                where_clauses.append(f"fp.position = ${param_idx}")
-                params.append(position.upper())
-                param_idx += 1
-
-            if team:
-                where_clauses.append(f"fp.team = ${param_idx}")
-                params.append(team.upper())
-                param_idx += 1
+            params = (season, scoring) + _filter_args(position, team, search)
 
-            if search:
-                # Check if search looks like a player_id (contains hyphens and numbers)
-                if "-" in search and any(c.isdigit() for c in search):
-                    where_clauses.append(f"fp.player_id = ${param_idx}")
-                    params.append(search)
-                else:
-                    where_clauses.append(
-                        f"LOWER(CASE WHEN p.display_name != '' THEN p.display_name ELSE concat(p.first_name, ' ', p.last_name) END) LIKE ${param_idx}"
-                    )
-                    params.append(f"%{search.lower()}%")
-                param_idx += 1
+            total = await statements.fetchval(conn, ROS_COUNT, *params)
 
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-
-            # Sort options
-            sort_sql = "ORDER BY fp.proj_pts_total DESC"  # default
-            if sort == "low":
-                sort_sql = "ORDER BY fp.low DESC"
-            elif sort == "high":
-                sort_sql = "ORDER BY fp.high DESC"
-            elif sort == "name":
-                sort_sql = "ORDER BY p.display_name ASC"
-            elif sort in ["proj", "proj_total"]:
-                sort_sql = "ORDER BY fp.proj_pts_total DESC"
-
-            # Count total
-            count_query = f"""
-            WITH dedupe_players AS (
-                SELECT DISTINCT ON (player_id) 
-                    player_id, display_name, first_name, last_name
-                FROM dwh_staging.stg_players
-            )
-            SELECT COUNT(*)
-            FROM dwh_marts.f_ros_projection fp
-            LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
-            {where_sql}
-            """
-            total = await conn.fetchval(count_query, *params)
-
-            # Get results
-            query = f"""
-            WITH dedupe_players AS (
-                SELECT DISTINCT ON (player_id) 
-                    player_id, display_name, first_name, last_name
-                FROM dwh_staging.stg_players
-            )
-            SELECT 
-                fp.player_id,
-                COALESCE(CASE WHEN p.display_name != '' THEN p.display_name ELSE concat(p.first_name, ' ', p.last_name) END, fp.player_id) as name,
-                fp.team,
-                fp.position,
-                fp.scoring,
-                fp.proj_pts_total as proj_total,
-                fp.low,
-                fp.high,
-                fp.per_week_json
-            FROM dwh_marts.f_ros_projection fp
-            LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
-            {where_sql}
-            {sort_sql}
-            LIMIT ${param_idx} OFFSET ${param_idx + 1}
-            """
-            params.extend([limit, offset])
-
-            rows = await conn.fetch(query, *params)
+            sort = "proj_total" if sort in (None, "proj") else sort
+            page = ROS_PAGE.get((per_week, sort), ROS_PAGE[(per_week, "proj_total")])
+            rows = await statements.fetch(conn, page, *params, limit, offset)
 
             # Parse JSON per_week data
             items = []
             for row in rows:
                 item = dict(row)
-                if item.get("per_week_json"):
+                if per_week == "columns":
+                    item["per_week"] = {
+                        "weeks": item.pop("per_week_weeks"),
+                        "proj": item.pop("per_week_proj"),
+                    }
+                elif item.get("per_week_json"):
                     try:
                         item["per_week_json"] = json.loads(item["per_week_json"])
                     except (json.JSONDecodeError, TypeError):
@@ -233,40 +281,15 @@ class ProjectionsRepository:
                 "offset": offset,
             }
 
+    @track_query("projections")
     async def get_player_season_projections(
         self, player_id: str, season: int, scoring: str, week_start: int = 1, week_end: int = 18
     ) -> Dict:
         """Get all weekly projections for a specific player across a season range"""
         async with get_raw_connection() as conn:
-            query = """
-            WITH dedupe_players AS (
-                SELECT DISTINCT ON (player_id) 
-                    player_id, display_name, first_name, last_name
-                FROM dwh_staging.stg_players
+            rows = await statements.fetch(
+                conn, PLAYER_SEASON, player_id, season, scoring, week_start, week_end
             )
-            SELECT 
-                fp.player_id,
-                COALESCE(CASE WHEN p.display_name != '' THEN p.display_name ELSE concat(p.first_name, ' ', p.last_name) END, fp.player_id) as name,
-                fp.team,
-                fp.position,
-                fp.scoring,
-                fp.proj_pts as proj,
-                fp.low,
-                fp.high,
-                fp.components_json as components,
-                fp.season,
-                fp.week
-            FROM dwh_marts.f_weekly_projection fp
-            LEFT JOIN dedupe_players p ON fp.player_id = p.player_id
-            WHERE fp.player_id = $1 
-                AND fp.season = $2 
-                AND fp.scoring = $3
-                AND fp.week >= $4
-                AND fp.week <= $5
-            ORDER BY fp.week ASC
-            """
-
-            rows = await conn.fetch(query, player_id, season, scoring, week_start, week_end)
 
             # Parse JSON components
             items = []
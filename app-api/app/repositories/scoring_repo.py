@@ -1,8 +1,78 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from app.core.metrics import track_query
+from app.db import statements
 from app.db.async_session import get_raw_connection
+from app.db.statements import Statement
+
+# Scoring rule -> predicted component column; the coefficients are bound as $3-$11
+SCORING_COMPONENTS: Tuple[Tuple[str, str], ...] = (
+    ("reception", "rec_pred"),
+    ("rec_yd", "rec_yds_pred"),
+    ("rec_td", "rec_td_pred"),
+    ("rush_yd", "rush_yds_pred"),
+    ("rush_td", "rush_td_pred"),
+    ("pass_yd", "pass_yds_pred"),
+    ("pass_td", "pass_td_pred"),
+    ("int", "int_pred"),
+    ("fumble", "fumble_pred"),
+)
+
+
+
+def _where(first: int) -> str:
+    """Season and week, then position, team and name ILIKE from $first on (NULL = any)."""
+    position, team, name = (f"${first + i}" for i in range(3))
+    return f"""
+    WHERE p.season = $1 AND p.week = $2
+        AND ({position}::text IS NULL OR p.position = {position})
+        AND ({team}::text IS NULL OR p.team = {team})
+        AND ({name}::text IS NULL OR p.name ILIKE {name})
+"""
+
+
+PREVIEW_COUNT = Statement(
+    "scoring.preview_count",
+    "SELECT COUNT(*) FROM mart.int_weekly_projections_components p" + _where(3),
+)
+
+PREVIEW_PAGE = Statement(
+    "scoring.preview",
+    """
+    SELECT
+        p.player_id,
+        p.name,
+        p.team,
+        p.position,
+        """
+    + " + ".join(
+        f"COALESCE(p.{column}, 0) * ${i}::float8"
+        for i, (_, column) in enumerate(SCORING_COMPONENTS, start=3)
+    )
+    + """ as proj,
+        p.targets_pred,
+        p.rec_pred,
+        p.rec_yds_pred,
+        p.rec_td_pred,
+        p.rush_att_pred,
+        p.rush_yds_pred,
+        p.rush_td_pred,
+        p.pass_att_pred,
+        p.pass_yds_pred,
+        p.pass_td_pred,
+        p.int_pred,
+        p.fumble_pred
+    FROM mart.int_weekly_projections_components p
+"""
+    + _where(3 + len(SCORING_COMPONENTS))
+    + """
+    ORDER BY proj DESC
+    LIMIT $15 OFFSET $16
+""",
+)
 
 
 class ScoringRepository:
+    @track_query("scoring")
     async def preview_scoring(
         self,
         season: int,
@@ -14,64 +84,18 @@ class ScoringRepository:
     ) -> Dict[str, Any]:
         """Calculate custom scoring preview"""
         async with get_raw_connection() as conn:
-            where_conditions = ["p.season = $1", "p.week = $2"]
-            params = [season, week]
-            param_count = 2
-
-            if filters.get("position"):
-                param_count += 1
-                where_conditions.append(f"p.position = ${param_count}")
-                params.append(filters["position"])
-
-            if filters.get("team"):
-                param_count += 1
-                where_conditions.append(f"p.team = ${param_count}")
-                params.append(filters["team"])
-
-            if filters.get("search"):
-                param_count += 1
-                where_conditions.append(f"p.name ILIKE ${param_count}")
-                params.append(f"%{filters['search']}%")
-
-            scoring_calc = self._build_scoring_calculation(scoring)
-            where_clause = " AND ".join(where_conditions)
-
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM mart.int_weekly_projections_components p
-                WHERE {where_clause}
-            """
-
-            count_result = await conn.fetchrow(count_query, *params)
-            total = count_result["total"]
-
-            data_query = f"""
-                SELECT 
-                    p.player_id,
-                    p.name,
-                    p.team,
-                    p.position,
-                    {scoring_calc} as proj,
-                    p.targets_pred,
-                    p.rec_pred,
-                    p.rec_yds_pred,
-                    p.rec_td_pred,
-                    p.rush_att_pred,
-                    p.rush_yds_pred,
-                    p.rush_td_pred,
-                    p.pass_att_pred,
-                    p.pass_yds_pred,
-                    p.pass_td_pred,
-                    p.int_pred,
-                    p.fumble_pred
-                FROM mart.int_weekly_projections_components p
-                WHERE {where_clause}
-                ORDER BY proj DESC
-                LIMIT ${param_count + 1} OFFSET ${param_count + 2}
-            """
-
-            params.extend([limit, offset])
-            rows = await conn.fetch(data_query, *params)
+            filter_args = (
+                filters.get("position") or None,
+                filters.get("team") or None,
+                f"%{filters['search']}%" if filters.get("search") else None,
+            )
+            total = await statements.fetchval(conn, PREVIEW_COUNT, season, week, *filter_args)
+
+            # Every rule is bound, so one statement serves any custom scoring
+            coefficients = [float(scoring.get(rule, 0)) for rule, _ in SCORING_COMPONENTS]
+            rows = await statements.fetch(
+                conn, PREVIEW_PAGE, season, week, *coefficients, *filter_args, limit, offset
+            )
 
             items = []
             for row in rows:
@@ -115,39 +139,3 @@ class ScoringRepository:
                 "limit": limit,
                 "offset": offset,
             }
-
-    def _build_scoring_calculation(self, scoring: Dict[str, float]) -> str:
-        """Build SQL scoring calculation from scoring dict"""
-        calculations = []
-
-        if scoring.get("reception", 0) != 0:
-            calculations.append(f"COALESCE(p.rec_pred, 0) * {scoring['reception']}")
-
-        if scoring.get("rec_yd", 0) != 0:
-            calculations.append(f"COALESCE(p.rec_yds_pred, 0) * {scoring['rec_yd']}")
-
-        if scoring.get("rec_td", 0) != 0:
-            calculations.append(f"COALESCE(p.rec_td_pred, 0) * {scoring['rec_td']}")
-
-        if scoring.get("rush_yd", 0) != 0:
-            calculations.append(f"COALESCE(p.rush_yds_pred, 0) * {scoring['rush_yd']}")
-
-        if scoring.get("rush_td", 0) != 0:
-            calculations.append(f"COALESCE(p.rush_td_pred, 0) * {scoring['rush_td']}")
-
-        if scoring.get("pass_yd", 0) != 0:
-            calculations.append(f"COALESCE(p.pass_yds_pred, 0) * {scoring['pass_yd']}")
-
-        if scoring.get("pass_td", 0) != 0:
-            calculations.append(f"COALESCE(p.pass_td_pred, 0) * {scoring['pass_td']}")
-
-        if scoring.get("int", 0) != 0:
-            calculations.append(f"COALESCE(p.int_pred, 0) * {scoring['int']}")
-
-        if scoring.get("fumble", 0) != 0:
-            calculations.append(f"COALESCE(p.fumble_pred, 0) * {scoring['fumble']}")
-
-        if not calculations:
-            return "0"
-
-        return " + ".join(calculations)
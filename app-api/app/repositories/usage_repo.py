@@ -1,87 +1,90 @@
 from typing import Dict, List, Optional, Any
-import asyncpg
+from app.core.metrics import track_query
+from app.db import statements
 from app.db.async_session import get_raw_connection
+from app.db.statements import Statement
+
+# $3 is an int[] of weeks, or NULL for the whole season
+PLAYER_USAGE = Statement(
+    "usage.player",
+    """
+    WITH dedupe_players AS (
+        SELECT DISTINCT ON (player_id)
+            player_id, display_name, first_name, last_name
+        FROM dwh_staging.stg_players
+    ),
+    usage_data AS (
+        SELECT
+            season,
+            week,
+            player_id,
+            team,
+            position,
+            snap_pct,
+            route_pct,
+            target_share,
+            rush_share,
+            routes_run as routes,
+            targets,
+            rush_att
+        FROM dwh_intermediate.int_player_week_usage
+        WHERE season = $1
+            AND player_id = $2
+            AND ($3::int[] IS NULL OR week = ANY($3))
+    ),
+    proj_data AS (
+        SELECT
+            season,
+            week,
+            player_id,
+            proj_pts as proj,
+            low,
+            high
+        FROM dwh_marts.f_weekly_projection
+        WHERE season = $1
+            AND player_id = $2
+            AND scoring = 'ppr'
+            AND ($3::int[] IS NULL OR week = ANY($3))
+    )
+    SELECT
+        u.season,
+        u.week,
+        u.player_id,
+        COALESCE(
+            CASE WHEN pl.display_name != '' THEN pl.display_name
+            ELSE concat(pl.first_name, ' ', pl.last_name) END,
+            u.player_id
+        ) as name,
+        u.team,
+        u.position,
+        u.snap_pct,
+        u.route_pct,
+        u.target_share,
+        u.rush_share,
+        u.routes,
+        u.targets,
+        u.rush_att,
+        p.proj,
+        p.low,
+        p.high
+    FROM usage_data u
+    LEFT JOIN dedupe_players pl ON u.player_id = pl.player_id
+    LEFT JOIN proj_data p ON u.season = p.season
+        AND u.week = p.week
+        AND u.player_id = p.player_id
+    ORDER BY u.week
+    """,
+)
 
 
 class UsageRepository:
+    @track_query("usage")
     async def get_player_usage(
         self, season: int, player_id: str, weeks: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """Get usage data for a specific player"""
         async with get_raw_connection() as conn:
-            week_filter = ""
-            params = [season, player_id]
-
-            if weeks:
-                placeholders = ",".join(f"${i + 3}" for i in range(len(weeks)))
-                week_filter = f"AND week = ANY(ARRAY[{placeholders}])"
-                params.extend(weeks)
-
-            query = f"""
-                WITH dedupe_players AS (
-                    SELECT DISTINCT ON (player_id) 
-                        player_id, display_name, first_name, last_name
-                    FROM dwh_staging.stg_players
-                ),
-                usage_data AS (
-                    SELECT 
-                        season,
-                        week,
-                        player_id,
-                        team,
-                        position,
-                        snap_pct,
-                        route_pct,
-                        target_share,
-                        rush_share,
-                        routes_run as routes,
-                        targets,
-                        rush_att
-                    FROM dwh_intermediate.int_player_week_usage
-                    WHERE season = $1 
-                        AND player_id = $2
-                        {week_filter}
-                ),
-                proj_data AS (
-                    SELECT 
-                        season,
-                        week,
-                        player_id,
-                        proj_pts as proj,
-                        low,
-                        high
-                    FROM dwh_marts.f_weekly_projection
-                    WHERE season = $1 
-                        AND player_id = $2
-                        AND scoring = 'ppr'
-                        {week_filter}
-                )
-                SELECT 
-                    u.season,
-                    u.week,
-                    u.player_id,
-                    COALESCE(CASE WHEN pl.display_name != '' THEN pl.display_name ELSE concat(pl.first_name, ' ', pl.last_name) END, u.player_id) as name,
-                    u.team,
-                    u.position,
-                    u.snap_pct,
-                    u.route_pct,
-                    u.target_share,
-                    u.rush_share,
-                    u.routes,
-                    u.targets,
-                    u.rush_att,
-                    p.proj,
-                    p.low,
-                    p.high
-                FROM usage_data u
-                LEFT JOIN dedupe_players pl ON u.player_id = pl.player_id
-                LEFT JOIN proj_data p ON u.season = p.season 
-                    AND u.week = p.week 
-                    AND u.player_id = p.player_id
-                ORDER BY u.week
-            """
-
-            rows = await conn.fetch(query, *params)
+            rows = await statements.fetch(conn, PLAYER_USAGE, season, player_id, weeks or None)
 
             items = []
             player_name = None  # We'll get this from the first row
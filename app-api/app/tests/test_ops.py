@@ -3,10 +3,15 @@ import pytest
 
 from app.main import app
 
-client = TestClient(app)
 
+@pytest.fixture(scope="module")
+def client():
+    """One client (and event loop) for the module, so pooled DB connections stay usable."""
+    with TestClient(app) as test_client:
+        yield test_client
 
-def test_get_latest_manifest_empty():
+
+def test_get_latest_manifest_empty(client):
     """Test manifest endpoint when no data exists."""
     response = client.get("/v1/ops/ingest/manifest/latest")
 
@@ -20,7 +25,7 @@ def test_get_latest_manifest_empty():
     assert isinstance(data["total"], int)
 
 
-def test_get_latest_manifest_structure():
+def test_get_latest_manifest_structure(client):
     """Test that manifest response has correct structure."""
     response = client.get("/v1/ops/ingest/manifest/latest")
     assert response.status_code == 200
@@ -39,7 +44,7 @@ def test_get_latest_manifest_structure():
         assert "applied_at" in dataset
 
 
-def test_manifest_endpoint_error_handling():
+def test_manifest_endpoint_error_handling(client):
     """Test that manifest endpoint handles errors gracefully."""
     # This test would need database setup to properly test error conditions
     # For now, just verify the endpoint exists and returns valid JSON
@@ -49,3 +54,19 @@ def test_manifest_endpoint_error_handling():
     # Should always return valid JSON
     data = response.json()
     assert isinstance(data, dict)
+
+
+def test_ops_status_structure(client):
+    """Test that ops status reports dataset and mart freshness."""
+    response = client.get("/v1/ops/status")
+    assert response.status_code in [200, 503]
+
+    data = response.json()
+    if response.status_code == 200:
+        assert data["status"] == "ok"
+        assert "checked_at" in data
+        assert "last_ingest_at" in data
+        for dataset in data["datasets"]:
+            assert {"dataset", "last_applied_at", "age_seconds", "row_count"} <= set(dataset)
+        for mart in data["marts"]:
+            assert {"mart", "row_estimate", "built_at", "stale"} <= set(mart)
@@ -0,0 +1,272 @@
+"""
+Latency and throughput of the public API read paths against seeded marts.
+
+Seeds (or reuses) a scratch database with benchmarks.seed_marts, then drives each scenario
+at fixed concurrency and reports p50/p95/p99 latency and requests per second. By default
+the app runs in process with the response cache cleared before every request, so numbers
+reflect the database path; pass --base-url to load a running server instead (it must use
+the same DATABASE_URL and JWT_SECRET_KEY).
+
+Record a baseline on the release machine, then compare before each release; the exit
+status is 1 when any scenario's p95 or throughput regresses by more than --max-regression:
+
+    cd app-api && python -m benchmarks.api_load --write-baseline api_load_baseline.json
+    python -m benchmarks.api_load --baseline api_load_baseline.json --max-regression 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.seed_marts import DEFAULT_DATABASE_URL, SeedInfo, load_seed_info, seed
+
+# (method, path, json body, query params) for one request
+RequestSpec = Tuple[str, str, Optional[Dict[str, Any]], Dict[str, Any]]
+
+POSITIONS = [None, "QB", "RB", "WR", "TE"]
+SCORING_RULES = {
+    "pass_yds": 0.04, "pass_td": 4, "int": -2, "rush_yds": 0.1, "rush_td": 6,
+    "rec": 1, "rec_yds": 0.1, "rec_td": 6, "fumble": -2,
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[SeedInfo, random.Random], RequestSpec]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile in milliseconds."""
+        if not self.latencies:
+            return float("nan")
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1] * 1000
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "rps": round(len(self.latencies) / self.wall_seconds, 1) if self.wall_seconds else 0,
+        }
+
+
+def _projections(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    params = {"scoring": "ppr", "limit": 50, "offset": rng.choice([0, 0, 0, 50, 100])}
+    position = rng.choice(POSITIONS)
+    if position:
+        params["position"] = position
+    week = rng.randint(1, 18)
+    return "GET", f"/v1/projections/{info.last_season}/{week}", None, params
+
+
+def _ros(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    params = {"scoring": rng.choice(["ppr", "half_ppr"]), "limit": 50}
+    position = rng.choice(POSITIONS)
+    if position:
+        params["position"] = position
+    return "GET", f"/v1/ros/{info.last_season}", None, params
+
+
+def _usage(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    player_id = rng.choice(info.player_ids)
+    return "GET", f"/v1/usage/{info.last_season}/{player_id}", None, {}
+
+
+def _scoring_preview(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    scoring = dict(SCORING_RULES, rec=rng.choice([0.5, 1.0]))
+    body = {
+        "season": info.last_season,
+        "week": rng.randint(1, 18),
+        "scoring": scoring,
+        "filters": {"position": rng.choice(POSITIONS)},
+        "limit": 100,
+    }
+    return "POST", "/v1/scoring/preview", body, {}
+
+
+def _team_roster(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    return "GET", f"/teams/{info.team_id}/roster", None, {}
+
+
+SCENARIOS = [
+    Scenario("projections", _projections),
+    Scenario("ros", _ros),
+    Scenario("usage", _usage),
+    Scenario("scoring_preview", _scoring_preview),
+    Scenario("team_roster", _team_roster),
+]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    info: SeedInfo,
+    requests: int,
+    concurrency: int,
+    auth_header: Dict[str, str],
+    before_request: Optional[Callable[[], None]] = None,
+    seed_value: int = 7,
+) -> ScenarioResult:
+    rng = random.Random(seed_value)
+    specs = [scenario.build(info, rng) for _ in range(requests)]
+    result = ScenarioResult(scenario.name)
+    queue = iter(enumerate(specs))
+
+    async def worker():
+        for i, (method, path, body, params) in queue:
+            # Distinct client addresses so per-client rate limits do not throttle the run
+            client_ip = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+            headers = dict(auth_header, **{"X-Forwarded-For": client_ip})
+            if before_request is not None:
+                before_request()
+            start = time.perf_counter()
+            response = await client.request(
+                method, path, params=params, json=body, headers=headers
+            )
+            elapsed = time.perf_counter() - start
+            if response.status_code >= 400:
+                result.errors += 1
+                if result.errors == 1:
+                    print(f"  {scenario.name}: {response.status_code} {response.text[:200]}")
+                continue
+            result.latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_seconds = time.perf_counter() - start
+    return result
+
+
+def _configure_app_env(database_url: str):
+    """Point the in-process app at the benchmark database before it is imported."""
+    os.environ["DATABASE_URL"] = database_url.replace("postgresql://", "postgresql+psycopg://")
+    # ENV_NAME=local turns on SQL echo, which would dominate the timings
+    os.environ.setdefault("ENV_NAME", "bench")
+    os.environ.setdefault("LOOP_BLOCK_THRESHOLD_MS", "0")
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    info = None if args.reseed else await load_seed_info(args.database_url)
+    if info is None:
+        print(f"Seeding {args.database_url} ...")
+        info = await seed(args.database_url, players=args.players)
+
+    _configure_app_env(args.database_url)
+    from app.core.auth import AuthService
+    from app.core.cache import cache
+
+    auth_header = {"Authorization": f"Bearer {AuthService().create_access_token(info.user_id)}"}
+    before_request = None
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app.main import create_app
+
+        # Count handler exceptions as 500s instead of aborting the run
+        transport = httpx.ASGITransport(app=create_app(), raise_app_exceptions=False)
+        base_url = "http://bench"
+        if not args.warm_cache:
+            before_request = cache.memory_cache.clear
+
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        for scenario in selected:
+            # Warm connections, imports and plans before timing
+            await run_scenario(
+                client, scenario, info, args.concurrency, args.concurrency, auth_header,
+                before_request, seed_value=1,
+            )
+            result = await run_scenario(
+                client, scenario, info, args.requests, args.concurrency, auth_header,
+                before_request,
+            )
+            results[scenario.name] = result.summary()
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """Regressions beyond `tolerance` (fraction) in p95 latency or throughput."""
+    failures = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            failures.append(f"{name}: p95 {current['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            failures.append(f"{name}: {current['rps']} req/s vs baseline {base['rps']} req/s")
+        if current["errors"] > base.get("errors", 0):
+            failures.append(f"{name}: {current['errors']} errors")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL)
+    )
+    parser.add_argument("--base-url", help="load a running server instead of the app in process")
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenario", action="append", help="run only these (repeatable)")
+    parser.add_argument("--players", type=int, default=2500, help="players to seed")
+    parser.add_argument("--reseed", action="store_true", help="rebuild the seeded marts")
+    parser.add_argument("--warm-cache", action="store_true", help="keep the response cache")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--write-baseline", help="save these results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print(f"  {'scenario':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errors':>8}")
+    for name, s in results.items():
+        print(
+            f"  {name:<18}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}"
+            f"{s['rps']:>10}{s['errors']:>8}"
+        )
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        if failures:
+            print(f"Regressions beyond {args.max_regression:.0%}:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.max_regression:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
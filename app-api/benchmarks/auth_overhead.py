@@ -0,0 +1,103 @@
+"""
+Latency of the authenticated team endpoints with and without the users lookup.
+
+Runs the team list and roster endpoints in process against the seeded marts three ways:
+with the principal cache disabled (one users query per request, as before), with it
+enabled, and with authentication overridden entirely. The gap between the last two is
+what authentication still costs per request.
+
+    cd app-api && python -m benchmarks.auth_overhead --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+from typing import Dict
+
+import httpx
+
+from benchmarks.api_load import (
+    Scenario,
+    RequestSpec,
+    _configure_app_env,
+    _team_roster,
+    run_scenario,
+)
+from benchmarks.seed_marts import DEFAULT_DATABASE_URL, SeedInfo, load_seed_info, seed
+
+
+def _teams(info: SeedInfo, rng: random.Random) -> RequestSpec:
+    return "GET", "/teams", None, {}
+
+
+SCENARIOS = [Scenario("teams", _teams), Scenario("team_roster", _team_roster)]
+VARIANTS = ("users query", "cached principal", "auth overridden")
+
+
+async def run(args) -> Dict[str, Dict[str, Dict[str, float]]]:
+    info = await load_seed_info(args.database_url)
+    if info is None:
+        print(f"Seeding {args.database_url} ...")
+        info = await seed(args.database_url, players=args.players)
+
+    _configure_app_env(args.database_url)
+    from uuid import UUID
+
+    from app.core.auth import UserPrincipal, auth_service
+    from app.main import create_app
+
+    app = create_app()
+    auth_header = {"Authorization": f"Bearer {auth_service.create_access_token(info.user_id)}"}
+    ttl = auth_service.settings.user_cache_ttl_seconds
+    principal = UserPrincipal(UUID(info.user_id), "bench@example.com", "Bench")
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for variant in VARIANTS:
+            auth_service.principals.clear()
+            auth_service.settings.user_cache_ttl_seconds = 0 if variant == "users query" else ttl
+            if variant == "auth overridden":
+                app.dependency_overrides[auth_service.get_current_user] = lambda: principal
+            for scenario in SCENARIOS:
+                await run_scenario(
+                    client, scenario, info, args.concurrency, args.concurrency, auth_header,
+                    seed_value=1,
+                )
+                result = await run_scenario(
+                    client, scenario, info, args.requests, args.concurrency, auth_header
+                )
+                results.setdefault(scenario.name, {})[variant] = result.summary()
+            app.dependency_overrides.clear()
+    auth_service.settings.user_cache_ttl_seconds = ttl
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL)
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="timed requests per run")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--players", type=int, default=2500, help="players to seed")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{args.requests} requests per run, concurrency {args.concurrency}")
+    print(
+        f"  {'scenario':<14}{'variant':<20}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}"
+        f"{'errors':>8}"
+    )
+    for name, variants in results.items():
+        for variant, s in variants.items():
+            print(
+                f"  {name:<14}{variant:<20}{s['p50_ms']:>10}{s['p95_ms']:>10}"
+                f"{s['rps']:>10}{s['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold import time of the API (`import app.main`), from `python -X importtime`.
+
+Each run is a fresh interpreter; the report is the median over runs of the total and of
+the heaviest modules by cumulative time, so a new eager import of a heavy dependency
+shows up by name. The exit status is 1 when the median total exceeds --budget-ms:
+
+    cd app-api && python -m benchmarks.import_time --runs 7 --budget-ms 1200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# (cumulative microseconds, nesting depth) per module for one interpreter run
+ImportProfile = Dict[str, Tuple[int, int]]
+
+
+def profile_once(target: str) -> ImportProfile:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    profile: ImportProfile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile[name.strip()] = (int(cumulative), depth)
+    return profile
+
+
+def summarize(profiles: List[ImportProfile], top: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """Median total milliseconds and the `top` heaviest modules by median cumulative ms."""
+    totals = [
+        sum(us for us, depth in profile.values() if depth == 0) / 1000 for profile in profiles
+    ]
+    per_module: Dict[str, List[float]] = defaultdict(list)
+    for profile in profiles:
+        for name, (us, _) in profile.items():
+            per_module[name].append(us / 1000)
+    medians = [(name, statistics.median(ms)) for name, ms in per_module.items()]
+    medians.sort(key=lambda item: item[1], reverse=True)
+    return statistics.median(totals), medians[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", default="app.main", help="module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    parser.add_argument("--budget-ms", type=float, help="fail when the median total exceeds this")
+    args = parser.parse_args()
+
+    # One untimed run so .pyc files exist and the OS page cache is warm
+    profile_once(args.target)
+    total, heaviest = summarize([profile_once(args.target) for _ in range(args.runs)], args.top)
+
+    print(f"import {args.target}: median {total:.1f} ms over {args.runs} runs")
+    for name, ms in heaviest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"Over budget: {total:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Requests per second through the request-id/timing middleware, in process.
+
+Compares a bare app, the previous BaseHTTPMiddleware implementation with synchronous
+stdout logging, and the current pure-ASGI RequestIdMiddleware with queued logging.
+Logs go to /dev/null in every variant so the terminal is not the bottleneck.
+
+    cd app-api && python -m benchmarks.middleware_overhead --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.config
+import os
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core import logging as app_logging
+from app.core.middleware import RequestIdMiddleware
+
+logger = logging.getLogger("app.core.middleware")
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    """The middleware as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())[:8]
+        request.state.request_id = request_id
+
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Process-Time"] = str(round(process_time, 4))
+
+        logger.info(
+            f"Request {request_id}: {request.method} {request.url.path} "
+            f"- {response.status_code} - {process_time:.4f}s"
+        )
+
+        return response
+
+
+def configure_sync_logging():
+    """Logging as configured before records went through a queue."""
+    app_logging.stop_logging()
+    logging.config.dictConfig(app_logging.LOGGING_CONFIG)
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/players/{player_id}")
+    async def get_player(player_id: str):
+        return {"player_id": player_id, "name": "Test Player", "team": "MIN", "position": "WR"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Issue `requests` GETs with `concurrency` in flight; returns requests per second."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(requests))
+
+        async def worker():
+            for i in counter:
+                response = await client.get(f"/v1/players/{i % 500}")
+                response.raise_for_status()
+
+        # Warm up routing and connection state before timing
+        await asyncio.gather(*(client.get("/v1/players/warmup") for _ in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3, help="best of N rounds per variant")
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    for handler in app_logging.LOGGING_CONFIG["handlers"].values():
+        handler["stream"] = devnull
+
+    variants = [
+        ("no middleware", None, app_logging.configure_logging),
+        ("BaseHTTPMiddleware + sync logging", LegacyRequestIdMiddleware, configure_sync_logging),
+        ("pure ASGI + queued logging", RequestIdMiddleware, app_logging.configure_logging),
+    ]
+
+    results = {}
+    for label, middleware, setup_logging in variants:
+        setup_logging()
+        app = build_app(middleware)
+        results[label] = max(
+            asyncio.run(drive(app, args.requests, args.concurrency)) for _ in range(args.rounds)
+        )
+    app_logging.stop_logging()
+
+    baseline = results["no middleware"]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, best of {args.rounds}")
+    for label, rps in results.items():
+        print(f"  {label:<36} {rps:>9.0f} req/s  ({rps / baseline:.0%} of bare app)")
+
+
+if __name__ == "__main__":
+    main()
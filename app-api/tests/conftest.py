@@ -1,5 +1,6 @@
 import asyncio
 import pytest
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
@@ -32,3 +33,91 @@ async def async_client(app) -> AsyncGenerator[AsyncClient, None]:
     """Create async test client."""
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
+
+
+class FakeResult:
+    """Stands in for a SQLAlchemy result holding one row, scalars or mappings."""
+
+    def __init__(self, row=None, scalars=(), mappings=()):
+        self.row = row
+        self._scalars = list(scalars)
+        self._mappings = list(mappings)
+
+    def one_or_none(self):
+        return self.row
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._scalars
+
+    def mappings(self):
+        return self._mappings
+
+
+class FakeSession:
+    """Answers statements with its results in order, repeating the last; records parameters."""
+
+    def __init__(self, *results):
+        self.results = [FakeResult(**result) for result in results]
+        self.params = []
+
+    @property
+    def executed(self):
+        return len(self.params)
+
+    async def execute(self, statement, params=None):
+        self.params.append(params)
+        return self.results[min(len(self.params), len(self.results)) - 1]
+
+    async def commit(self):
+        pass
+
+
+class FakeConnection:
+    """Stands in for a pooled StatementConnection; records the SQL and arguments it runs."""
+
+    def __init__(self, rows=(), value=0):
+        self.rows = list(rows)
+        self.value = value
+        self.prepared_statements = set()
+        self.queries = []
+
+    async def fetch(self, sql, *args):
+        self.queries.append((sql, args))
+        return self.rows
+
+    async def fetchval(self, sql, *args):
+        self.queries.append((sql, args))
+        return self.value
+
+
+@pytest.fixture
+def fake_session():
+    """
+    Factory for fake AsyncSessions. Each positional argument describes one result, as
+    FakeResult keyword arguments: fake_session({"row": ...}, {"scalars": [...]}).
+    """
+    return FakeSession
+
+
+@pytest.fixture
+def raw_connection(monkeypatch):
+    """
+    Factory for fake raw connections. With `into`, that module's get_raw_connection is
+    patched to yield the connection, so its repositories run against it.
+    """
+
+    def make(rows=(), value=0, into=None):
+        conn = FakeConnection(rows, value)
+        if into is not None:
+
+            @asynccontextmanager
+            async def get_raw_connection():
+                yield conn
+
+            monkeypatch.setattr(into, "get_raw_connection", get_raw_connection)
+        return conn
+
+    return make
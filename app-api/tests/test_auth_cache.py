@@ -0,0 +1,61 @@
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.auth import AuthService, PrincipalCache, UserPrincipal
+
+
+def bearer(service, user_id):
+    token = service.create_access_token(str(user_id))
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_principal_cache_expires_and_evicts_oldest():
+    cache = PrincipalCache(max_entries=2)
+    a, b, c = (UserPrincipal(uuid4(), f"{n}@example.com", n) for n in "abc")
+
+    cache.set(a, ttl=60)
+    cache.set(b, ttl=60)
+    cache.set(c, ttl=60)
+    assert cache.get(a.id) is None
+    assert cache.get(c.id) == c
+
+    cache.set(b, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get(b.id) is None
+
+    cache.set(a, ttl=0)
+    assert cache.get(a.id) is None
+
+
+async def test_current_user_is_looked_up_once_per_ttl(fake_session):
+    service = AuthService()
+    user_id = uuid4()
+    session = fake_session({"row": (user_id, "a@example.com", "A", None)})
+    credentials = bearer(service, user_id)
+
+    first = await service.get_current_user(credentials, session)
+    second = await service.get_current_user(credentials, session)
+
+    assert first == second == UserPrincipal(user_id, "a@example.com", "A", None)
+    assert session.executed == 1
+
+
+async def test_logout_drops_cached_principal(fake_session):
+    service = AuthService()
+    user_id = uuid4()
+    service.principals.set(UserPrincipal(user_id, "a@example.com", "A"), ttl=60)
+
+    session = fake_session({"scalars": [user_id]})
+    assert await service.delete_refresh_token(session, "refresh-token")
+    assert service.principals.get(user_id) is None
+
+    # The next request goes back to the users table, which no longer has the user
+    missing = fake_session({"row": None})
+    with pytest.raises(HTTPException) as exc:
+        await service.get_current_user(bearer(service, user_id), missing)
+    assert exc.value.status_code == 401
+    assert missing.executed == 1
@@ -0,0 +1,129 @@
+import gzip
+import json
+import zlib
+from datetime import datetime, timedelta
+
+import brotli
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from app.core.cache import CacheEntry
+from app.core.compression import CompressionMiddleware, Compressor, negotiate
+
+LARGE = {
+    "items": [{"player_id": f"00-{i:07d}", "components": {"rec_pred": 4.1}} for i in range(200)]
+}
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse(LARGE)
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"status": "ok"})
+
+    @app.get("/precompressed")
+    async def precompressed():
+        body = gzip.compress(json.dumps(LARGE).encode())
+        return PlainTextResponse(body, headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(100):
+                yield f"{i},player-{i}\n".encode() * 20
+
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    return app
+
+
+def test_negotiate_honours_q_values_and_server_preference():
+    assert negotiate(None) == "identity"
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("gzip, deflate, br, zstd") == "zstd"
+    assert negotiate("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate("br;q=0, gzip;q=0") == "identity"
+    assert negotiate("*") == "zstd"
+    assert negotiate("deflate") == "identity"
+
+
+def test_streaming_compressor_output_decodes_incrementally():
+    """Each compress() call is flushed, so a client can decode what it has so far."""
+    for encoding, decompressor in (
+        ("gzip", lambda: zlib.decompressobj(31)),
+        ("zstd", lambda: zstandard.ZstdDecompressor().decompressobj()),
+    ):
+        compressor = Compressor(encoding)
+        d = decompressor()
+        assert d.decompress(compressor.compress(b"first chunk,")) == b"first chunk,"
+        assert d.decompress(compressor.compress(b"second")) == b"second"
+        d.decompress(compressor.finish())
+
+    br = Compressor("br")
+    body = br.compress(b"a" * 1000) + br.compress(b"b" * 1000) + br.finish()
+    assert brotli.decompress(body) == b"a" * 1000 + b"b" * 1000
+
+
+def test_middleware_compresses_negotiated_responses():
+    with TestClient(make_app()) as client:
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == LARGE
+
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+        assert small.json() == {"status": "ok"}
+
+        identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["vary"] == "Accept-Encoding"
+
+
+def test_middleware_leaves_precompressed_bodies_and_streams_exports():
+    with TestClient(make_app()) as client:
+        precompressed = client.get("/precompressed", headers={"Accept-Encoding": "zstd, gzip"})
+        assert precompressed.headers["content-encoding"] == "gzip"
+        assert precompressed.json() == LARGE
+
+        streamed = client.get("/stream", headers={"Accept-Encoding": "br"})
+        assert streamed.headers["content-encoding"] == "br"
+        assert "content-length" not in streamed.headers
+        assert streamed.text.count("\n") == 2000
+
+
+class Page(BaseModel):
+    items: list
+    total: int
+
+
+def request_with(accept_encoding):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_cache_entry_serializes_and_compresses_once_per_encoding():
+    data = {"items": LARGE["items"], "total": 200, "dropped": "not in the model"}
+    entry = CacheEntry(data, datetime.now() + timedelta(minutes=1))
+
+    first = entry.response(request_with("gzip"), Page)
+    assert first.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(first.body)) == {"items": LARGE["items"], "total": 200}
+    # Same bytes object on the next hit: nothing re-encoded
+    assert entry.response(request_with("gzip"), Page).body is first.body
+
+    plain = entry.response(request_with(None), Page)
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.headers["etag"] == first.headers["etag"]
@@ -0,0 +1,172 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.routers import players, ros
+from app.core.cache import cache
+from app.core.conditional import Validators, content_etag, data_versions, validators_for
+
+
+def request_with(**headers):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope)
+
+
+def load_builds(builds):
+    """Pretend ops.model_builds was just read."""
+    data_versions._builds = builds
+    data_versions._loaded_at = time.monotonic()
+
+
+async def test_etag_depends_on_version_and_params_only():
+    """Same version and parameters give the same tag; a rebuild or other params change it."""
+    built = datetime(2024, 9, 10, 12, 0, tzinfo=UTC)
+    load_builds({"f_weekly_projection": built, "stg_players": built - timedelta(days=1)})
+    try:
+        models = ("f_weekly_projection", "stg_players")
+        a = await validators_for(models, "/v1/projections/2024/1", {"limit": 50})
+        b = await validators_for(models, "/v1/projections/2024/1", {"limit": 50})
+        other = await validators_for(models, "/v1/projections/2024/1", {"limit": 25})
+
+        assert a.etag == b.etag
+        assert a.etag.startswith('W/"')
+        assert a.last_modified == built
+        assert other.etag != a.etag
+
+        load_builds({"f_weekly_projection": built + timedelta(hours=1), "stg_players": built})
+        rebuilt = await validators_for(models, "/v1/projections/2024/1", {"limit": 50})
+        assert rebuilt.etag != a.etag
+
+        # A model without a recorded build means no version at all
+        assert (await validators_for(("f_ros_projection",), "/v1/ros/2024")).etag is None
+    finally:
+        data_versions._builds = {}
+        data_versions.invalidate()
+
+
+def test_if_none_match_uses_weak_comparison():
+    """Strong or weak forms of the tag, lists and * all match."""
+    validators = Validators(etag='W/"abc"', last_modified=None)
+
+    assert validators.matches(request_with(if_none_match='"abc"'))
+    assert validators.matches(request_with(if_none_match='W/"xyz", W/"abc"'))
+    assert validators.matches(request_with(if_none_match="*"))
+    assert not validators.matches(request_with(if_none_match='"xyz"'))
+    assert not validators.matches(request_with())
+    assert not Validators().matches(request_with(if_none_match="*"))
+
+
+def test_if_modified_since_and_not_modified_headers():
+    """If-Modified-Since is honoured at second resolution; 304s carry the validators."""
+    built = datetime(2024, 9, 10, 12, 0, 0, 500000, tzinfo=UTC)
+    validators = Validators(etag='W/"abc"', last_modified=built)
+
+    assert validators.matches(request_with(if_modified_since="Tue, 10 Sep 2024 12:00:00 GMT"))
+    assert not validators.matches(request_with(if_modified_since="Tue, 10 Sep 2024 11:59:59 GMT"))
+    # If-None-Match takes precedence
+    assert not validators.matches(
+        request_with(if_none_match='"old"', if_modified_since="Tue, 10 Sep 2024 12:00:00 GMT")
+    )
+
+    response = validators.not_modified(request_with(), "public, max-age=60")
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["last-modified"] == "Tue, 10 Sep 2024 12:00:00 GMT"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.body == b""
+
+
+def test_content_etag_is_stable():
+    """Body digests ignore key order and do not depend on the process hash seed."""
+    assert content_etag({"a": 1, "b": [1, 2]}) == content_etag({"b": [1, 2], "a": 1})
+    assert content_etag({"a": 1}) == 'W/"bb6cb5c68df4652941caf652a366f2d8"'
+
+
+def test_rebuild_bypasses_response_cache_built_from_older_version(monkeypatch):
+    """After a rebuild the new ETag is only ever served with a body read from the new data."""
+    built = datetime(2024, 9, 10, 12, 0, tzinfo=UTC)
+    totals = iter([150.0, 175.0])
+
+    class Provider:
+        async def ros(self, **kwargs):
+            item = {
+                "player_id": "00-0030506",
+                "name": "Justin Jefferson",
+                "team": "MIN",
+                "position": "WR",
+                "scoring": kwargs["scoring"],
+                "proj_total": next(totals),
+                "low": 120.0,
+                "high": 200.0,
+            }
+            return {
+                "season": 2024,
+                "scoring": kwargs["scoring"],
+                "items": [item],
+                "total": 1,
+                "limit": kwargs["limit"],
+                "offset": kwargs["offset"],
+            }
+
+    monkeypatch.setattr(ros, "get_provider", lambda name: Provider())
+    app = FastAPI()
+    app.include_router(ros.router)
+    cache.clear()
+    load_builds({"f_ros_projection": built, "stg_players": built})
+    try:
+        with TestClient(app) as client:
+            before = client.get("/v1/ros/2024")
+            assert client.get("/v1/ros/2024").json() == before.json()
+
+            load_builds({"f_ros_projection": built + timedelta(hours=1), "stg_players": built})
+            after = client.get("/v1/ros/2024")
+            revalidated = client.get(
+                "/v1/ros/2024", headers={"If-None-Match": after.headers["etag"]}
+            )
+
+        assert after.headers["etag"] != before.headers["etag"]
+        assert before.json()["items"][0]["proj_total"] == 150.0
+        assert after.json()["items"][0]["proj_total"] == 175.0
+        assert revalidated.status_code == 304
+    finally:
+        cache.clear()
+        data_versions._builds = {}
+        data_versions.invalidate()
+
+
+def test_body_etag_is_honoured_without_data_version(monkeypatch):
+    """With no recorded builds the advertised body digest still earns a 304."""
+
+    async def list_players(**kwargs):
+        return {"items": [], "total": 0, "limit": kwargs["limit"], "offset": kwargs["offset"]}
+
+    monkeypatch.setattr(players.players_repo, "list_players", list_players)
+    app = FastAPI()
+    app.include_router(players.router)
+    cache.clear()
+    load_builds({})
+    try:
+        with TestClient(app) as client:
+            first = client.get("/v1/players")
+            revalidated = client.get(
+                "/v1/players", headers={"If-None-Match": first.headers["etag"]}
+            )
+            changed = client.get("/v1/players", headers={"If-None-Match": 'W/"other"'})
+    finally:
+        cache.clear()
+        data_versions.invalidate()
+
+    assert "last-modified" not in first.headers
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+    assert revalidated.content == b""
+    assert changed.status_code == 200
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import time
+from datetime import UTC, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.routers import export
+from app.core import rate_limit
+from app.core.conditional import data_versions
+from app.core.export import ENCODERS, export_response
+from app.core.rate_limit import MemoryRateLimitBackend
+
+COLUMNS = (("season", "int"), ("name", "text"), ("proj", "float"), ("components", "json"))
+BATCHES = [
+    [(2024, "A. Player", 12.5, '{"rec_pred": 4.1}'), (2024, 'B. "Quoted", Jr', None, None)],
+    [(2024, "C. Player", 3.0, "[]")],
+]
+
+
+def encode_all(fmt, batches=BATCHES):
+    encoder = ENCODERS[fmt](COLUMNS)
+    body = encoder.header()
+    for rows in batches:
+        body += encoder.encode(rows)
+    return body + encoder.finish()
+
+
+def test_csv_round_trip():
+    """Header first, quoting handled, NULLs empty, JSON kept as text."""
+    rows = list(csv.reader(io.StringIO(encode_all("csv").decode())))
+    assert rows[0] == ["season", "name", "proj", "components"]
+    assert rows[2] == ["2024", 'B. "Quoted", Jr', "", ""]
+    assert rows[1][3] == '{"rec_pred": 4.1}'
+    assert len(rows) == 4
+
+
+def test_ndjson_embeds_json_columns():
+    """One object per line; JSON columns are nested values, not strings."""
+    lines = encode_all("ndjson").decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 3
+    assert records[0]["components"] == {"rec_pred": 4.1}
+    assert records[1]["proj"] is None and records[1]["components"] is None
+    assert records[2]["components"] == []
+
+
+def test_arrow_and_parquet_round_trip():
+    """Chunks concatenate to a valid Arrow IPC stream and Parquet file with typed columns."""
+    table = pa.ipc.open_stream(encode_all("arrow")).read_all()
+    assert table.num_rows == 3
+    assert table.schema.field("season").type == pa.int64()
+    assert table.column("proj").to_pylist() == [12.5, None, 3.0]
+
+    parquet = pq.ParquetFile(io.BytesIO(encode_all("parquet")))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().equals(table)
+
+
+def test_empty_export_is_still_valid():
+    assert encode_all("csv", []) == b"season,name,proj,components\r\n"
+    assert pa.ipc.open_stream(encode_all("arrow", [])).read_all().num_rows == 0
+    assert pq.read_table(io.BytesIO(encode_all("parquet", []))).num_rows == 0
+
+
+async def test_failing_query_surfaces_before_streaming():
+    """Errors on the first batch become a 500 instead of a truncated 200."""
+    closed = []
+
+    async def failing():
+        try:
+            raise RuntimeError("relation does not exist")
+            yield
+        finally:
+            closed.append(True)
+
+    with pytest.raises(HTTPException) as exc:
+        await export_response(failing(), COLUMNS, "csv", "projections-2024")
+    assert exc.value.status_code == 500
+    assert closed == [True]
+
+
+def test_exports_and_304s_carry_rate_limit_headers(monkeypatch):
+    """Bulk clients can pace themselves against the export limit before hitting a 429."""
+    monkeypatch.setattr(rate_limit, "rate_limiter", MemoryRateLimitBackend())
+
+    async def stream_usage(**kwargs):
+        return
+        yield
+
+    monkeypatch.setattr(export.export_repo, "stream_usage", stream_usage)
+    app = FastAPI()
+    app.include_router(export.router)
+    built = datetime(2024, 9, 10, tzinfo=UTC)
+    data_versions._builds = {"int_player_week_usage": built, "stg_players": built}
+    data_versions._loaded_at = time.monotonic()
+    try:
+        with TestClient(app) as client:
+            full = client.get("/v1/export/usage/2024")
+            not_modified = client.get(
+                "/v1/export/usage/2024", headers={"If-None-Match": full.headers["etag"]}
+            )
+    finally:
+        data_versions._builds = {}
+        data_versions.invalidate()
+
+    assert full.status_code == 200
+    assert not_modified.status_code == 304
+    assert full.headers["RateLimit-Policy"] == "10;w=60"
+    assert full.headers["RateLimit-Remaining"] == "9"
+    assert not_modified.headers["RateLimit-Remaining"] == "8"
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.cache import Cache
+from app.core.metrics import CACHE_REQUESTS, DB_QUERY_LATENCY, DB_ROWS, track_query
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    for metric in metrics.REGISTRY:
+        metric.clear()
+    yield
+
+
+def test_render_prometheus_histogram_and_counter():
+    """Histograms render cumulative buckets, sum and count; counters one line per label set."""
+    histogram = metrics.Histogram("test_seconds", "Test histogram.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+    counter = metrics.Counter("test_total", "Test counter.", ("result",))
+    counter.inc("hit")
+    counter.inc("hit")
+
+    original = metrics.REGISTRY
+    metrics.REGISTRY = (histogram, counter)
+    try:
+        text = metrics.render_prometheus()
+    finally:
+        metrics.REGISTRY = original
+
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_seconds_count{route="/a"} 3' in text
+    assert 'test_total{result="hit"} 2' in text
+
+
+async def test_track_query_records_duration_and_rows():
+    """Repository methods report time and the number of items returned."""
+
+    class Repo:
+        @track_query("things")
+        async def list_things(self):
+            return {"items": [1, 2, 3], "total": 3}
+
+    assert (await Repo().list_things())["total"] == 3
+    assert DB_QUERY_LATENCY.snapshot()[("things", "list_things")]["count"] == 1
+    assert DB_ROWS.snapshot()[("things", "list_things")]["sum"] == 3
+
+
+async def test_cache_counts_hits_and_misses_per_namespace():
+    cache = Cache()
+    assert await cache.get("/v1/projections/2024/5", {}, "baseline") is None
+    await cache.set("/v1/projections/2024/5", {}, "baseline", {"items": []})
+    assert await cache.get("/v1/projections/2024/5", {}, "baseline") == {"items": []}
+    await cache.get("/v1/projections/bulk/2024/player/1", {}, "bulk_projections")
+
+    counts = CACHE_REQUESTS.snapshot()
+    assert counts[("projections", "miss")] == 1
+    assert counts[("projections", "hit")] == 1
+    assert counts[("projections_bulk", "miss")] == 1
+
+
+def test_metrics_endpoint(client: TestClient):
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"} 1' in (
+        response.text
+    )
+    assert 'http_response_size_bytes_count{method="GET",route="/health"} 1' in response.text
@@ -0,0 +1,50 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.metrics import REQUEST_LATENCY
+from app.core.middleware import RequestIdMiddleware, http_exception_handler
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int, request: Request):
+        return {"item_id": item_id, "request_id": request.state.request_id}
+
+    @app.get("/missing")
+    def missing():
+        raise HTTPException(status_code=404, detail="not here")
+
+    return app
+
+
+def test_request_id_and_process_time_headers():
+    """Every response carries the request id the handler saw and the processing time."""
+    client = TestClient(build_app())
+
+    response = client.get("/items/7")
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+    response = client.get("/missing")
+    assert response.status_code == 404
+    assert response.json()["error"]["req_id"] == response.headers["X-Request-ID"]
+
+
+def test_latency_histogram_uses_route_template():
+    """Latency is recorded per route template rather than per concrete path."""
+    REQUEST_LATENCY.clear()
+    client = TestClient(build_app())
+    for item_id in range(3):
+        client.get(f"/items/{item_id}")
+    client.get("/no-such-route")
+
+    snapshot = REQUEST_LATENCY.snapshot()
+    assert snapshot[("GET", "/items/{item_id}", "200")]["count"] == 3
+    assert snapshot[("GET", "<unmatched>", "404")]["count"] == 1
+    buckets = snapshot[("GET", "/items/{item_id}", "200")]["buckets"]
+    assert buckets[-1] == (float("inf"), 3)
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Form, Header, HTTPException
+from jose import jwk, jwt
+
+from app.core.auth import AuthService
+from app.core.oauth import (
+    JWKS_MIN_REFRESH_SECONDS,
+    close_oauth_client,
+    google_oauth,
+    init_oauth_client,
+)
+from app.core.settings import get_settings
+
+ISSUER = "https://accounts.example.test"
+CLIENT_ID = "client-123"
+
+
+def make_key(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, dict(public, kid=kid, alg="RS256", use="sig")
+
+
+def mock_provider(calls, claims, signing_pem, kid="k1", keys=()):
+    """The discovery, JWKS, token and userinfo endpoints of an OpenID provider."""
+    app = FastAPI()
+
+    @app.get("/.well-known/openid-configuration")
+    async def discovery():
+        calls["discovery"] += 1
+        return {
+            "issuer": ISSUER,
+            "token_endpoint": "http://idp/token",
+            "userinfo_endpoint": "http://idp/userinfo",
+            "jwks_uri": "http://idp/jwks",
+        }
+
+    @app.get("/jwks")
+    async def jwks():
+        calls["jwks"] += 1
+        return {"keys": list(keys)}
+
+    @app.post("/token")
+    async def token(code: str = Form(...)):
+        calls["token"] += 1
+        if code == "bad":
+            raise HTTPException(400, "invalid_grant")
+        now = int(time.time())
+        payload = dict(claims, iss=ISSUER, aud=CLIENT_ID, iat=now, exp=now + 300)
+        id_token = jwt.encode(payload, signing_pem, algorithm="RS256", headers={"kid": kid})
+        return {"access_token": "at-1", "id_token": id_token}
+
+    @app.get("/userinfo")
+    async def userinfo(authorization: str = Header(None)):
+        calls["userinfo"] += 1
+        assert authorization == "Bearer at-1"
+        return {"sub": "g-42", "email": "a@example.com", "name": "From Userinfo"}
+
+    return app
+
+
+@pytest.fixture
+async def provider(monkeypatch):
+    settings = get_settings()
+    discovery_url = "http://idp/.well-known/openid-configuration"
+    monkeypatch.setattr(settings, "google_discovery_url", discovery_url)
+    monkeypatch.setattr(settings, "google_client_id", CLIENT_ID)
+
+    async def start(**kwargs):
+        calls = Counter()
+        await init_oauth_client(httpx.ASGITransport(app=mock_provider(calls, **kwargs)))
+        return calls
+
+    yield start
+    await close_oauth_client()
+
+
+async def test_login_burst_verifies_id_token_with_cached_metadata(provider):
+    pem, public = make_key("k1")
+    claims = {"sub": "g-42", "email": "a@example.com", "name": "A", "picture": "p.png"}
+    calls = await provider(claims=claims, signing_pem=pem, keys=[public])
+
+    service = AuthService()
+    users = await asyncio.gather(
+        *(service.exchange_google_code("c", "http://app/") for _ in range(10))
+    )
+
+    assert {(u.id, u.email, u.name, u.picture) for u in users} == {
+        ("g-42", "a@example.com", "A", "p.png")
+    }
+    assert calls == Counter(discovery=1, jwks=1, token=10)
+
+
+async def test_falls_back_to_userinfo_without_profile_claims(provider):
+    pem, public = make_key("k1")
+    claims = {"sub": "g-42", "email": "a@example.com"}
+    calls = await provider(claims=claims, signing_pem=pem, keys=[public])
+
+    user = await AuthService().exchange_google_code("c", "http://app/")
+
+    assert user.name == "From Userinfo"
+    assert calls["userinfo"] == 1
+
+
+async def test_rejected_code_and_untrusted_token(provider):
+    pem, public = make_key("k1")
+    forged_pem, _ = make_key("k1")
+    calls = await provider(
+        claims={"sub": "g-42", "email": "a@example.com", "name": "A"},
+        signing_pem=forged_pem,
+        keys=[public],
+    )
+    service = AuthService()
+
+    assert await service.exchange_google_code("bad", "http://app/") is None
+
+    # A bad signature is not trusted; the access token still resolves the user via userinfo
+    user = await service.exchange_google_code("c", "http://app/")
+    assert user.name == "From Userinfo"
+
+    # An unknown key id refetches the key set, at most once per refresh interval
+    assert await google_oauth.signing_key("rotated") is None
+    assert calls["jwks"] == 1
+    google_oauth._keys_fetched -= JWKS_MIN_REFRESH_SECONDS
+    assert await google_oauth.signing_key("rotated") is None
+    assert await google_oauth.signing_key("rotated") is None
+    assert calls["jwks"] == 2
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.auth import auth_service
+from app.core.profiling import LoopBlockDetector, profile_event_loop
+
+
+def hold_the_loop(seconds):
+    time.sleep(seconds)
+
+
+async def test_loop_block_detector_logs_blocking_stack(caplog):
+    """A synchronous call on the loop is reported with its duration and the culprit frame."""
+    # configure_logging() stops app.* records from propagating to caplog's root handler
+    profiling_logger = logging.getLogger("app.core.profiling")
+    profiling_logger.addHandler(caplog.handler)
+    detector = LoopBlockDetector(threshold=0.05)
+    detector.start()
+    try:
+        await asyncio.sleep(0.05)
+        hold_the_loop(0.25)
+        await asyncio.sleep(0.1)
+    finally:
+        await detector.stop()
+        profiling_logger.removeHandler(caplog.handler)
+
+    records = [r for r in caplog.records if r.getMessage() == "event loop blocked"]
+    assert len(records) == 1
+    assert records[0].blocked_ms >= 150
+    assert records[0].stack.endswith(":hold_the_loop")
+
+
+async def test_profile_event_loop_returns_collapsed_stacks():
+    """Each line is a ';'-joined stack followed by its sample count."""
+
+    async def busy():
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            # Longer than the GIL switch interval, so the sampler thread can see it
+            sum(i * i for i in range(300000))
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(busy())
+    collapsed = await profile_event_loop(0.3, interval=0.002)
+    await task
+
+    lines = collapsed.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert " " not in stack
+    assert any(":test_profile_event_loop_returns_collapsed_stacks.<locals>.busy" in line
+               for line in lines)
+
+
+def test_profile_endpoint_requires_admin(app):
+    """Without credentials the endpoint is rejected; an admin gets collapsed stacks."""
+    client = TestClient(app)
+    assert client.get("/v1/ops/profile?seconds=0.1").status_code in (401, 403)
+
+    app.dependency_overrides[auth_service.get_admin_user] = lambda: object()
+    response = client.get("/v1/ops/profile?seconds=0.1")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    assert client.get("/v1/ops/profile?seconds=3600").status_code == 400
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.auth import auth_service
+from app.db.query_log import QueryRecorder, fingerprint, normalize_query
+
+
+def logged(query, args=(), elapsed=0.001, exception=None):
+    """Stand-in for asyncpg's LoggedQuery record."""
+    return SimpleNamespace(query=query, args=args, elapsed=elapsed, exception=exception)
+
+
+def test_normalize_query_replaces_literals_and_keeps_placeholders():
+    """Inline literals collapse to ?, $n placeholders and identifiers are kept."""
+    a = normalize_query("SELECT *\n  FROM t2 WHERE season = 2024 AND team = 'MIN' AND id = $1")
+    b = normalize_query("SELECT * FROM t2 WHERE season = 2023 AND team = 'O''Hare' AND id = $1")
+
+    assert a == "SELECT * FROM t2 WHERE season = ? AND team = ? AND id = $1"
+    assert a == b
+    assert fingerprint(a) == fingerprint(b)
+    assert normalize_query("WHERE id IN (1, 2, 3)") == normalize_query("WHERE id IN (4)")
+
+
+def test_recorder_aggregates_by_fingerprint():
+    """Calls with different literals share stats; parameter types are kept, values are not."""
+    recorder = QueryRecorder()
+    recorder.record(logged("SELECT * FROM p WHERE week = 1 AND id = $1", ("abc",), 0.002))
+    recorder.record(logged("SELECT * FROM p WHERE week = 2 AND id = $1", (7,), 0.004))
+    recorder.record(logged("SELECT 1", (), 0.001, exception=RuntimeError()))
+
+    top = recorder.top()
+    assert [s["calls"] for s in top] == [2, 1]
+    assert top[0]["total_ms"] == pytest.approx(6.0)
+    assert top[0]["max_ms"] == pytest.approx(4.0)
+    assert top[0]["params_shapes"] == [["int"], ["str"]]
+    assert "abc" not in str(top)
+    assert top[1]["errors"] == 1
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("SELECT * FROM mart.f_weekly_projection", True),
+        ("  with x AS (SELECT 1) SELECT * FROM x", True),
+        ("WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x", False),
+        ("UPDATE ops.rate_limit_state SET tat = 0", False),
+        ("", False),
+    ],
+)
+def test_only_read_only_queries_are_explained(query, expected):
+    """EXPLAIN ANALYZE executes the statement, so writes must never be sampled."""
+    assert QueryRecorder._explainable(query) is expected
+
+
+def test_slow_queries_endpoint_requires_admin(app, monkeypatch):
+    """Query text and EXPLAIN plans are only served to admins."""
+
+    async def no_samples(session, limit, fingerprint):
+        return []
+
+    monkeypatch.setattr(routes, "list_slow_queries", no_samples)
+    client = TestClient(app)
+    assert client.get("/v1/ops/queries/slow").status_code in (401, 403)
+
+    app.dependency_overrides[auth_service.get_admin_user] = lambda: object()
+    response = client.get("/v1/ops/queries/slow")
+    assert response.status_code == 200
+    assert response.json()["samples"] == []
@@ -0,0 +1,127 @@
+import time
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.routers import players
+from app.core import rate_limit
+from app.core.cache import cache
+from app.core.conditional import data_versions
+from app.core.middleware import http_exception_handler
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter, RateLimitPolicy, gcra_decide
+
+
+def test_gcra_allows_burst_then_rejects():
+    """A fresh key gets `times` requests at once, then must wait one emission interval."""
+    policy = RateLimitPolicy(times=3, seconds=60)
+    tat = None
+    remaining = []
+    for _ in range(3):
+        decision, tat = gcra_decide(tat, 0.0, policy)
+        assert decision.allowed
+        remaining.append(decision.remaining)
+    assert remaining == [2, 1, 0]
+
+    decision, tat_after = gcra_decide(tat, 0.0, policy)
+    assert not decision.allowed
+    assert tat_after == tat
+    assert decision.retry_after == pytest.approx(20.0)
+
+    decision, _ = gcra_decide(tat, 20.0, policy)
+    assert decision.allowed
+
+
+async def test_memory_backend_keys_routes_independently():
+    """Exhausting one route's limit does not affect another route for the same client."""
+    backend = MemoryRateLimitBackend()
+    strict = RateLimitPolicy(times=2, seconds=60)
+    bulk = RateLimitPolicy(times=5, seconds=60)
+
+    assert (await backend.hit(("POST /a", "1.2.3.4"), strict, now=0.0)).allowed
+    assert (await backend.hit(("POST /a", "1.2.3.4"), strict, now=0.0)).allowed
+    assert not (await backend.hit(("POST /a", "1.2.3.4"), strict, now=0.0)).allowed
+
+    decision = await backend.hit(("GET /b", "1.2.3.4"), bulk, now=0.0)
+    assert decision.allowed
+    assert decision.remaining == 4
+    assert (await backend.hit(("POST /a", "5.6.7.8"), strict, now=0.0)).allowed
+
+
+async def test_memory_backend_expires_idle_keys():
+    """Keys are dropped once their bucket has refilled."""
+    backend = MemoryRateLimitBackend()
+    policy = RateLimitPolicy(times=10, seconds=10)
+    for i in range(100):
+        await backend.hit(("GET /x", f"client-{i}"), policy, now=0.0)
+    assert len(backend.buckets) == 100
+
+    await backend.hit(("GET /x", "late"), policy, now=5.0)
+    assert set(backend.buckets) == {("GET /x", "late")}
+
+
+def test_rate_limiter_dependency_headers(monkeypatch):
+    """Routes carry their own policy and responses expose RateLimit-* headers."""
+    monkeypatch.setattr(rate_limit, "rate_limiter", MemoryRateLimitBackend())
+
+    app = FastAPI()
+    app.add_exception_handler(HTTPException, http_exception_handler)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int, _: bool = Depends(RateLimiter(times=2, seconds=60))):
+        return {"item_id": item_id}
+
+    @app.get("/bulk")
+    def get_bulk(_: bool = Depends(RateLimiter(times=120, seconds=60))):
+        return {"ok": True}
+
+    client = TestClient(app)
+
+    response = client.get("/items/1")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "1"
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+
+    # Different path parameters share the route's bucket
+    assert client.get("/items/2").status_code == 200
+    response = client.get("/items/3")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert response.headers["RateLimit-Remaining"] == "0"
+
+    response = client.get("/bulk")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "120"
+    assert response.headers["RateLimit-Remaining"] == "119"
+
+
+def test_cached_and_not_modified_responses_carry_rate_limit_headers(monkeypatch):
+    """Routes that build their own Response (cache entries, 304s) keep the RateLimit-* headers."""
+    monkeypatch.setattr(rate_limit, "rate_limiter", MemoryRateLimitBackend())
+
+    async def list_players(**kwargs):
+        return {"items": [], "total": 0, "limit": kwargs["limit"], "offset": kwargs["offset"]}
+
+    monkeypatch.setattr(players.players_repo, "list_players", list_players)
+    app = FastAPI()
+    app.include_router(players.router)
+    cache.clear()
+    data_versions._builds = {"stg_players": datetime(2024, 9, 10, tzinfo=UTC)}
+    data_versions._loaded_at = time.monotonic()
+    try:
+        with TestClient(app) as client:
+            miss = client.get("/v1/players")
+            hit = client.get("/v1/players")
+            not_modified = client.get("/v1/players", headers={"If-None-Match": hit.headers["etag"]})
+    finally:
+        cache.clear()
+        data_versions._builds = {}
+        data_versions.invalidate()
+
+    assert not_modified.status_code == 304
+    remaining = [r.headers["RateLimit-Remaining"] for r in (miss, hit, not_modified)]
+    assert remaining == ["59", "58", "57"]
+    assert hit.headers["RateLimit-Policy"] == "60;w=60"
+    assert not_modified.headers["RateLimit-Limit"] == "60"
@@ -0,0 +1,43 @@
+from app.api.models import ROSList
+from app.repositories import projections_repo
+from app.repositories.projections_repo import ProjectionsRepository
+
+ROW = {
+    "player_id": "00-0030506",
+    "name": "Justin Jefferson",
+    "team": "MIN",
+    "position": "WR",
+    "scoring": "ppr",
+    "proj_total": 52.5,
+    "low": 40.1,
+    "high": 64.9,
+}
+
+
+async def list_ros(raw_connection, row, per_week):
+    conn = raw_connection(rows=[row], value=1, into=projections_repo)
+    result = await ProjectionsRepository().list_ros_projections(2024, "ppr", per_week=per_week)
+    sql, _ = conn.queries[-1]
+    return result, sql
+
+
+async def test_columns_format_returns_parallel_arrays(raw_connection):
+    row = dict(ROW, per_week_weeks=[10, 11, 12], per_week_proj=[17.5, 0.0, 35.0])
+    result, sql = await list_ros(raw_connection, row, "columns")
+
+    assert "AS per_week_weeks" in sql and "AS per_week_proj" in sql
+    item = ROSList.model_validate(result).items[0]
+    assert item.per_week.weeks == [10, 11, 12]
+    assert item.per_week.proj == [17.5, 0.0, 35.0]
+    assert item.per_week_json is None
+
+
+async def test_objects_format_is_unchanged_and_none_skips_the_breakdown(raw_connection):
+    row = dict(ROW, per_week_json='[{"week": 10, "proj": 17.5}]')
+    result, sql = await list_ros(raw_connection, row, "objects")
+    assert result["items"][0]["per_week_json"] == [{"week": 10, "proj": 17.5}]
+    assert "per_week" not in result["items"][0]
+
+    result, sql = await list_ros(raw_connection, dict(ROW), "none")
+    assert "per_week" not in sql
+    assert ROSList.model_validate(result).items[0].per_week_json is None
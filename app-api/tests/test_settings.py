@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+from app.core.cache import Cache
+from app.core.settings import Settings, get_settings
+
+
+def test_namespace_cache_ttls_fall_back_to_the_default(monkeypatch):
+    monkeypatch.setenv("API_CACHE_TTL_SECONDS", "900")
+    monkeypatch.setenv("CACHE_NAMESPACE_TTL_SECONDS", "ros=600, usage=3600")
+    settings = Settings()
+
+    assert settings.cache_ttl_for("ros") == 600
+    assert settings.cache_ttl_for("usage") == 3600
+    assert settings.cache_ttl_for("projections") == 900
+
+
+def test_pool_knobs_size_the_connection_budget(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "12")
+    monkeypatch.setenv("DB_RAW_POOL_MAX_SIZE", "8")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    assert Settings().db_connection_budget == 80
+
+
+async def test_cache_entries_expire_per_namespace(monkeypatch):
+    monkeypatch.setattr(get_settings(), "cache_namespace_ttl_seconds", {"ros": 60})
+    cache = Cache()
+
+    ros = await cache.set("/v1/ros/2024", {}, "baseline", {"items": []})
+    weekly = await cache.set("/v1/projections/2024/1", {}, "baseline", {"items": []})
+
+    now = datetime.now()
+    assert ros.expires - now < timedelta(seconds=61)
+    assert weekly.expires - now > timedelta(seconds=600)
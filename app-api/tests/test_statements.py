@@ -0,0 +1,36 @@
+from app.core.metrics import DB_PREPARED_STATEMENTS
+from app.core.settings import get_settings
+from app.db import statements
+from app.db.statements import Statement
+from app.repositories import projections_repo
+from app.repositories.projections_repo import ProjectionsRepository
+
+
+async def test_filter_combinations_share_one_statement_text(raw_connection):
+    conn = raw_connection(into=projections_repo)
+    repo = ProjectionsRepository()
+    await repo.list_weekly_projections(2024, 10, "ppr")
+    await repo.list_weekly_projections(2024, 10, "ppr", position="rb", team="kc")
+    await repo.list_weekly_projections(2024, 10, "ppr", search="mahomes")
+    await repo.list_weekly_projections(2024, 10, "ppr", search="00-0033873", limit=10)
+
+    assert len({sql for sql, _ in conn.queries}) == 2
+    counts = [args for sql, args in conn.queries if sql == projections_repo.WEEKLY_COUNT.sql]
+    assert counts[1][3:] == ("RB", "KC", None, None)
+    assert counts[2][3:] == (None, None, None, "%mahomes%")
+    assert counts[3][3:] == (None, None, "00-0033873", None)
+
+
+async def test_counts_prepare_once_per_connection(raw_connection, monkeypatch):
+    DB_PREPARED_STATEMENTS.clear()
+    statement = Statement("test.one", "SELECT $1::int")
+    first, second = raw_connection(), raw_connection()
+
+    for conn in (first, first, first, second):
+        await statements.fetch(conn, statement, 1)
+
+    assert DB_PREPARED_STATEMENTS.snapshot() == {("test.one", "miss"): 2, ("test.one", "hit"): 2}
+
+    monkeypatch.setattr(get_settings(), "db_statement_cache_size", 0)
+    assert await statements.fetchval(first, statement, 1) == 0
+    assert DB_PREPARED_STATEMENTS.snapshot()[("test.one", "uncached")] == 1
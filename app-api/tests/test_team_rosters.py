@@ -0,0 +1,68 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.api.routers.teams import get_user_team_rosters, router
+from app.core.auth import UserPrincipal
+
+
+def roster_player(player_id, index):
+    return SimpleNamespace(
+        player_id=player_id,
+        roster_slot={"type": "bench", "position": None, "index": index},
+        added_at=datetime(2024, 9, 1, tzinfo=UTC),
+    )
+
+
+def hydrated_row(player_id, scoring, proj):
+    return {
+        "player_id": player_id,
+        "name": player_id.title(),
+        "team": None,
+        "position": "WR",
+        "scoring": scoring,
+        "proj_pts": proj,
+        "low": proj - 5,
+        "high": proj + 5,
+        "season": 2024,
+        "week": 10,
+    }
+
+
+async def test_rosters_hydrate_shared_players_once_per_scoring(fake_session):
+    ppr = SimpleNamespace(
+        id=uuid4(),
+        scoring_system="ppr",
+        roster_players=[roster_player("jefferson", 1), roster_player("lamb", 2)],
+    )
+    standard = SimpleNamespace(
+        id=uuid4(), scoring_system="standard", roster_players=[roster_player("jefferson", 1)]
+    )
+    session = fake_session(
+        {"scalars": [ppr, standard]},
+        {
+            "mappings": [
+                hydrated_row("jefferson", "ppr", 20.0),
+                hydrated_row("jefferson", "standard", 14.0),
+                hydrated_row("lamb", "ppr", 18.0),
+            ]
+        },
+    )
+    user = UserPrincipal(id=uuid4(), email="a@example.com", name="A", avatar_url=None)
+
+    rosters = await get_user_team_rosters(current_user=user, session=session)
+
+    # Teams, then one hydration query over the distinct players
+    assert len(session.params) == 2
+    assert session.params[1] == {
+        "player_ids": ["jefferson", "lamb"],
+        "scorings": ["ppr", "standard"],
+    }
+    assert [r.team_id for r in rosters] == [str(ppr.id), str(standard.id)]
+    assert [p.player_info["projection"]["proj_pts"] for p in rosters[0].players] == [20.0, 18.0]
+    assert rosters[1].players[0].player_info["projection"]["proj_pts"] == 14.0
+
+
+def test_rosters_route_is_matched_before_team_id():
+    get_paths = [r.path for r in router.routes if "GET" in r.methods]
+    assert get_paths.index("/teams/rosters") < get_paths.index("/teams/{team_id}")
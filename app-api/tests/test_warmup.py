@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI, Request, Response
+
+from app.api.routes import readiness_check
+from app.core import warmup
+
+
+def test_importing_the_app_defers_auth_and_http_clients():
+    """jose and httpx load in the lifespan, not when the app module is imported."""
+    code = "import sys, app.main; print(sorted({'httpx', 'jose'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+async def test_failed_step_does_not_stop_warmup(monkeypatch):
+    ran = []
+
+    async def broken():
+        raise ConnectionRefusedError("database is starting")
+
+    async def ok():
+        ran.append("ok")
+
+    monkeypatch.setattr(warmup, "STEPS", (("db_pool", broken), ("data_versions", ok)))
+    timings = await warmup.warm_up()
+
+    assert ran == ["ok"]
+    assert set(timings) == {"db_pool", "data_versions"}
+
+
+async def test_cache_warmup_requests_hot_slices_then_marks_ready(monkeypatch):
+    app = FastAPI()
+    seen = []
+
+    @app.get("/v1/{resource}/{season}")
+    @app.get("/v1/{resource}/{season}/{week}")
+    async def slice(request: Request):
+        seen.append(str(request.url.path) + "?" + request.url.query)
+        return {"items": []}
+
+    async def current_week():
+        return 2025, 6
+
+    monkeypatch.setattr(warmup, "_current_week", current_week)
+    warmup.readiness.reset()
+    response = Response()
+    await readiness_check(response)
+    assert response.status_code == 503
+
+    await warmup.warm_caches(app)
+
+    assert sorted(seen) == sorted(warmup.hot_paths(2025, 6))
+    assert len(seen) == 6
+    assert "/v1/projections/2025/6?scoring=half_ppr" in seen
+    # Same query as the web ROS page, so the warmed entry is the one it hits
+    assert "/v1/ros/2025?scoring=ppr&per_week=none" in seen
+    assert await readiness_check(Response()) == {"status": "ready", "warmed": 6}
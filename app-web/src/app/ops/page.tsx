@@ -4,38 +4,56 @@ import { useEffect, useState } from 'react'
 import Link from 'next/link'
 import { Card } from '@/components/Card'
 
-interface ManifestRecord {
+interface DatasetStatus {
   dataset: string
-  partition: any
+  latest_partition: any
   row_count: number
-  applied_at: string
+  partitions: number
+  last_applied_at: string
+  age_seconds: number
 }
 
-interface ManifestResponse {
-  datasets: ManifestRecord[]
-  total: number
+interface MartStatus {
+  mart: string
+  row_estimate: number
+  built_at: string | null
+  stale: boolean
 }
 
+interface OpsStatusResponse {
+  status: string
+  checked_at: string
+  last_ingest_at: string | null
+  datasets: DatasetStatus[]
+  marts: MartStatus[]
+}
+
+// /v1/ops/status is a single cheap query, safe to poll
+const POLL_INTERVAL_MS = 30000
+
 export default function OpsPage() {
-  const [manifest, setManifest] = useState<ManifestResponse | null>(null)
+  const [status, setStatus] = useState<OpsStatusResponse | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    fetchManifest()
+    fetchStatus()
+    const interval = setInterval(fetchStatus, POLL_INTERVAL_MS)
+    return () => clearInterval(interval)
   }, [])
 
-  const fetchManifest = async () => {
+  const fetchStatus = async () => {
     try {
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const response = await fetch(`${apiUrl}/v1/ops/ingest/manifest/latest`)
+      const response = await fetch(`${apiUrl}/v1/ops/status`)
 
       if (!response.ok) {
         throw new Error(`HTTP ${response.status}`)
       }
 
       const data = await response.json()
-      setManifest(data)
+      setStatus(data)
+      setError(null)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch data')
     } finally {
@@ -52,8 +70,14 @@ export default function OpsPage() {
     return String(partition)
   }
 
-  const formatDate = (dateStr: string) => {
-    return new Date(dateStr).toLocaleString()
+  const formatDate = (dateStr: string | null) => {
+    return dateStr ? new Date(dateStr).toLocaleString() : 'Never'
+  }
+
+  const formatAge = (seconds: number) => {
+    if (seconds < 3600) return `${Math.floor(seconds / 60)}m ago`
+    if (seconds < 86400) return `${Math.floor(seconds / 3600)}h ago`
+    return `${Math.floor(seconds / 86400)}d ago`
   }
 
   return (
@@ -72,7 +96,7 @@ export default function OpsPage() {
 
         {loading && (
           <Card>
-            <p className="text-gray-600">Loading manifest data...</p>
+            <p className="text-gray-600">Loading ops status...</p>
           </Card>
         )}
 
@@ -82,7 +106,7 @@ export default function OpsPage() {
               <h2 className="text-lg font-semibold mb-2">Error</h2>
               <p>{error}</p>
               <button
-                onClick={fetchManifest}
+                onClick={fetchStatus}
                 className="mt-4 bg-blue-600 text-white px-4 py-2 rounded hover:bg-blue-700"
               >
                 Retry
@@ -91,47 +115,93 @@ export default function OpsPage() {
           </Card>
         )}
 
-        {manifest && !loading && (
+        {status && !loading && (
           <div>
             <div className="mb-4">
               <Card>
                 <h2 className="text-xl font-semibold mb-2">Summary</h2>
-                <p className="text-gray-600">{manifest.total} datasets with ingested data</p>
+                <p className="text-gray-600">
+                  {status.datasets.length} datasets with ingested data, last ingest{' '}
+                  {formatDate(status.last_ingest_at)}
+                </p>
+                <p className="text-gray-500 text-sm">Checked {formatDate(status.checked_at)}</p>
               </Card>
             </div>
 
-            {manifest.datasets.length > 0 ? (
+            {status.datasets.length > 0 ? (
+              <div className="mb-4">
+                <Card>
+                  <h2 className="text-xl font-semibold mb-4">Dataset Freshness</h2>
+                  <div className="overflow-x-auto">
+                    <table className="w-full text-sm text-left">
+                      <thead className="bg-gray-50">
+                        <tr>
+                          <th className="px-4 py-2 font-medium">Dataset</th>
+                          <th className="px-4 py-2 font-medium">Latest Partition</th>
+                          <th className="px-4 py-2 font-medium">Partitions</th>
+                          <th className="px-4 py-2 font-medium">Rows</th>
+                          <th className="px-4 py-2 font-medium">Last Applied</th>
+                        </tr>
+                      </thead>
+                      <tbody>
+                        {status.datasets.map((record) => (
+                          <tr key={record.dataset} className="border-t">
+                            <td className="px-4 py-2 font-medium">{record.dataset}</td>
+                            <td className="px-4 py-2 font-mono text-sm">
+                              {formatPartition(record.latest_partition)}
+                            </td>
+                            <td className="px-4 py-2">{record.partitions}</td>
+                            <td className="px-4 py-2">{record.row_count.toLocaleString()}</td>
+                            <td className="px-4 py-2" title={formatDate(record.last_applied_at)}>
+                              {formatAge(record.age_seconds)}
+                            </td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  </div>
+                </Card>
+              </div>
+            ) : (
+              <div className="mb-4">
+                <Card>
+                  <p className="text-gray-600">No ingested data found</p>
+                </Card>
+              </div>
+            )}
+
+            {status.marts.length > 0 && (
               <Card>
-                <h2 className="text-xl font-semibold mb-4">Dataset Freshness</h2>
+                <h2 className="text-xl font-semibold mb-4">Mart Freshness</h2>
                 <div className="overflow-x-auto">
                   <table className="w-full text-sm text-left">
                     <thead className="bg-gray-50">
                       <tr>
-                        <th className="px-4 py-2 font-medium">Dataset</th>
-                        <th className="px-4 py-2 font-medium">Partition</th>
-                        <th className="px-4 py-2 font-medium">Rows</th>
-                        <th className="px-4 py-2 font-medium">Last Applied</th>
+                        <th className="px-4 py-2 font-medium">Mart</th>
+                        <th className="px-4 py-2 font-medium">Rows (est.)</th>
+                        <th className="px-4 py-2 font-medium">Last Built</th>
+                        <th className="px-4 py-2 font-medium">Status</th>
                       </tr>
                     </thead>
                     <tbody>
-                      {manifest.datasets.map((record, index) => (
-                        <tr key={index} className="border-t">
-                          <td className="px-4 py-2 font-medium">{record.dataset}</td>
-                          <td className="px-4 py-2 font-mono text-sm">
-                            {formatPartition(record.partition)}
+                      {status.marts.map((mart) => (
+                        <tr key={mart.mart} className="border-t">
+                          <td className="px-4 py-2 font-mono text-sm">{mart.mart}</td>
+                          <td className="px-4 py-2">{mart.row_estimate.toLocaleString()}</td>
+                          <td className="px-4 py-2">{formatDate(mart.built_at)}</td>
+                          <td className="px-4 py-2">
+                            {mart.stale ? (
+                              <span className="text-amber-600">Behind latest ingest</span>
+                            ) : (
+                              <span className="text-green-600">Up to date</span>
+                            )}
                           </td>
-                          <td className="px-4 py-2">{record.row_count.toLocaleString()}</td>
-                          <td className="px-4 py-2">{formatDate(record.applied_at)}</td>
                         </tr>
                       ))}
                     </tbody>
                   </table>
                 </div>
               </Card>
-            ) : (
-              <Card>
-                <p className="text-gray-600">No ingested data found</p>
-              </Card>
             )}
           </div>
         )}
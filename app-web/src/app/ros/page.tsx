@@ -36,6 +36,8 @@ export default function ROSPage() {
     sort_desc: sorting[0]?.desc ?? true,
     limit: pagination.pageSize,
     offset: (pagination.page - 1) * pagination.pageSize,
+    // The table shows no per-week breakdown, so skip it in the payload
+    per_week: 'none' as const,
   }
 
   // React Query approach
@@ -1,6 +1,6 @@
 'use client'
 
-import React from 'react'
+import React, { useMemo } from 'react'
 import {
   AreaChart,
   Area,
@@ -12,6 +12,7 @@ import {
   ReferenceLine,
 } from 'recharts'
 import { formatNumber } from '@/lib/utils'
+import { ROSPerWeek } from '@/lib/api-types'
 
 interface ProjectionDataPoint {
   week: number
@@ -22,21 +23,33 @@ interface ProjectionDataPoint {
 }
 
 interface ProjectionChartProps {
-  data: ProjectionDataPoint[]
+  data?: ProjectionDataPoint[]
+  // Compact ROS series (per_week=columns), charted when no data points are given
+  perWeek?: ROSPerWeek
   title?: string
   showUncertainty?: boolean
   showActual?: boolean
   currentWeek?: number
 }
 
+export function perWeekToPoints(perWeek: ROSPerWeek): ProjectionDataPoint[] {
+  return perWeek.weeks.map((week, i) => ({ week, proj: perWeek.proj[i], low: null, high: null }))
+}
+
 export function ProjectionChart({
-  data,
+  data: points,
+  perWeek,
   title = 'Weekly Projections',
   showUncertainty = true,
   showActual = true,
   currentWeek,
 }: ProjectionChartProps) {
-  if (!data || data.length === 0) {
+  const data = useMemo(
+    () => (points && points.length > 0 ? points : perWeek ? perWeekToPoints(perWeek) : []),
+    [points, perWeek]
+  )
+
+  if (data.length === 0) {
     return (
       <div className="flex items-center justify-center h-64 text-gray-500">
         No projection data available
@@ -257,6 +257,10 @@ class ApiClient {
     return this.request<TeamRosterResponse>(`/teams/${teamId}/roster`)
   }
 
+  async getTeamRosters(): Promise<TeamRosterResponse[]> {
+    return this.request<TeamRosterResponse[]>('/teams/rosters')
+  }
+
   async addPlayerToRoster(teamId: string, request: AddPlayerRequest): Promise<any> {
     return this.request<any>(`/teams/${teamId}/roster`, {
       method: 'POST',
@@ -20,6 +20,12 @@ export interface ProjectionItem {
   week: number
 }
 
+// Per-week ROS projections as parallel arrays (per_week=columns): proj[i] is for weeks[i]
+export interface ROSPerWeek {
+  weeks: number[]
+  proj: number[]
+}
+
 export interface ROSItem {
   player_id: string
   name: string
@@ -30,6 +36,7 @@ export interface ROSItem {
   low: number
   high: number
   per_week_json?: Array<Record<string, any>>
+  per_week?: ROSPerWeek
   weeks_remaining?: number
 }
 
@@ -133,6 +140,7 @@ export interface ROSParams {
   sort_desc?: boolean
   limit?: number
   offset?: number
+  per_week?: 'objects' | 'columns' | 'none'
 }
 
 export interface UsageParams {
@@ -77,6 +77,24 @@ export function useTeamRoster(teamId: string) {
   })
 }
 
+// Every team's roster in one request; also fills each team's useTeamRoster cache entry
+export function useTeamRosters() {
+  const { isAuthenticated } = useAuth()
+  const queryClient = useQueryClient()
+
+  return useQuery({
+    queryKey: ['teams', 'rosters'],
+    queryFn: async () => {
+      const rosters = await apiClient.getTeamRosters()
+      rosters.forEach((roster) =>
+        queryClient.setQueryData(['teams', roster.team_id, 'roster'], roster)
+      )
+      return rosters
+    },
+    enabled: isAuthenticated && !!apiClient.getAccessToken(),
+  })
+}
+
 export function useAddPlayerToRoster() {
   const queryClient = useQueryClient()
 
@@ -85,6 +103,7 @@ export function useAddPlayerToRoster() {
       apiClient.addPlayerToRoster(teamId, request),
     onSuccess: (_, { teamId }) => {
       queryClient.invalidateQueries({ queryKey: ['teams', teamId, 'roster'] })
+      queryClient.invalidateQueries({ queryKey: ['teams', 'rosters'] })
       queryClient.invalidateQueries({ queryKey: ['teams', teamId] }) // Update roster count
     },
   })
@@ -105,6 +124,7 @@ export function useUpdatePlayerRoster() {
     }) => apiClient.updatePlayerRoster(teamId, playerId, request),
     onSuccess: (_, { teamId }) => {
       queryClient.invalidateQueries({ queryKey: ['teams', teamId, 'roster'] })
+      queryClient.invalidateQueries({ queryKey: ['teams', 'rosters'] })
     },
   })
 }
@@ -117,6 +137,7 @@ export function useRemovePlayerFromRoster() {
       apiClient.removePlayerFromRoster(teamId, playerId),
     onSuccess: (_, { teamId }) => {
       queryClient.invalidateQueries({ queryKey: ['teams', teamId, 'roster'] })
+      queryClient.invalidateQueries({ queryKey: ['teams', 'rosters'] })
       queryClient.invalidateQueries({ queryKey: ['teams', teamId] }) // Update roster count
     },
   })
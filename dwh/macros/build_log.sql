@@ -0,0 +1,14 @@
+{% macro create_model_builds_table() -%}
+  CREATE SCHEMA IF NOT EXISTS ops;
+  CREATE TABLE IF NOT EXISTS ops.model_builds (
+    model text PRIMARY KEY,
+    built_at timestamptz NOT NULL
+  )
+{%- endmacro %}
+
+{% macro record_model_build() -%}
+  -- The API derives ETag and Last-Modified headers from these timestamps
+  INSERT INTO ops.model_builds (model, built_at)
+  VALUES ('{{ this.identifier }}', clock_timestamp())
+  ON CONFLICT (model) DO UPDATE SET built_at = EXCLUDED.built_at
+{%- endmacro %}
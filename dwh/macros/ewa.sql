@@ -1,5 +1,32 @@
-{% macro ewa(expr, order_cols, partition_cols, alpha=0.5, window=4) -%}
-  -- Exponentially weighted average, implemented as rolling average for now
-  -- Future enhancement: true EWA with decay parameter
-  {{ rolling_avg(expr, order_cols, partition_cols, window) }}
-{%- endmacro %}
\ No newline at end of file
+{% macro ewa_alpha(metric) -%}
+  {#- Smoothing factor for a metric from vars.ewa_alpha, falling back to its default entry -#}
+  {%- set alphas = var('ewa_alpha', {}) -%}
+  {{ alphas.get(metric, alphas.get('default', 0.4)) }}
+{%- endmacro %}
+
+{% macro ewa_obs_index(expr, order_cols, partition_cols) -%}
+  {#- Number of non-null observations up to and including the current row -#}
+  COUNT({{ expr }}) OVER (PARTITION BY {{ partition_cols }} ORDER BY {{ order_cols }}
+                          ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+{%- endmacro %}
+
+{% macro ewa(expr, order_cols, partition_cols, alpha, obs_index, seed=none) -%}
+  {#- Exponentially weighted average through the current row: s_n = alpha * x_n + (1 - alpha) * s_(n-1),
+      in closed form s_n = (1 - alpha)^n * (s_0 + SUM(alpha * x_i * (1 - alpha)^-i)) so it is one window sum.
+      obs_index is the ewa_obs_index() column; NULL observations leave the average unchanged.
+      s_0 is the seed (the state carried over from an earlier build) or, without one, the first observation. -#}
+  POWER(1 - {{ alpha }}::double precision, {{ obs_index }}) * (
+    COALESCE(
+      {{ seed if seed is not none else 'NULL::double precision' }},
+      CASE WHEN {{ obs_index }} > 0 THEN
+        MAX(CASE WHEN {{ obs_index }} = 1 THEN {{ expr }} END) OVER (PARTITION BY {{ partition_cols }})
+      END
+    )::double precision
+    + COALESCE(
+      SUM({{ alpha }} * ({{ expr }})::double precision * POWER(1 - {{ alpha }}::double precision, -{{ obs_index }}))
+        OVER (PARTITION BY {{ partition_cols }} ORDER BY {{ order_cols }}
+              ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW),
+      0
+    )
+  )
+{%- endmacro %}
@@ -0,0 +1,87 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['season', 'week', 'def_team', 'position'],
+    on_schema_change='sync_all_columns',
+    indexes=[
+      {'columns': ['season', 'week', 'def_team', 'position'], 'unique': True},
+      {'columns': ['created_at']},
+    ]
+  )
+}}
+
+{% set metrics = ['allowed_ppr_points', 'allowed_yards', 'allowed_tds'] %}
+
+-- Exponentially weighted points/yards/TDs allowed per defense and position, maintained the same way
+-- as int_player_usage_ewa: <metric>_ewa enters the week, <metric>_ewa_state includes it.
+
+WITH
+{% if is_incremental() %}
+changed_defenses AS (
+  SELECT
+    def_team,
+    position,
+    MIN(season * 100 + week) AS first_changed
+  FROM {{ ref('int_defense_allowed_raw') }}
+  WHERE _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  GROUP BY def_team, position
+),
+
+carried_state AS (
+  SELECT DISTINCT ON (t.def_team, t.position)
+    t.*
+  FROM {{ this }} t
+  JOIN changed_defenses cd
+    ON t.def_team = cd.def_team
+    AND t.position = cd.position
+    AND t.season * 100 + t.week < cd.first_changed
+  ORDER BY t.def_team, t.position, t.season DESC, t.week DESC
+),
+{% endif %}
+
+defense_weeks AS (
+  SELECT
+    d.season,
+    d.week,
+    d.def_team,
+    d.position,
+    {% for m in metrics %}
+    d.{{ m }},
+    {{ ewa_obs_index('d.' ~ m, 'd.season, d.week', 'd.def_team, d.position') }} AS {{ m }}_obs,
+    {% if is_incremental() %}cs.{{ m }}_ewa_state{% else %}NULL::double precision{% endif %} AS {{ m }}_seed,
+    {% endfor %}
+    d._ingested_at
+  FROM {{ ref('int_defense_allowed_raw') }} d
+  {% if is_incremental() %}
+  JOIN changed_defenses cd
+    ON d.def_team = cd.def_team
+    AND d.position = cd.position
+    AND d.season * 100 + d.week >= cd.first_changed
+  LEFT JOIN carried_state cs
+    ON d.def_team = cs.def_team
+    AND d.position = cs.position
+  {% endif %}
+),
+
+smoothed AS (
+  SELECT
+    dw.*,
+    {% for m in metrics %}
+    {{ ewa(m, 'season, week', 'def_team, position', ewa_alpha(m), m ~ '_obs', m ~ '_seed') }} AS {{ m }}_ewa_state{{ ',' if not loop.last }}
+    {% endfor %}
+  FROM defense_weeks dw
+)
+
+SELECT
+  season,
+  week,
+  def_team,
+  position,
+  {% for m in metrics %}
+  COALESCE(LAG({{ m }}_ewa_state) OVER defense_history, {{ m }}_seed) AS {{ m }}_ewa,
+  {{ m }}_ewa_state,
+  {% endfor %}
+  _ingested_at,
+  CURRENT_TIMESTAMP AS created_at
+FROM smoothed
+WINDOW defense_history AS (PARTITION BY def_team, position ORDER BY season, week)
@@ -0,0 +1,91 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['season', 'week', 'player_id', 'team'],
+    on_schema_change='sync_all_columns',
+    indexes=[
+      {'columns': ['season', 'week', 'player_id', 'team'], 'unique': True},
+      {'columns': ['player_id', 'team', 'season', 'week']},
+      {'columns': ['created_at']},
+    ]
+  )
+}}
+
+{% set metrics = ['target_share', 'rush_share', 'route_pct', 'snap_pct'] %}
+
+-- Exponentially weighted usage shares per player and team. <metric>_ewa_state is the smoothed value
+-- after the week and is the state the next week builds on; <metric>_ewa is the value entering the
+-- week (the week itself excluded), which is what features use. Incremental runs restart each changed
+-- player from the state stored before their first new or corrected week, so a new week costs one
+-- row per player instead of re-windowing their history.
+
+WITH
+{% if is_incremental() %}
+changed_players AS (
+  SELECT
+    player_id,
+    team,
+    MIN(season * 100 + week) AS first_changed
+  FROM {{ ref('int_player_week_usage') }}
+  WHERE _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  GROUP BY player_id, team
+),
+
+carried_state AS (
+  SELECT DISTINCT ON (t.player_id, t.team)
+    t.*
+  FROM {{ this }} t
+  JOIN changed_players cp
+    ON t.player_id = cp.player_id
+    AND t.team = cp.team
+    AND t.season * 100 + t.week < cp.first_changed
+  ORDER BY t.player_id, t.team, t.season DESC, t.week DESC
+),
+{% endif %}
+
+player_weeks AS (
+  SELECT
+    u.season,
+    u.week,
+    u.player_id,
+    u.team,
+    {% for m in metrics %}
+    u.{{ m }},
+    {{ ewa_obs_index('u.' ~ m, 'u.season, u.week', 'u.player_id, u.team') }} AS {{ m }}_obs,
+    {% if is_incremental() %}cs.{{ m }}_ewa_state{% else %}NULL::double precision{% endif %} AS {{ m }}_seed,
+    {% endfor %}
+    u._ingested_at
+  FROM {{ ref('int_player_week_usage') }} u
+  {% if is_incremental() %}
+  JOIN changed_players cp
+    ON u.player_id = cp.player_id
+    AND u.team = cp.team
+    AND u.season * 100 + u.week >= cp.first_changed
+  LEFT JOIN carried_state cs
+    ON u.player_id = cs.player_id
+    AND u.team = cs.team
+  {% endif %}
+),
+
+smoothed AS (
+  SELECT
+    pw.*,
+    {% for m in metrics %}
+    {{ ewa(m, 'season, week', 'player_id, team', ewa_alpha(m), m ~ '_obs', m ~ '_seed') }} AS {{ m }}_ewa_state{{ ',' if not loop.last }}
+    {% endfor %}
+  FROM player_weeks pw
+)
+
+SELECT
+  season,
+  week,
+  player_id,
+  team,
+  {% for m in metrics %}
+  COALESCE(LAG({{ m }}_ewa_state) OVER player_history, {{ m }}_seed) AS {{ m }}_ewa,
+  {{ m }}_ewa_state,
+  {% endfor %}
+  _ingested_at,
+  CURRENT_TIMESTAMP AS created_at
+FROM smoothed
+WINDOW player_history AS (PARTITION BY player_id, team ORDER BY season, week)
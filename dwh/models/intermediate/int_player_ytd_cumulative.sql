@@ -0,0 +1,131 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['season', 'week', 'player_id'],
+    on_schema_change='sync_all_columns',
+    indexes=[
+      {'columns': ['season', 'week', 'player_id'], 'unique': True},
+      {'columns': ['created_at']},
+    ]
+  )
+}}
+
+-- Season-to-date totals for each player BEFORE each week (the week itself is excluded), so a
+-- projection for week N joins on (season, week, player_id) instead of re-aggregating history.
+-- Only weeks after a player's first game are stored. Incremental runs carry the stored totals
+-- forward from the first week with new or corrected stats and add the newer weeks on top.
+
+WITH
+{% if is_incremental() %}
+changed_seasons AS (
+  SELECT
+    season,
+    MIN(week) AS first_changed_week
+  FROM {{ ref('stg_weekly_player_stats') }}
+  WHERE _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  GROUP BY season
+),
+
+-- Totals before the first changed week are unaffected; running sums restart from them
+carried_totals AS (
+  SELECT t.*
+  FROM {{ this }} t
+  JOIN changed_seasons cs
+    ON t.season = cs.season
+    AND t.week = cs.first_changed_week
+),
+{% endif %}
+
+player_week_stats AS (
+  SELECT
+    s.season,
+    s.week,
+    s.player_id,
+    SUM(s.receptions) AS receptions,
+    SUM(s.targets) AS targets,
+    SUM(s.receiving_yards) AS receiving_yards,
+    SUM(s.receiving_tds) AS receiving_tds,
+    SUM(s.carries) AS carries,
+    SUM(s.rushing_yards) AS rushing_yards,
+    SUM(s.rushing_tds) AS rushing_tds,
+    SUM(s.attempts) AS attempts,
+    SUM(s.passing_yards) AS passing_yards,
+    SUM(s.passing_tds) AS passing_tds,
+    SUM(s.interceptions) AS interceptions,
+    MAX(s._ingested_at) AS _ingested_at
+  FROM {{ ref('stg_weekly_player_stats') }} s
+  {% if is_incremental() %}
+  JOIN changed_seasons cs
+    ON s.season = cs.season
+    AND s.week >= cs.first_changed_week
+  {% endif %}
+  GROUP BY s.season, s.week, s.player_id
+),
+
+season_weeks AS (
+  SELECT season, week FROM {{ ref('f_calendar_weeks') }}
+  UNION
+  SELECT season, week FROM player_week_stats
+),
+
+-- One row per player and week of the season, so weeks without a game still get totals
+player_week_grid AS (
+  SELECT
+    p.season,
+    p.player_id,
+    w.week
+  FROM (SELECT DISTINCT season, player_id FROM player_week_stats) p
+  JOIN season_weeks w
+    ON w.season = p.season
+  {% if is_incremental() %}
+  JOIN changed_seasons cs
+    ON w.season = cs.season
+    AND w.week >= cs.first_changed_week
+  {% endif %}
+),
+
+running_totals AS (
+  SELECT
+    g.season,
+    g.week,
+    g.player_id,
+    {% if is_incremental() %}COALESCE(ct.games_ytd, 0) + {% endif %}COUNT(pws.week) OVER prior_weeks AS games_ytd,
+    {% if is_incremental() %}COALESCE(ct.receptions_ytd, 0) + {% endif %}COALESCE(SUM(pws.receptions) OVER prior_weeks, 0) AS receptions_ytd,
+    {% if is_incremental() %}COALESCE(ct.targets_ytd, 0) + {% endif %}COALESCE(SUM(pws.targets) OVER prior_weeks, 0) AS targets_ytd,
+    {% if is_incremental() %}COALESCE(ct.rec_yds_ytd, 0) + {% endif %}COALESCE(SUM(pws.receiving_yards) OVER prior_weeks, 0) AS rec_yds_ytd,
+    {% if is_incremental() %}COALESCE(ct.rec_tds_ytd, 0) + {% endif %}COALESCE(SUM(pws.receiving_tds) OVER prior_weeks, 0) AS rec_tds_ytd,
+    {% if is_incremental() %}COALESCE(ct.carries_ytd, 0) + {% endif %}COALESCE(SUM(pws.carries) OVER prior_weeks, 0) AS carries_ytd,
+    {% if is_incremental() %}COALESCE(ct.rush_yds_ytd, 0) + {% endif %}COALESCE(SUM(pws.rushing_yards) OVER prior_weeks, 0) AS rush_yds_ytd,
+    {% if is_incremental() %}COALESCE(ct.rush_tds_ytd, 0) + {% endif %}COALESCE(SUM(pws.rushing_tds) OVER prior_weeks, 0) AS rush_tds_ytd,
+    {% if is_incremental() %}COALESCE(ct.pass_att_ytd, 0) + {% endif %}COALESCE(SUM(pws.attempts) OVER prior_weeks, 0) AS pass_att_ytd,
+    {% if is_incremental() %}COALESCE(ct.pass_yds_ytd, 0) + {% endif %}COALESCE(SUM(pws.passing_yards) OVER prior_weeks, 0) AS pass_yds_ytd,
+    {% if is_incremental() %}COALESCE(ct.pass_tds_ytd, 0) + {% endif %}COALESCE(SUM(pws.passing_tds) OVER prior_weeks, 0) AS pass_tds_ytd,
+    {% if is_incremental() %}COALESCE(ct.int_ytd, 0) + {% endif %}COALESCE(SUM(pws.interceptions) OVER prior_weeks, 0) AS int_ytd,
+    MAX(pws._ingested_at) OVER (PARTITION BY g.season) AS _ingested_at
+  FROM player_week_grid g
+  LEFT JOIN player_week_stats pws
+    ON g.season = pws.season
+    AND g.week = pws.week
+    AND g.player_id = pws.player_id
+  {% if is_incremental() %}
+  LEFT JOIN carried_totals ct
+    ON g.season = ct.season
+    AND g.player_id = ct.player_id
+  {% endif %}
+  WINDOW prior_weeks AS (
+    PARTITION BY g.season, g.player_id
+    ORDER BY g.week
+    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+  )
+)
+
+SELECT
+  rt.*,
+  CURRENT_TIMESTAMP AS created_at
+FROM running_totals rt
+{% if is_incremental() %}
+JOIN changed_seasons cs
+  ON rt.season = cs.season
+  AND rt.week > cs.first_changed_week
+{% endif %}
+WHERE rt.games_ytd > 0
@@ -10,24 +10,46 @@
   )
 }}
 
+{% if is_incremental() %}
+-- A corrected week also moves the smoothed values of later weeks, and the league average needs
+-- every defense in a week, so whole weeks are rebuilt
+WITH changed_weeks AS (
+  SELECT season, week
+  FROM {{ ref('int_defense_allowed_rolling') }}
+  WHERE created_at > (SELECT MAX(built_at) FROM {{ this }})
+  UNION
+  SELECT season, week
+  FROM {{ ref('int_defense_allowed_ewa') }}
+  WHERE created_at > (SELECT MAX(built_at) FROM {{ this }})
+),
+
+defense_with_rolling AS (
+{% else %}
 WITH defense_with_rolling AS (
+{% endif %}
   SELECT
-    season,
-    week,
-    def_team AS team,
-    position,
-    allowed_ppr_points AS allowed_ppr_week,
-    rolling_allowed_ppr_4w,
-    rolling_allowed_ppr_6w,
-    allowed_yards,
-    allowed_tds,
-    sample_players,
+    r.season,
+    r.week,
+    r.def_team AS team,
+    r.position,
+    r.allowed_ppr_points AS allowed_ppr_week,
+    r.rolling_allowed_ppr_4w,
+    r.rolling_allowed_ppr_6w,
+    e.allowed_ppr_points_ewa::numeric AS allowed_ppr_ewa,
+    r.allowed_yards,
+    r.allowed_tds,
+    r.sample_players,
     CURRENT_TIMESTAMP AS built_at,
-    _ingested_at
-  FROM {{ ref('int_defense_allowed_rolling') }}
+    r._ingested_at
+  FROM {{ ref('int_defense_allowed_rolling') }} r
+  LEFT JOIN {{ ref('int_defense_allowed_ewa') }} e
+    ON r.season = e.season
+    AND r.week = e.week
+    AND r.def_team = e.def_team
+    AND r.position = e.position
   WHERE 1=1
     {% if is_incremental() %}
-      AND created_at > (SELECT MAX(built_at) FROM {{ this }})
+      AND (r.season, r.week) IN (SELECT season, week FROM changed_weeks)
     {% endif %}
 ),
 
@@ -37,9 +59,10 @@ league_averages AS (
     week,
     position,
     AVG(rolling_allowed_ppr_4w) AS league_avg_rolling_4w,
-    AVG(rolling_allowed_ppr_6w) AS league_avg_rolling_6w
+    AVG(rolling_allowed_ppr_6w) AS league_avg_rolling_6w,
+    AVG(allowed_ppr_ewa) AS league_avg_ewa
   FROM defense_with_rolling
-  WHERE rolling_allowed_ppr_4w IS NOT NULL
+  WHERE allowed_ppr_ewa IS NOT NULL
   GROUP BY season, week, position
 )
 
@@ -53,15 +76,16 @@ SELECT
   dwr.allowed_ppr_week,
   dwr.rolling_allowed_ppr_4w,
   dwr.rolling_allowed_ppr_6w,
+  dwr.allowed_ppr_ewa,
   dwr.allowed_yards,
   dwr.allowed_tds,
   
   -- Stabilized normalization to league average with caps and minimum sample requirements
   CASE 
-    WHEN la.league_avg_rolling_4w > 0 AND dwr.sample_players >= 8
-    THEN GREATEST(0.8, LEAST(1.2, dwr.rolling_allowed_ppr_4w / la.league_avg_rolling_4w))
-    WHEN la.league_avg_rolling_4w > 0 AND dwr.sample_players >= 4
-    THEN GREATEST(0.9, LEAST(1.1, dwr.rolling_allowed_ppr_4w / la.league_avg_rolling_4w))
+    WHEN la.league_avg_ewa > 0 AND dwr.sample_players >= 8
+    THEN GREATEST(0.8, LEAST(1.2, dwr.allowed_ppr_ewa / la.league_avg_ewa))
+    WHEN la.league_avg_ewa > 0 AND dwr.sample_players >= 4
+    THEN GREATEST(0.9, LEAST(1.1, dwr.allowed_ppr_ewa / la.league_avg_ewa))
     ELSE 1.0
   END AS schedule_adj_index,
   
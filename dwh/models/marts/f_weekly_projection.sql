@@ -1,7 +1,8 @@
 {{
   config(
     materialized='incremental',
-    unique_key=['season', 'week', 'player_id', 'scoring'],
+    incremental_strategy='delete+insert',
+    unique_key=['season', 'week'],
     on_schema_change='sync_all_columns',
     post_hook=[
       "CREATE INDEX IF NOT EXISTS idx_weekly_proj_sw_pos ON {{ this }} (season, week, scoring, position)",
@@ -10,13 +11,19 @@
   )
 }}
 
+-- Incremental runs rebuild whole (season, week) slices: the unique key is the slice, so
+-- delete+insert replaces every row of a week whose inputs changed since the last build_at.
+-- Upcoming weeks are always rebuilt because they project from the latest usage snapshot.
+
 WITH
--- Enhanced upcoming weeks logic that supports cross-year projections
+-- Latest season/week with usage data, computed once and cross joined where needed
 data_availability AS (
-  SELECT 
-    MAX(season) as max_data_season,
-    MAX(CASE WHEN season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }}) THEN week END) as max_data_week
+  SELECT
+    season AS max_data_season,
+    MAX(week) AS max_data_week
   FROM {{ ref('f_weekly_usage') }}
+  WHERE season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }})
+  GROUP BY season
 ),
 
 upcoming_weeks AS (
@@ -42,6 +49,42 @@ upcoming_weeks AS (
     )
 ),
 
+{% if is_incremental() %}
+last_build AS (
+  SELECT MAX(built_at) AS built_at FROM {{ this }}
+),
+
+-- Historical weeks whose usage, team volume, DvP or prior-week stats changed since the last build
+changed_weeks AS (
+  SELECT DISTINCT u.season, u.week
+  FROM {{ ref('f_weekly_usage') }} u
+  CROSS JOIN last_build lb
+  WHERE u.built_at > lb.built_at
+
+  UNION
+
+  SELECT DISTINCT tv.season, tv.week
+  FROM {{ ref('int_team_volume_preds') }} tv
+  CROSS JOIN last_build lb
+  WHERE tv.created_at > lb.built_at
+
+  UNION
+
+  SELECT DISTINCT dvp.season, dvp.week
+  FROM {{ ref('f_defense_vs_pos') }} dvp
+  CROSS JOIN last_build lb
+  WHERE dvp.built_at > lb.built_at
+
+  UNION
+
+  -- New or corrected stat lines rewrite the YTD totals of every later week in their season
+  SELECT DISTINCT ytd.season, ytd.week
+  FROM {{ ref('int_player_ytd_cumulative') }} ytd
+  CROSS JOIN last_build lb
+  WHERE ytd.created_at > lb.built_at
+),
+{% endif %}
+
 -- Enhanced synthetic usage supporting cross-year fallback
 player_roster_mapping AS (
   SELECT DISTINCT
@@ -51,10 +94,11 @@ player_roster_mapping AS (
     COALESCE(r2025.team, r2024.team, u.team) as current_team,
     u.team as usage_team
   FROM {{ ref('f_weekly_usage') }} u
+  CROSS JOIN data_availability da
   LEFT JOIN {{ ref('stg_rosters') }} r2024 ON u.player_id = r2024.player_id AND r2024.season = 2024
   LEFT JOIN {{ ref('stg_rosters') }} r2025 ON u.player_id = r2025.player_id AND r2025.season = 2025
-  WHERE u.season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }})
-    AND u.week >= (SELECT MAX(week) - 4 FROM {{ ref('f_weekly_usage') }} WHERE u.season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }}))
+  WHERE u.season = da.max_data_season
+    AND u.week >= da.max_data_week - 4
     AND (u.snap_pct > 0.05 OR u.targets > 0 OR u.rush_att > 0)
 ),
 
@@ -65,7 +109,7 @@ synthetic_usage AS (
     u.player_id,
     -- Use updated team from roster mapping for cross-year projections, fallback to original team
     CASE 
-      WHEN uw.season > (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }}) THEN COALESCE(prm.current_team, u.team)
+      WHEN uw.season > da.max_data_season THEN COALESCE(prm.current_team, u.team)
       ELSE u.team
     END as team,
     u.position,
@@ -81,8 +125,13 @@ synthetic_usage AS (
     u.rush_share_4w,
     u.route_pct_4w,
     u.snap_pct_4w,
+    u.target_share_ewa,
+    u.rush_share_ewa,
+    u.route_pct_ewa,
+    u.snap_pct_ewa,
     CURRENT_TIMESTAMP AS built_at
   FROM upcoming_weeks uw
+  CROSS JOIN data_availability da
   CROSS JOIN (
     -- Get most recent usage data for each active player
     SELECT DISTINCT ON (player_id) 
@@ -100,11 +149,16 @@ synthetic_usage AS (
       target_share_4w,
       rush_share_4w,
       route_pct_4w,
-      snap_pct_4w
-    FROM {{ ref('f_weekly_usage') }}
-    WHERE season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }})
+      snap_pct_4w,
+      target_share_ewa,
+      rush_share_ewa,
+      route_pct_ewa,
+      snap_pct_ewa
+    FROM {{ ref('f_weekly_usage') }} fu
+    CROSS JOIN data_availability da
+    WHERE fu.season = da.max_data_season
       -- For cross-year fallback, use final 6 weeks of previous season for better sample
-      AND week >= (SELECT GREATEST(MAX(week) - 5, 1) FROM {{ ref('f_weekly_usage') }} WHERE season = (SELECT MAX(season) FROM {{ ref('f_weekly_usage') }}))
+      AND fu.week >= GREATEST(da.max_data_week - 5, 1)
       -- Include players who were meaningfully active
       AND (snap_pct > 0.05 OR targets > 0 OR rush_att > 0)
     ORDER BY player_id, season DESC, week DESC
@@ -116,9 +170,9 @@ synthetic_usage AS (
 -- Combine historical and synthetic usage data
 combined_usage AS (
   -- Existing usage data (when available for the season/week)
-  SELECT * FROM {{ ref('f_weekly_usage') }}
+  SELECT u.* FROM {{ ref('f_weekly_usage') }} u
   {% if is_incremental() %}
-    WHERE built_at > (SELECT MAX(built_at) FROM {{ this }})
+    WHERE (u.season, u.week) IN (SELECT season, week FROM changed_weeks)
   {% endif %}
   
   UNION ALL
@@ -129,6 +183,7 @@ combined_usage AS (
     snap_pct, route_pct, target_share, rush_share,
     routes_run, targets, rush_att, receptions,
     target_share_4w, rush_share_4w, route_pct_4w, snap_pct_4w,
+    target_share_ewa, rush_share_ewa, route_pct_ewa, snap_pct_ewa,
     built_at
   FROM synthetic_usage
 ),
@@ -149,6 +204,11 @@ usage_with_opponent AS (
     AND (u.team = s.home_team OR u.team = s.away_team)
 ),
 
+projection_weeks AS (
+  SELECT DISTINCT season, week
+  FROM usage_with_opponent
+),
+
 base_data AS (
   SELECT 
     u.*,
@@ -193,142 +253,138 @@ prior_year_stats AS (
     
   FROM {{ ref('stg_weekly_player_stats') }}
   WHERE season >= 2023  -- Use recent historical data
+    AND season IN (SELECT season - 1 FROM projection_weeks)
   GROUP BY player_id, season
 ),
 
 player_ytd_stats AS (
   SELECT 
-    stats.season,
-    stats.player_id,
-    current_weeks.week,
+    ytd.season,
+    ytd.player_id,
+    ytd.week,
     
     -- Current season YTD totals (temporal constraint: only up to current week)
-    SUM(stats.receptions) AS receptions_ytd,
-    SUM(stats.targets) AS targets_ytd,
-    SUM(stats.receiving_yards) AS rec_yds_ytd,
-    SUM(stats.receiving_tds) AS rec_tds_ytd,
-    SUM(stats.carries) AS carries_ytd,
-    SUM(stats.rushing_yards) AS rush_yds_ytd,
-    SUM(stats.rushing_tds) AS rush_tds_ytd,
-    SUM(stats.attempts) AS pass_att_ytd,
-    SUM(stats.passing_yards) AS pass_yds_ytd,
-    SUM(stats.passing_tds) AS pass_tds_ytd,
-    SUM(stats.interceptions) AS int_ytd,
+    ytd.receptions_ytd,
+    ytd.targets_ytd,
+    ytd.rec_yds_ytd,
+    ytd.rec_tds_ytd,
+    ytd.carries_ytd,
+    ytd.rush_yds_ytd,
+    ytd.rush_tds_ytd,
+    ytd.pass_att_ytd,
+    ytd.pass_yds_ytd,
+    ytd.pass_tds_ytd,
+    ytd.int_ytd,
     
     -- Enhanced efficiency rates using both current YTD and prior year data
     -- For early weeks with limited data, blend with historical rates
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.targets) < 10 AND pys.prior_catch_rate IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.targets_ytd < 10 AND pys.prior_catch_rate IS NOT NULL THEN
         -- Early season with limited data: blend 70% prior year, 30% current
         COALESCE(
-          0.7 * pys.prior_catch_rate + 0.3 * (SUM(stats.receptions)::numeric / NULLIF(SUM(stats.targets), 0)),
+          0.7 * pys.prior_catch_rate + 0.3 * (ytd.receptions_ytd::numeric / NULLIF(ytd.targets_ytd, 0)),
           pys.prior_catch_rate
         )
       ELSE 
         -- Sufficient current data: use current season rate
-        COALESCE(SUM(stats.receptions)::numeric / NULLIF(SUM(stats.targets), 0), 0)
+        COALESCE(ytd.receptions_ytd::numeric / NULLIF(ytd.targets_ytd, 0), 0)
     END AS blended_catch_rate,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.receptions) < 8 AND pys.prior_rec_yds_per_rec IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.receptions_ytd < 8 AND pys.prior_rec_yds_per_rec IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_rec_yds_per_rec + 0.3 * (SUM(stats.receiving_yards)::numeric / NULLIF(SUM(stats.receptions), 0)),
+          0.7 * pys.prior_rec_yds_per_rec + 0.3 * (ytd.rec_yds_ytd::numeric / NULLIF(ytd.receptions_ytd, 0)),
           pys.prior_rec_yds_per_rec
         )
       ELSE
-        COALESCE(SUM(stats.receiving_yards)::numeric / NULLIF(SUM(stats.receptions), 0), 0)
+        COALESCE(ytd.rec_yds_ytd::numeric / NULLIF(ytd.receptions_ytd, 0), 0)
     END AS blended_rec_yds_per_rec,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.carries) < 12 AND pys.prior_rush_yds_per_att IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.carries_ytd < 12 AND pys.prior_rush_yds_per_att IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_rush_yds_per_att + 0.3 * (SUM(stats.rushing_yards)::numeric / NULLIF(SUM(stats.carries), 0)),
+          0.7 * pys.prior_rush_yds_per_att + 0.3 * (ytd.rush_yds_ytd::numeric / NULLIF(ytd.carries_ytd, 0)),
           pys.prior_rush_yds_per_att
         )
       ELSE
-        COALESCE(SUM(stats.rushing_yards)::numeric / NULLIF(SUM(stats.carries), 0), 0)
+        COALESCE(ytd.rush_yds_ytd::numeric / NULLIF(ytd.carries_ytd, 0), 0)
     END AS blended_rush_yds_per_att,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.attempts) < 50 AND pys.prior_pass_yds_per_att IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.pass_att_ytd < 50 AND pys.prior_pass_yds_per_att IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_pass_yds_per_att + 0.3 * (SUM(stats.passing_yards)::numeric / NULLIF(SUM(stats.attempts), 0)),
+          0.7 * pys.prior_pass_yds_per_att + 0.3 * (ytd.pass_yds_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0)),
           pys.prior_pass_yds_per_att
         )
       ELSE
-        COALESCE(SUM(stats.passing_yards)::numeric / NULLIF(SUM(stats.attempts), 0), 0)
+        COALESCE(ytd.pass_yds_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0), 0)
     END AS blended_pass_yds_per_att,
     
     -- Add TD rate blending
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.targets) < 10 AND pys.prior_rec_td_rate IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.targets_ytd < 10 AND pys.prior_rec_td_rate IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_rec_td_rate + 0.3 * (SUM(stats.receiving_tds)::numeric / NULLIF(SUM(stats.targets), 0)),
+          0.7 * pys.prior_rec_td_rate + 0.3 * (ytd.rec_tds_ytd::numeric / NULLIF(ytd.targets_ytd, 0)),
           pys.prior_rec_td_rate
         )
       ELSE
-        COALESCE(SUM(stats.receiving_tds)::numeric / NULLIF(SUM(stats.targets), 0), 0)
+        COALESCE(ytd.rec_tds_ytd::numeric / NULLIF(ytd.targets_ytd, 0), 0)
     END AS blended_rec_td_rate,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.carries) < 12 AND pys.prior_rush_td_rate IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.carries_ytd < 12 AND pys.prior_rush_td_rate IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_rush_td_rate + 0.3 * (SUM(stats.rushing_tds)::numeric / NULLIF(SUM(stats.carries), 0)),
+          0.7 * pys.prior_rush_td_rate + 0.3 * (ytd.rush_tds_ytd::numeric / NULLIF(ytd.carries_ytd, 0)),
           pys.prior_rush_td_rate
         )
       ELSE
-        COALESCE(SUM(stats.rushing_tds)::numeric / NULLIF(SUM(stats.carries), 0), 0)
+        COALESCE(ytd.rush_tds_ytd::numeric / NULLIF(ytd.carries_ytd, 0), 0)
     END AS blended_rush_td_rate,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.attempts) < 50 AND pys.prior_pass_td_rate IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.pass_att_ytd < 50 AND pys.prior_pass_td_rate IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_pass_td_rate + 0.3 * (SUM(stats.passing_tds)::numeric / NULLIF(SUM(stats.attempts), 0)),
+          0.7 * pys.prior_pass_td_rate + 0.3 * (ytd.pass_tds_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0)),
           pys.prior_pass_td_rate
         )
       ELSE
-        COALESCE(SUM(stats.passing_tds)::numeric / NULLIF(SUM(stats.attempts), 0), 0)
+        COALESCE(ytd.pass_tds_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0), 0)
     END AS blended_pass_td_rate,
     
     CASE 
-      WHEN current_weeks.week <= 4 AND SUM(stats.attempts) < 50 AND pys.prior_int_rate IS NOT NULL THEN
+      WHEN ytd.week <= 4 AND ytd.pass_att_ytd < 50 AND pys.prior_int_rate IS NOT NULL THEN
         COALESCE(
-          0.7 * pys.prior_int_rate + 0.3 * (SUM(stats.interceptions)::numeric / NULLIF(SUM(stats.attempts), 0)),
+          0.7 * pys.prior_int_rate + 0.3 * (ytd.int_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0)),
           pys.prior_int_rate
         )
       ELSE
-        COALESCE(SUM(stats.interceptions)::numeric / NULLIF(SUM(stats.attempts), 0), 0)
+        COALESCE(ytd.int_ytd::numeric / NULLIF(ytd.pass_att_ytd, 0), 0)
     END AS blended_int_rate
     
-  FROM {{ ref('stg_weekly_player_stats') }} stats
-  -- Cross join with all projection weeks to calculate week-specific YTD stats
-  CROSS JOIN (
-    SELECT DISTINCT season, week 
-    FROM usage_with_opponent
-  ) current_weeks
+  -- Players without a prior game this season have no row and keep NULL YTD (shrinkage falls back to priors)
+  FROM {{ ref('int_player_ytd_cumulative') }} ytd
+  JOIN projection_weeks pw
+    ON ytd.season = pw.season
+    AND ytd.week = pw.week
   LEFT JOIN prior_year_stats pys 
-    ON stats.player_id = pys.player_id 
-    AND current_weeks.season = pys.projection_season
-  WHERE stats.season = current_weeks.season 
-    AND stats.week < current_weeks.week  -- CRITICAL: Only use data PRIOR to projection week (exclude current week)
-  GROUP BY stats.season, stats.player_id, current_weeks.week, 
-           pys.prior_catch_rate, pys.prior_rec_yds_per_rec, pys.prior_rec_td_rate,
-           pys.prior_rush_yds_per_att, pys.prior_rush_td_rate,
-           pys.prior_pass_yds_per_att, pys.prior_pass_td_rate, pys.prior_int_rate
+    ON ytd.player_id = pys.player_id 
+    AND ytd.season = pys.projection_season
 ),
 
-volume_predictions AS (
+-- The projection CTEs below each reference the previous one's columns many times; materializing
+-- them evaluates every rate expression once per row instead of once per reference
+volume_predictions AS MATERIALIZED (
   SELECT 
     bd.*,
     -- Volume predictions based on shares and team volume
-    bd.target_share_4w * bd.team_targets_pred AS targets_pred,
-    bd.route_pct_4w * bd.team_routes_pred AS routes_pred,
+    bd.target_share_ewa * bd.team_targets_pred AS targets_pred,
+    bd.route_pct_ewa * bd.team_routes_pred AS routes_pred,
     
     -- ENHANCED: QB rushing fix - QBs now get rushing attempts
     CASE 
       WHEN bd.position = 'QB' THEN 
-        COALESCE(bd.rush_share_4w * bd.team_rush_att_pred, 0)
-      ELSE bd.rush_share_4w * bd.team_rush_att_pred
+        COALESCE(bd.rush_share_ewa * bd.team_rush_att_pred, 0)
+      ELSE bd.rush_share_ewa * bd.team_rush_att_pred
     END AS rush_att_pred,
     
     CASE 
@@ -455,7 +511,7 @@ efficiency_with_priors AS (
     ON vp.position = ep_int.position AND ep_int.metric = 'int_per_att'
 ),
 
-opponent_adjusted AS (
+opponent_adjusted AS MATERIALIZED (
   SELECT 
     ep.*,
     -- ENHANCED: Apply stabilized opponent adjustment (capped at ±20% instead of ±30%)
@@ -470,7 +526,7 @@ opponent_adjusted AS (
   FROM efficiency_with_priors ep
 ),
 
-component_predictions AS (
+component_predictions AS MATERIALIZED (
   SELECT 
     oa.*,
     -- Component predictions
@@ -513,7 +569,7 @@ scoring_crossjoin AS (
   CROSS JOIN {{ ref('scoring_weights') }} sw
 ),
 
-final_projections AS (
+final_projections AS MATERIALIZED (
   SELECT 
     season,
     week,
@@ -548,9 +604,9 @@ final_projections AS (
       'pass_yds_pred', ROUND(pass_yds_pred::numeric, 1),
       'pass_td_pred', ROUND(pass_td_pred::numeric, 3),
       'int_pred', ROUND(int_pred::numeric, 3),
-      'target_share_4w', ROUND(target_share_4w::numeric, 3),
-      'route_pct_4w', ROUND(route_pct_4w::numeric, 3),
-      'rush_share_4w', ROUND(rush_share_4w::numeric, 3),
+      'target_share_ewa', ROUND(target_share_ewa::numeric, 3),
+      'route_pct_ewa', ROUND(route_pct_ewa::numeric, 3),
+      'rush_share_ewa', ROUND(rush_share_ewa::numeric, 3),
       'dvp_index', ROUND(COALESCE(schedule_adj_index, 1.0)::numeric, 3)
     ) AS components_json,
     
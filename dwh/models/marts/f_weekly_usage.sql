@@ -13,31 +13,46 @@
 
 WITH base_usage AS (
   SELECT
-    season,
-    week,
-    player_id,
-    team,
-    position,
+    u.season,
+    u.week,
+    u.player_id,
+    u.team,
+    u.position,
     
     -- Raw volume
-    routes_run,
-    targets,
-    rush_att,
-    receptions,
+    u.routes_run,
+    u.targets,
+    u.rush_att,
+    u.receptions,
     
     -- Usage metrics
-    snap_pct,
-    route_pct,
-    target_share,
-    rush_share,
+    u.snap_pct,
+    u.route_pct,
+    u.target_share,
+    u.rush_share,
     
-    _ingested_at,
+    -- Exponentially weighted usage entering the week
+    e.target_share_ewa::numeric AS target_share_ewa,
+    e.rush_share_ewa::numeric AS rush_share_ewa,
+    e.route_pct_ewa::numeric AS route_pct_ewa,
+    e.snap_pct_ewa::numeric AS snap_pct_ewa,
+    
+    u._ingested_at,
     CURRENT_TIMESTAMP AS built_at
     
-  FROM {{ ref('int_player_week_usage') }}
+  FROM {{ ref('int_player_week_usage') }} u
+  LEFT JOIN {{ ref('int_player_usage_ewa') }} e
+    ON u.season = e.season
+    AND u.week = e.week
+    AND u.player_id = e.player_id
+    AND u.team = e.team
   WHERE 1=1
     {% if is_incremental() %}
-      AND created_at > (SELECT MAX(built_at) FROM {{ this }})
+      -- A corrected week also moves the smoothed values of the weeks after it
+      AND (
+        u.created_at > (SELECT MAX(built_at) FROM {{ this }})
+        OR e.created_at > (SELECT MAX(built_at) FROM {{ this }})
+      )
     {% endif %}
 ),
 
@@ -78,6 +93,10 @@ SELECT
   rush_share_4w,
   route_pct_4w,
   snap_pct_4w,
+  target_share_ewa,
+  rush_share_ewa,
+  route_pct_ewa,
+  snap_pct_ewa,
   
   CURRENT_TIMESTAMP AS built_at
 
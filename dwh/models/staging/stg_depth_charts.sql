@@ -1,6 +1,20 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key=['season', 'week', 'team', 'player_id', 'position', 'role'],
+  indexes=[
+    {'columns': ['season', 'week', 'team', 'player_id', 'position', 'role'], 'unique': True},
+  ]
+) }}
 
-SELECT
+-- A player can be listed in several formations and slots; keep the latest listing per slot
+SELECT DISTINCT ON (
+  season,
+  week,
+  {{ j_get_text('data', 'team') }},
+  {{ j_get_text('data', 'gsis_id') }},
+  {{ j_get_text('data', 'position') }},
+  LOWER(REPLACE({{ j_get_text('data', 'formation') }}, ' ', '_'))
+)
   season,
   week,
   {{ j_get_text('data', 'team') }} AS team,
@@ -11,4 +25,16 @@ SELECT
   _ingested_at
 
 FROM {{ source('raw', 'depth_charts') }}
-WHERE dataset = 'depth_charts'
\ No newline at end of file
+WHERE dataset = 'depth_charts'
+  {% if is_incremental() %}
+    AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  {% endif %}
+ORDER BY
+  season,
+  week,
+  {{ j_get_text('data', 'team') }},
+  {{ j_get_text('data', 'gsis_id') }},
+  {{ j_get_text('data', 'position') }},
+  LOWER(REPLACE({{ j_get_text('data', 'formation') }}, ' ', '_')),
+  _ingested_at DESC,
+  {{ j_get_int('data', 'depth_team') }}
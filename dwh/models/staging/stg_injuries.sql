@@ -1,6 +1,12 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key=['season', 'week', 'player_id', 'team'],
+  indexes=[
+    {'columns': ['season', 'week', 'player_id', 'team'], 'unique': True},
+  ]
+) }}
 
-SELECT
+SELECT DISTINCT ON (season, week, {{ j_get_text('data', 'gsis_id') }}, {{ j_get_text('data', 'team') }})
   season,
   week,
   {{ j_get_text('data', 'team') }} AS team,
@@ -13,4 +19,8 @@ SELECT
   _ingested_at
 
 FROM {{ source('raw', 'injuries') }}
-WHERE dataset = 'injuries'
\ No newline at end of file
+WHERE dataset = 'injuries'
+  {% if is_incremental() %}
+    AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  {% endif %}
+ORDER BY season, week, {{ j_get_text('data', 'gsis_id') }}, {{ j_get_text('data', 'team') }}, _ingested_at DESC
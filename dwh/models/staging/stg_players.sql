@@ -1,4 +1,11 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key='player_id',
+  indexes=[
+    {'columns': ['player_id'], 'unique': True},
+    {'columns': ['position']},
+  ]
+) }}
 
 WITH regular_players AS (
   SELECT DISTINCT ON ({{ j_get_text('data', 'gsis_id') }})
@@ -28,11 +35,15 @@ WITH regular_players AS (
 
   FROM {{ source('raw', 'players') }}
   WHERE dataset = 'players'
+    {% if is_incremental() %}
+      -- DST rows carry the schedules watermark, so exclude them from the players one
+      AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }} WHERE position <> 'DST')
+    {% endif %}
   ORDER BY {{ j_get_text('data', 'gsis_id') }}, _ingested_at DESC
 ),
 
 dst_players AS (
-  SELECT DISTINCT
+  SELECT
     teams.team || '_DST' AS player_id,
     NULL AS gsis_id,
     NULL AS pfr_id,
@@ -47,12 +58,19 @@ dst_players AS (
     NULL::numeric AS weight,
     NULL AS college,
     'Active' AS status,
-    CURRENT_TIMESTAMP AS _ingested_at
+    teams._ingested_at
   FROM (
-    SELECT DISTINCT home_team AS team FROM {{ ref('stg_schedules') }} WHERE season >= 2023
-    UNION 
-    SELECT DISTINCT away_team AS team FROM {{ ref('stg_schedules') }} WHERE season >= 2023
+    SELECT team, MAX(_ingested_at) AS _ingested_at
+    FROM (
+      SELECT home_team AS team, _ingested_at FROM {{ ref('stg_schedules') }} WHERE season >= 2023
+      UNION ALL
+      SELECT away_team AS team, _ingested_at FROM {{ ref('stg_schedules') }} WHERE season >= 2023
+    ) team_games
+    GROUP BY team
   ) teams
+  {% if is_incremental() %}
+  WHERE teams._ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }} WHERE position = 'DST')
+  {% endif %}
 )
 
 SELECT * FROM regular_players
@@ -1,6 +1,13 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key=['season', 'team', 'player_id'],
+  indexes=[
+    {'columns': ['season', 'team', 'player_id'], 'unique': True},
+    {'columns': ['player_id', 'season']},
+  ]
+) }}
 
-SELECT
+SELECT DISTINCT ON (season, {{ j_get_text('data', 'team') }}, {{ j_get_text('data', 'player_id') }})
   season,
   {{ j_get_text('data', 'team') }} AS team,
   {{ j_get_text('data', 'player_id') }} AS player_id,
@@ -10,4 +17,8 @@ SELECT
   _ingested_at
 
 FROM {{ source('raw', 'rosters') }}
-WHERE dataset = 'rosters'
\ No newline at end of file
+WHERE dataset = 'rosters'
+  {% if is_incremental() %}
+    AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  {% endif %}
+ORDER BY season, {{ j_get_text('data', 'team') }}, {{ j_get_text('data', 'player_id') }}, _ingested_at DESC
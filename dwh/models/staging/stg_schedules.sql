@@ -1,6 +1,13 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key='game_id',
+  indexes=[
+    {'columns': ['game_id'], 'unique': True},
+    {'columns': ['season', 'week']},
+  ]
+) }}
 
-SELECT
+SELECT DISTINCT ON ({{ j_get_text('data', 'game_id') }})
   season,
   {{ j_get_int('data', 'week') }} AS week,
   {{ j_get_text('data', 'game_id') }} AS game_id,
@@ -21,4 +28,8 @@ SELECT
   _ingested_at
 
 FROM {{ source('raw', 'schedules') }}
-WHERE dataset = 'schedules'
\ No newline at end of file
+WHERE dataset = 'schedules'
+  {% if is_incremental() %}
+    AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+  {% endif %}
+ORDER BY {{ j_get_text('data', 'game_id') }}, _ingested_at DESC
@@ -1,4 +1,15 @@
-{{ config(materialized='view') }}
+{{ config(
+  materialized='incremental',
+  unique_key=['season', 'week', 'player_id', 'team'],
+  indexes=[
+    {'columns': ['season', 'week', 'player_id', 'team'], 'unique': True},
+    {'columns': ['player_id', 'season']},
+    {'columns': ['_ingested_at']},
+  ]
+) }}
+
+-- Latest version per (season, week, player, team) is resolved once here; incremental
+-- runs only parse raw rows ingested since the last build and replace them by key
 
 WITH regular_player_stats AS (
   SELECT DISTINCT ON (season, week, {{ j_get_text('data', 'player_id') }}, {{ j_get_text('data', 'team') }})
@@ -39,6 +50,9 @@ WITH regular_player_stats AS (
 
   FROM {{ source('raw', 'weekly_player_stats') }}
   WHERE dataset = 'weekly_player_stats'
+    {% if is_incremental() %}
+      AND _ingested_at > (SELECT COALESCE(MAX(_ingested_at), '-infinity') FROM {{ this }})
+    {% endif %}
   ORDER BY season, week, {{ j_get_text('data', 'player_id') }}, {{ j_get_text('data', 'team') }}, _ingested_at DESC
 )
 
@@ -18,6 +18,7 @@ class DatasetConfig:
     id_columns: List[str]
     schema_version: str
     rename_map: Optional[Dict[str, str]] = None
+    storage: Optional[Dict[str, Any]] = None
     
     @property
     def partition_type(self) -> str:
@@ -29,6 +30,18 @@ class DatasetConfig:
         """Get partition keys."""
         return self.partitioning.get('keys', [])
     
+    @property
+    def raw_partition_by(self) -> Optional[str]:
+        """Get the column the raw table is declaratively partitioned on, if any."""
+        return (self.storage or {}).get('partition_by')
+    
+    @property
+    def raw_subpartition_by(self) -> Optional[str]:
+        """Get the column each raw partition is sub-partitioned on, if any."""
+        if not self.raw_partition_by:
+            return None
+        return (self.storage or {}).get('subpartition_by')
+    
     def is_weekly(self) -> bool:
         """Check if dataset is partitioned weekly."""
         return self.partition_type == 'weekly'
@@ -72,7 +85,8 @@ class DatasetRegistry:
                     required_fields=dataset_config.get('required_fields', []),
                     id_columns=dataset_config.get('id_columns', []),
                     schema_version=dataset_config.get('schema_version', 'v1'),
-                    rename_map=dataset_config.get('rename_map')
+                    rename_map=dataset_config.get('rename_map'),
+                    storage=dataset_config.get('storage')
                 )
             
             self.logger.info(f"Loaded {len(self.datasets)} dataset configurations")
@@ -1,11 +1,14 @@
 import hashlib
 import json
+from collections import defaultdict
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 
-from sqlalchemy import create_engine, text, MetaData, Table, Column, Integer, String, DateTime, Text, Index
+from sqlalchemy import (
+    create_engine, text, MetaData, Table, Column, Integer, BigInteger, String, DateTime, Text, Index
+)
 from sqlalchemy.dialects.postgresql import JSONB, ENUM
 from sqlalchemy.orm import sessionmaker
 from prefect import get_run_logger
@@ -37,6 +40,31 @@ def safe_json_serialize(obj):
         return obj
 
 
+def raw_partition_name(dataset: str, season: int, week: Optional[int] = None) -> str:
+    """Get the unqualified table name of a raw partition.
+    
+    Season -1 maps to the dataset's default partition and week -1 to the season's
+    default sub-partition.
+    """
+    if season < 0:
+        return f"{dataset}_default"
+    if week is None:
+        return f"{dataset}_s{season}"
+    if week < 0:
+        return f"{dataset}_s{season}_default"
+    return f"{dataset}_s{season}_w{week:02d}"
+
+
+def _validate_raw_storage(partition_by: Optional[str], subpartition_by: Optional[str]) -> None:
+    """Validate the raw table partitioning options from the dataset registry."""
+    if partition_by not in (None, 'season'):
+        raise ValueError(f"Unsupported raw partition column: {partition_by}")
+    if subpartition_by not in (None, 'week'):
+        raise ValueError(f"Unsupported raw sub-partition column: {subpartition_by}")
+    if subpartition_by and not partition_by:
+        raise ValueError("subpartition_by requires partition_by")
+
+
 class PostgresClient:
     """PostgreSQL client for raw data operations."""
     
@@ -46,6 +74,9 @@ class PostgresClient:
         self.engine = create_engine(self.settings.database_url)
         self.Session = sessionmaker(bind=self.engine)
         self.metadata = MetaData()
+        # Per-client caches so repeated batches don't re-check the catalog
+        self._raw_table_partitioned: Dict[str, bool] = {}
+        self._raw_partitions: Set[str] = set()
     
     def ensure_schema_and_ops(self) -> None:
         """Create raw schema and ops tables if they don't exist."""
@@ -107,11 +138,41 @@ class PostgresClient:
         # Add unique constraint on dataset + partition
         Index('uq_manifest_dataset_partition', ingest_manifest.c.dataset, ingest_manifest.c.partition, unique=True)
         
+        # Per-run stage timings and row outcomes, one row per load_partition attempt
+        stage_metrics = Table(
+            'ingest_stage_metrics',
+            self.metadata,
+            Column('id', Integer, primary_key=True),
+            Column('dataset', String(100), nullable=False),
+            Column('partition', JSONB, nullable=False),
+            Column('file_id', Integer, nullable=True),
+            Column('status', ENUM('pending', 'applied', 'skipped', 'failed', name='ingest_status'), nullable=False),
+            Column('stages_ms', JSONB, nullable=False),
+            Column('duration_ms', Integer, nullable=False),
+            Column('bytes_written', BigInteger, nullable=False, default=0),
+            Column('rows_inserted', Integer, nullable=False, default=0),
+            Column('rows_updated', Integer, nullable=False, default=0),
+            Column('rows_unchanged', Integer, nullable=False, default=0),
+            Column('recorded_at', DateTime(timezone=True), nullable=False, default=datetime.utcnow),
+            schema='ops'
+        )
+        Index('idx_ingest_stage_metrics_dataset', stage_metrics.c.dataset, stage_metrics.c.recorded_at)
+        
         # Create tables
         self.metadata.create_all(self.engine)
     
-    def ensure_raw_table(self, dataset: str) -> None:
-        """Create raw table for dataset if it doesn't exist."""
+    def ensure_raw_table(self, dataset: str, partition_by: Optional[str] = None,
+                         subpartition_by: Optional[str] = None) -> None:
+        """Create raw table for dataset if it doesn't exist.
+        
+        When ``partition_by`` is set the table is created declaratively partitioned
+        by season (optionally sub-partitioned by week); leaf partitions are created
+        on demand by ``ensure_raw_partition``.
+        """
+        if dataset in self._raw_table_partitioned:
+            return
+        
+        _validate_raw_storage(partition_by, subpartition_by)
         table_name = f"raw.{dataset}"
         
         with self.engine.connect() as conn:
@@ -124,7 +185,10 @@ class PostgresClient:
             """), {"dataset": dataset}).scalar()
             
             if not result:
-                # Create table with simple primary key
+                partition_clause = f"PARTITION BY LIST ({partition_by})" if partition_by else ""
+                
+                # Create table with simple primary key (season/week are part of it,
+                # so the key is valid on a table partitioned by either)
                 conn.execute(text(f"""
                     CREATE TABLE {table_name} (
                         dataset text NOT NULL,
@@ -137,22 +201,114 @@ class PostgresClient:
                         _ingested_at timestamptz NOT NULL DEFAULT now(),
                         _hash text NOT NULL,
                         PRIMARY KEY (dataset, season, week, player_id, team, game_id)
-                    )
+                    ) {partition_clause}
                 """))
                 
-                # Create indexes
+                # Create indexes (on a partitioned table these cascade to every partition)
                 conn.execute(text(f"CREATE INDEX idx_{dataset}_season_week ON {table_name} (season, week)"))
                 conn.execute(text(f"CREATE INDEX idx_{dataset}_data_gin ON {table_name} USING gin (data)"))
+                # dbt staging models read only rows newer than their last build
+                conn.execute(text(f"CREATE INDEX idx_{dataset}_ingested_at ON {table_name} (_ingested_at)"))
+                
+                if partition_by:
+                    # Catch-all for rows without a season (stored as -1)
+                    conn.execute(text(
+                        f"CREATE TABLE raw.{raw_partition_name(dataset, -1)} "
+                        f"PARTITION OF {table_name} DEFAULT"
+                    ))
                 
                 conn.commit()
-                self.logger.info(f"Created raw table for {dataset}")
+                self.logger.info(
+                    f"Created raw table for {dataset}"
+                    + (f" partitioned by {partition_by}" if partition_by else "")
+                )
+                self._raw_table_partitioned[dataset] = bool(partition_by)
+                return
+            
+            # Existing tables keep their layout; an unpartitioned heap is upserted as before
+            is_partitioned = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'raw' AND c.relname = :dataset
+                )
+            """), {"dataset": dataset}).scalar()
+            
+            if partition_by and not is_partitioned:
+                self.logger.warning(
+                    f"raw.{dataset} exists without partitioning; recreate it to enable "
+                    f"partitioning by {partition_by}"
+                )
+            
+            # Tables created before staging went incremental lack the watermark index
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{dataset}_ingested_at ON {table_name} (_ingested_at)"
+            ))
+            conn.commit()
+            self._raw_table_partitioned[dataset] = bool(is_partitioned)
     
-    def upsert_json_records(self, dataset: str, partition: Dict[str, Any], records: List[Dict[str, Any]]) -> int:
-        """Upsert records into raw table."""
+    def ensure_raw_partition(self, dataset: str, season: int, week: int,
+                             subpartition_by: Optional[str] = None) -> str:
+        """Create the season (and week) partitions a row belongs to and return the leaf table name."""
+        leaf = raw_partition_name(dataset, season, week if subpartition_by else None)
+        if season < 0 or leaf in self._raw_partitions:
+            return f"raw.{leaf}"
+        
+        season_table = raw_partition_name(dataset, season)
+        sub_clause = f" PARTITION BY LIST ({subpartition_by})" if subpartition_by else ""
+        
+        with self.engine.connect() as conn:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS raw.{season_table} "
+                f"PARTITION OF raw.{dataset} FOR VALUES IN ({int(season)}){sub_clause}"
+            ))
+            
+            if subpartition_by:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS raw.{raw_partition_name(dataset, season, -1)} "
+                    f"PARTITION OF raw.{season_table} DEFAULT"
+                ))
+                if week >= 0:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS raw.{leaf} "
+                        f"PARTITION OF raw.{season_table} FOR VALUES IN ({int(week)})"
+                    ))
+            
+            conn.commit()
+        
+        self._raw_partitions.add(leaf)
+        return f"raw.{leaf}"
+    
+    def detach_season_partition(self, dataset: str, season: int,
+                                archive_schema: str = 'raw_archive') -> str:
+        """Detach a season partition from raw.<dataset> and move it to the archive schema."""
+        season_table = raw_partition_name(dataset, season)
+        
+        with self.engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE raw.{dataset} DETACH PARTITION raw.{season_table}"))
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            conn.execute(text(f"ALTER TABLE raw.{season_table} SET SCHEMA {archive_schema}"))
+            conn.commit()
+        
+        self._raw_partitions = {p for p in self._raw_partitions if not p.startswith(season_table)}
+        self.logger.info(f"Detached raw.{season_table} into {archive_schema}")
+        return f"{archive_schema}.{season_table}"
+    
+    def upsert_json_records(self, dataset: str, partition: Dict[str, Any], records: List[Dict[str, Any]],
+                            partition_by: Optional[str] = None,
+                            subpartition_by: Optional[str] = None,
+                            counts: Optional[Dict[str, int]] = None) -> int:
+        """Upsert records into raw table, writing straight into the leaf partition when partitioned.
+        
+        When ``counts`` is given, the number of rows inserted, updated (hash changed)
+        and left unchanged is added to its ``inserted``/``updated``/``unchanged`` keys.
+        """
         if not records:
             return 0
         
-        self.ensure_raw_table(dataset)
+        self.ensure_raw_table(dataset, partition_by, subpartition_by)
+        partitioned = self._raw_table_partitioned.get(dataset, False)
         
         # For depth charts, remove exact duplicates first
         if dataset == 'depth_charts':
@@ -212,21 +368,39 @@ class PostgresClient:
                 '_hash': record_hash
             })
         
+        # Route each record to its leaf partition so Postgres skips tuple routing
+        # and only the touched season/week partitions are locked
+        records_by_table: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in upsert_records:
+            if partitioned:
+                table_name = self.ensure_raw_partition(
+                    dataset, int(record['season']), int(record['week']), subpartition_by
+                )
+            else:
+                table_name = f"raw.{dataset}"
+            records_by_table[table_name].append(record)
+        
         # Break large batches into smaller chunks to avoid SQL parameter limits
         batch_size = 500  # Conservative batch size for SQL parameters
         total_upserted = 0
         
-        for i in range(0, len(upsert_records), batch_size):
-            batch = upsert_records[i:i + batch_size]
-            total_upserted += self._upsert_batch(dataset, batch)
+        for table_name, table_records in records_by_table.items():
+            for i in range(0, len(table_records), batch_size):
+                batch = table_records[i:i + batch_size]
+                batch_counts = self._upsert_batch(table_name, batch)
+                total_upserted += len(batch)
+                if counts is not None:
+                    for key, value in batch_counts.items():
+                        counts[key] = counts.get(key, 0) + value
         
         self.logger.info(f"Upserted {total_upserted} records into raw.{dataset}")
         return total_upserted
     
-    def _upsert_batch(self, dataset: str, batch_records: List[Dict[str, Any]]) -> int:
-        """Upsert a single batch of records."""
-        table_name = f"raw.{dataset}"
+    def _upsert_batch(self, table_name: str, batch_records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert a single batch of records into a raw table or one of its partitions.
         
+        Returns how many rows were inserted, updated and left unchanged.
+        """
         with self.engine.connect() as conn:
             # Use VALUES clause for batch upsert
             placeholders = []
@@ -254,12 +428,19 @@ class PostgresClient:
                     _ingested_at = now(),
                     _hash = EXCLUDED._hash
                 WHERE {table_name}._hash != EXCLUDED._hash
+                RETURNING (xmax = 0) AS inserted
             """
             
-            conn.execute(text(upsert_sql), values)
+            # Rows skipped by the WHERE clause are not returned; xmax is 0 only for fresh inserts
+            written = [row.inserted for row in conn.execute(text(upsert_sql), values)]
             conn.commit()
         
-        return len(batch_records)
+        inserted = sum(written)
+        return {
+            'inserted': inserted,
+            'updated': len(written) - inserted,
+            'unchanged': len(batch_records) - len(written),
+        }
     
     def record_file_registry(self, dataset: str, s3_path: str, snapshot_at: datetime,
                            season: Optional[int], week: Optional[int], row_count: int,
@@ -310,17 +491,55 @@ class PostgresClient:
             })
             session.commit()
     
+    def record_stage_metrics(self, dataset: str, partition: Dict[str, Any], file_id: Optional[int],
+                             status: str, stages_ms: Dict[str, float], duration_ms: int,
+                             bytes_written: int = 0, counts: Optional[Dict[str, int]] = None) -> None:
+        """Record stage timings and row outcomes for one load_partition run."""
+        counts = counts or {}
+        with self.Session() as session:
+            session.execute(text("""
+                INSERT INTO ops.ingest_stage_metrics 
+                (dataset, partition, file_id, status, stages_ms, duration_ms, bytes_written,
+                 rows_inserted, rows_updated, rows_unchanged, recorded_at)
+                VALUES (:dataset, :partition, :file_id, :status, :stages_ms, :duration_ms, :bytes_written,
+                        :rows_inserted, :rows_updated, :rows_unchanged, now())
+            """), {
+                'dataset': dataset,
+                'partition': json.dumps(partition),
+                'file_id': file_id,
+                'status': status,
+                'stages_ms': json.dumps(stages_ms),
+                'duration_ms': duration_ms,
+                'bytes_written': bytes_written,
+                'rows_inserted': counts.get('inserted', 0),
+                'rows_updated': counts.get('updated', 0),
+                'rows_unchanged': counts.get('unchanged', 0)
+            })
+            session.commit()
+    
     def get_latest_manifest(self) -> List[Dict[str, Any]]:
-        """Get latest manifest records per dataset."""
+        """Get latest manifest records per dataset, with the stage metrics of that load."""
         with self.Session() as session:
             result = session.execute(text("""
-                SELECT DISTINCT ON (dataset) 
-                    dataset,
-                    partition,
-                    row_count,
-                    applied_at
-                FROM ops.raw_ingest_manifest
-                ORDER BY dataset, applied_at DESC
+                SELECT DISTINCT ON (m.dataset) 
+                    m.dataset,
+                    m.partition,
+                    m.row_count,
+                    m.applied_at,
+                    sm.stages_ms,
+                    sm.duration_ms,
+                    sm.bytes_written,
+                    sm.rows_inserted,
+                    sm.rows_updated,
+                    sm.rows_unchanged
+                FROM ops.raw_ingest_manifest m
+                LEFT JOIN LATERAL (
+                    SELECT * FROM ops.ingest_stage_metrics s
+                    WHERE s.dataset = m.dataset AND s.partition = m.partition
+                    ORDER BY s.recorded_at DESC
+                    LIMIT 1
+                ) sm ON true
+                ORDER BY m.dataset, m.applied_at DESC
             """))
             
             return [dict(row._mapping) for row in result]
@@ -1,7 +1,6 @@
 import hashlib
-import time
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from prefect import task, get_run_logger
 import pandas as pd
@@ -16,12 +15,32 @@ from ..utils import (
     chunk_dataframe,
     generate_s3_path,
     add_metadata_columns,
-    compute_dataframe_hash
+    compute_dataframe_hash,
+    StageTimings
 )
 from ..adapters.nflverse_loader import get_nflverse_loader
 from ..adapters.registry import DatasetConfig
 
 
+def _record_stage_metrics(dataset_config: DatasetConfig, partition: Dict[str, Any],
+                          file_id: Optional[int], status: str, timings: StageTimings,
+                          bytes_written: int = 0, counts: Optional[Dict[str, int]] = None) -> None:
+    """Store stage timings for the run; telemetry failures never fail the load."""
+    try:
+        get_postgres_client().record_stage_metrics(
+            dataset=dataset_config.id,
+            partition=partition,
+            file_id=file_id,
+            status=status,
+            stages_ms=timings.as_dict(),
+            duration_ms=timings.total_ms(),
+            bytes_written=bytes_written,
+            counts=counts
+        )
+    except Exception as e:
+        get_run_logger().warning(f"Failed to record stage metrics for {dataset_config.id}: {e}")
+
+
 @task
 def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) -> Dict[str, Any]:
     """Load a single dataset partition: extract -> validate -> S3 -> Postgres -> manifest."""
@@ -29,21 +48,25 @@ def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) ->
     logger = get_run_logger()
     settings = get_settings()
     
-    start_time = time.time()
+    timings = StageTimings()
+    file_id = None
+    bytes_written = 0
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
     
     try:
         logger.info(f"Loading partition {partition} for dataset {dataset_config.id}")
         
-        # Initialize clients
-        loader = get_nflverse_loader()
-        s3_client = get_s3_client()
-        postgres_client = get_postgres_client()
-        
-        # Ensure S3 bucket exists
-        s3_client.ensure_bucket(settings.bronze_bucket)
-        
-        # Ensure raw schema and tables exist
-        postgres_client.ensure_schema_and_ops()
+        with timings.stage('setup'):
+            # Initialize clients
+            loader = get_nflverse_loader()
+            s3_client = get_s3_client()
+            postgres_client = get_postgres_client()
+            
+            # Ensure S3 bucket exists
+            s3_client.ensure_bucket(settings.bronze_bucket)
+            
+            # Ensure raw schema and tables exist
+            postgres_client.ensure_schema_and_ops()
         
         # Prepare loader arguments based on partition type
         loader_kwargs = {}
@@ -60,38 +83,44 @@ def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) ->
         
         # Load data from nflverse
         logger.info(f"Calling loader function: {dataset_config.loader_fn}")
-        raw_df = loader.load_dataset(dataset_config.loader_fn, **loader_kwargs)
+        with timings.stage('download'):
+            raw_df = loader.load_dataset(dataset_config.loader_fn, **loader_kwargs)
         
         if raw_df.empty:
             logger.warning(f"No data returned for {dataset_config.id} partition {partition}")
+            _record_stage_metrics(dataset_config, partition, None, 'skipped', timings)
             return {
                 'dataset': dataset_config.id,
                 'partition': partition,
                 'row_count': 0,
                 'status': 'skipped',
                 'message': 'No data available',
-                'duration_ms': int((time.time() - start_time) * 1000)
+                'duration_ms': timings.total_ms(),
+                'stages_ms': timings.as_dict()
             }
         
         logger.info(f"Raw data shape: {raw_df.shape}")
         
-        # Normalize column names
-        df = normalize_column_names(raw_df)
-        
-        # Apply column rename map if configured
-        if dataset_config.rename_map:
-            df = apply_rename_map(df, dataset_config.rename_map)
+        with timings.stage('normalize'):
+            # Normalize column names
+            df = normalize_column_names(raw_df)
+            
+            # Apply column rename map if configured
+            if dataset_config.rename_map:
+                df = apply_rename_map(df, dataset_config.rename_map)
         
         # Validate required fields
-        validate_required_fields(df, dataset_config.required_fields)
+        with timings.stage('validate'):
+            validate_required_fields(df, dataset_config.required_fields)
         
         # Add metadata columns for S3
-        df_with_metadata = add_metadata_columns(
-            df, 
-            dataset_config.id, 
-            partition, 
-            schema_version=dataset_config.schema_version
-        )
+        with timings.stage('metadata'):
+            df_with_metadata = add_metadata_columns(
+                df, 
+                dataset_config.id, 
+                partition, 
+                schema_version=dataset_config.schema_version
+            )
         
         # Generate S3 path
         s3_path = generate_s3_path(
@@ -102,82 +131,98 @@ def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) ->
         )
         
         # Compute file hash
-        file_hash = compute_dataframe_hash(df, dataset_config.pk)
+        with timings.stage('hash'):
+            file_hash = compute_dataframe_hash(df, dataset_config.pk)
         
-        # Write to S3
+        # Write to S3 (timed as parquet_encode and s3_upload)
         logger.info(f"Writing to S3: {s3_path}")
-        s3_client.write_parquet(
+        bytes_written = s3_client.write_parquet(
             df_with_metadata, 
             s3_path, 
             metadata={
                 '_file_hash': file_hash
-            }
+            },
+            timings=timings
         )
         
         # Record file in registry
         snapshot_at = datetime.now(timezone.utc)
-        file_id = postgres_client.record_file_registry(
-            dataset=dataset_config.id,
-            s3_path=s3_path,
-            snapshot_at=snapshot_at,
-            season=partition.get('season'),
-            week=partition.get('week'),
-            row_count=len(df),
-            file_hash=file_hash,
-            status='pending'
-        )
-        
-        # Prepare records for Postgres upsert
-        # Convert DataFrame to list of dicts for JSON storage
-        records = df.to_dict('records')
+        with timings.stage('manifest'):
+            file_id = postgres_client.record_file_registry(
+                dataset=dataset_config.id,
+                s3_path=s3_path,
+                snapshot_at=snapshot_at,
+                season=partition.get('season'),
+                week=partition.get('week'),
+                row_count=len(df),
+                file_hash=file_hash,
+                status='pending'
+            )
         
-        # Chunk large datasets for upsert
-        if len(records) > settings.max_chunk_rows:
-            logger.info(f"Chunking {len(records)} records into batches of {settings.max_chunk_rows}")
-            chunks = chunk_dataframe(df, settings.max_chunk_rows)
+        with timings.stage('upsert'):
+            # Prepare records for Postgres upsert
+            # Convert DataFrame to list of dicts for JSON storage
+            records = df.to_dict('records')
             
-            total_upserted = 0
-            for i, chunk in enumerate(chunks):
-                chunk_records = chunk.to_dict('records')
-                upserted = postgres_client.upsert_json_records(
+            # Chunk large datasets for upsert
+            if len(records) > settings.max_chunk_rows:
+                logger.info(f"Chunking {len(records)} records into batches of {settings.max_chunk_rows}")
+                chunks = chunk_dataframe(df, settings.max_chunk_rows)
+                
+                total_upserted = 0
+                for i, chunk in enumerate(chunks):
+                    chunk_records = chunk.to_dict('records')
+                    upserted = postgres_client.upsert_json_records(
+                        dataset_config.id, 
+                        partition, 
+                        chunk_records,
+                        partition_by=dataset_config.raw_partition_by,
+                        subpartition_by=dataset_config.raw_subpartition_by,
+                        counts=counts
+                    )
+                    total_upserted += upserted
+                    logger.info(f"Upserted chunk {i+1}/{len(chunks)}: {upserted} records")
+            else:
+                total_upserted = postgres_client.upsert_json_records(
                     dataset_config.id, 
                     partition, 
-                    chunk_records
+                    records,
+                    partition_by=dataset_config.raw_partition_by,
+                    subpartition_by=dataset_config.raw_subpartition_by,
+                    counts=counts
                 )
-                total_upserted += upserted
-                logger.info(f"Upserted chunk {i+1}/{len(chunks)}: {upserted} records")
-        else:
-            total_upserted = postgres_client.upsert_json_records(
-                dataset_config.id, 
-                partition, 
-                records
-            )
         
-        # Update file registry status
-        postgres_client.record_file_registry(
-            dataset=dataset_config.id,
-            s3_path=s3_path,
-            snapshot_at=snapshot_at,
-            season=partition.get('season'),
-            week=partition.get('week'),
-            row_count=len(df),
-            file_hash=file_hash,
-            status='applied'
-        )
+        with timings.stage('manifest'):
+            # Update file registry status
+            postgres_client.record_file_registry(
+                dataset=dataset_config.id,
+                s3_path=s3_path,
+                snapshot_at=snapshot_at,
+                season=partition.get('season'),
+                week=partition.get('week'),
+                row_count=len(df),
+                file_hash=file_hash,
+                status='applied'
+            )
+            
+            # Update ingest manifest
+            postgres_client.update_ingest_manifest(
+                dataset=dataset_config.id,
+                partition=partition,
+                applied_file_id=file_id,
+                row_count=len(df),
+                file_hash=file_hash
+            )
         
-        # Update ingest manifest
-        postgres_client.update_ingest_manifest(
-            dataset=dataset_config.id,
-            partition=partition,
-            applied_file_id=file_id,
-            row_count=len(df),
-            file_hash=file_hash
+        _record_stage_metrics(
+            dataset_config, partition, file_id, 'applied', timings, bytes_written, counts
         )
-        
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = timings.total_ms()
         
         logger.info(f"Successfully loaded {dataset_config.id} partition {partition}: "
-                   f"{len(df)} rows in {duration_ms}ms")
+                   f"{len(df)} rows in {duration_ms}ms "
+                   f"({counts['inserted']} inserted, {counts['updated']} updated, "
+                   f"{counts['unchanged']} unchanged); stages {timings.as_dict()}")
         
         return {
             'dataset': dataset_config.id,
@@ -186,11 +231,16 @@ def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) ->
             's3_path': s3_path,
             'file_hash': file_hash,
             'duration_ms': duration_ms,
+            'stages_ms': timings.as_dict(),
+            'bytes_written': bytes_written,
+            'rows_inserted': counts['inserted'],
+            'rows_updated': counts['updated'],
+            'rows_unchanged': counts['unchanged'],
             'status': 'success'
         }
         
     except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = timings.total_ms()
         error_msg = str(e)
         
         logger.error(f"Failed to load {dataset_config.id} partition {partition}: {error_msg}")
@@ -212,11 +262,16 @@ def load_partition(dataset_config: DatasetConfig, partition: Dict[str, Any]) ->
         except:
             pass
         
+        _record_stage_metrics(
+            dataset_config, partition, file_id, 'failed', timings, bytes_written, counts
+        )
+        
         return {
             'dataset': dataset_config.id,
             'partition': partition,
             'row_count': 0,
             'status': 'failed',
             'message': error_msg,
-            'duration_ms': duration_ms
+            'duration_ms': duration_ms,
+            'stages_ms': timings.as_dict()
         }
\ No newline at end of file
@@ -1,6 +1,6 @@
 import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import boto3
 import pandas as pd
@@ -10,6 +10,7 @@ from botocore.exceptions import ClientError
 from prefect import get_run_logger
 
 from .settings import get_settings
+from .utils import StageTimings
 
 
 class S3Client:
@@ -41,31 +42,42 @@ class S3Client:
             else:
                 raise
     
-    def write_parquet(self, df: pd.DataFrame, s3_path: str, metadata: Dict[str, Any]) -> None:
-        """Write DataFrame to S3 as Parquet with metadata."""
-        # Add metadata columns to DataFrame
-        for key, value in metadata.items():
-            df[key] = value
-        
-        # Convert to PyArrow table
-        table = pa.Table.from_pandas(df)
-        
+    def write_parquet(self, df: pd.DataFrame, s3_path: str, metadata: Dict[str, Any],
+                      timings: Optional[StageTimings] = None) -> int:
+        """Write DataFrame to S3 as Parquet with metadata and return the object size in bytes.
+
+        When ``timings`` is given, encoding and upload are recorded as the
+        ``parquet_encode`` and ``s3_upload`` stages.
+        """
+        timings = timings or StageTimings()
+
         # Write to temporary file first
         with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as tmp_file:
-            pq.write_table(
-                table,
-                tmp_file.name,
-                compression=self.settings.parquet_compression
-            )
-            
+            with timings.stage('parquet_encode'):
+                # Add metadata columns to DataFrame
+                for key, value in metadata.items():
+                    df[key] = value
+
+                # Convert to PyArrow table
+                table = pa.Table.from_pandas(df)
+
+                pq.write_table(
+                    table,
+                    tmp_file.name,
+                    compression=self.settings.parquet_compression
+                )
+            size_bytes = Path(tmp_file.name).stat().st_size
+
             # Upload to S3
-            bucket, key = self._parse_s3_path(s3_path)
-            self.client.upload_file(tmp_file.name, bucket, key)
-            
+            with timings.stage('s3_upload'):
+                bucket, key = self._parse_s3_path(s3_path)
+                self.client.upload_file(tmp_file.name, bucket, key)
+
             # Clean up temp file
             Path(tmp_file.name).unlink()
-            
-        self.logger.info(f"Wrote {len(df)} rows to {s3_path}")
+
+        self.logger.info(f"Wrote {len(df)} rows ({size_bytes} bytes) to {s3_path}")
+        return size_bytes
     
     def _parse_s3_path(self, s3_path: str) -> tuple[str, str]:
         """Parse s3://bucket/key into bucket and key."""
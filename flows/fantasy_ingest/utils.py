@@ -1,10 +1,35 @@
 import hashlib
 import re
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Dict, Any, List
 import pandas as pd
 
 
+class StageTimings:
+    """Wall-clock milliseconds per named pipeline stage, accumulated across calls."""
+
+    def __init__(self):
+        self.stages_ms: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed
+
+    def total_ms(self) -> int:
+        return int((time.perf_counter() - self._start) * 1000)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(ms, 1) for name, ms in self.stages_ms.items()}
+
+
 def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """Normalize column names to snake_case."""
     df = df.copy()
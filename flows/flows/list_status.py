@@ -32,6 +32,16 @@ def list_status() -> Dict[str, Any]:
             applied_at = record['applied_at']
             
             logger.info(f"Dataset: {dataset:20} | Partition: {str(partition):30} | Rows: {row_count:8} | Applied: {applied_at}")
+            
+            stages_ms = record.get('stages_ms')
+            if stages_ms:
+                slowest = max(stages_ms, key=stages_ms.get)
+                stage_summary = ", ".join(f"{name}={ms:.0f}ms" for name, ms in stages_ms.items())
+                logger.info(
+                    f"    {record['duration_ms']}ms total, slowest {slowest} | {stage_summary} | "
+                    f"{record['bytes_written']} bytes | rows inserted={record['rows_inserted']} "
+                    f"updated={record['rows_updated']} unchanged={record['rows_unchanged']}"
+                )
         
         logger.info("-" * 80)
         logger.info(f"Total datasets with data: {len(manifest_records)}")
@@ -0,0 +1,37 @@
+import pytest
+
+from fantasy_ingest.postgres import raw_partition_name, _validate_raw_storage
+
+
+def test_raw_partition_names():
+    """Test that raw partition names map seasons and weeks to leaf tables."""
+    
+    assert raw_partition_name('injuries', 2024) == 'injuries_s2024'
+    assert raw_partition_name('weekly_player_stats', 2024, 3) == 'weekly_player_stats_s2024_w03'
+    assert raw_partition_name('weekly_player_stats', 2024, 18) == 'weekly_player_stats_s2024_w18'
+    
+    # Missing season/week values are stored as -1 and land in default partitions
+    assert raw_partition_name('depth_charts', -1) == 'depth_charts_default'
+    assert raw_partition_name('depth_charts', -1, 4) == 'depth_charts_default'
+    assert raw_partition_name('depth_charts', 2023, -1) == 'depth_charts_s2023_default'
+
+
+def test_validate_raw_storage():
+    """Test that only season/week partitioning is accepted."""
+    
+    _validate_raw_storage(None, None)
+    _validate_raw_storage('season', None)
+    _validate_raw_storage('season', 'week')
+    
+    with pytest.raises(ValueError):
+        _validate_raw_storage('week', None)
+    
+    with pytest.raises(ValueError):
+        _validate_raw_storage('season', 'team')
+    
+    with pytest.raises(ValueError):
+        _validate_raw_storage(None, 'week')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -115,5 +115,28 @@ def test_dataset_categorization():
     assert 'players' in snapshot_ids
 
 
+def test_raw_storage_config():
+    """Test raw table partitioning options on DatasetConfig."""
+    
+    base = dict(
+        id='weekly_player_stats', description='', loader_fn='import_weekly_data',
+        partitioning={'type': 'weekly', 'keys': ['season', 'week']},
+        pk=['season', 'week', 'player_id'], required_fields=['season'],
+        id_columns=['player_id'], schema_version='v1'
+    )
+    
+    unpartitioned = DatasetConfig(**base)
+    assert unpartitioned.raw_partition_by is None
+    assert unpartitioned.raw_subpartition_by is None
+    
+    partitioned = DatasetConfig(**base, storage={'partition_by': 'season', 'subpartition_by': 'week'})
+    assert partitioned.raw_partition_by == 'season'
+    assert partitioned.raw_subpartition_by == 'week'
+    
+    # Sub-partitioning is ignored without a top-level partition column
+    orphan = DatasetConfig(**base, storage={'subpartition_by': 'week'})
+    assert orphan.raw_subpartition_by is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
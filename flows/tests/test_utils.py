@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from fantasy_ingest.utils import StageTimings
+
+
+def test_stage_timings_accumulate():
+    """Test that repeated stages add up and failed stages are still timed."""
+
+    timings = StageTimings()
+
+    with timings.stage('upsert'):
+        time.sleep(0.01)
+    with timings.stage('upsert'):
+        time.sleep(0.01)
+
+    with pytest.raises(RuntimeError):
+        with timings.stage('manifest'):
+            raise RuntimeError("boom")
+
+    stages = timings.as_dict()
+    assert list(stages) == ['upsert', 'manifest']
+    assert stages['upsert'] >= 20
+    assert timings.total_ms() >= 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])